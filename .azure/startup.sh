@@ -40,4 +40,4 @@ fi
 
 echo ""
 echo "Starting Gunicorn..."
-exec gunicorn wsgi:app --bind=0.0.0.0:8000 --timeout 600 --workers 2 --access-logfile - --error-logfile - --log-level info
+exec gunicorn wsgi:app --config gunicorn_config.py --bind=0.0.0.0:8000 --timeout 600 --workers 2 --access-logfile - --error-logfile - --log-level info
@@ -0,0 +1,131 @@
+"""
+Admission Control
+Decides up front whether an API request is served, so an overloaded worker
+answers quickly with 429/503 and Retry-After instead of letting requests
+queue for minutes
+
+- Per-client token buckets (RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST) rate
+  limit each client; expensive requests cost EXPENSIVE_COST tokens -> 429.
+- A bounded in-flight count (MAX_IN_FLIGHT) caps concurrent work -> 503.
+  It defaults to one below the worker's thread count (GUNICORN_THREADS), so
+  excess requests are shed instead of waiting in the thread-pool queue.
+- Expensive requests (cold predictions, batches) may only use
+  MAX_EXPENSIVE_IN_FLIGHT of those slots, so cheap requests (quotes, cached
+  data) keep getting threads while expensive ones are shed first -> 503.
+
+State is per worker process; with N workers the server-wide limits are N
+times these values. Clients are keyed by request.remote_addr, which the
+app's ProxyFix sets from X-Forwarded-For only for trusted proxy hops.
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import metrics
+
+ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+MAX_IN_FLIGHT = int(os.getenv('ADMISSION_MAX_IN_FLIGHT', max(int(os.getenv('GUNICORN_THREADS', 8)) - 1, 1)))
+MAX_EXPENSIVE_IN_FLIGHT = int(os.getenv('ADMISSION_MAX_EXPENSIVE_IN_FLIGHT', max(MAX_IN_FLIGHT // 2, 1)))
+RATE_LIMIT_PER_SECOND = float(os.getenv('RATE_LIMIT_PER_SECOND', 10))
+RATE_LIMIT_BURST = float(os.getenv('RATE_LIMIT_BURST', 40))
+EXPENSIVE_COST = 4  # tokens
+OVERLOAD_RETRY_AFTER = 2  # seconds suggested to clients shed for overload
+MAX_TRACKED_CLIENTS = 10000
+
+CHEAP = 'cheap'
+EXPENSIVE = 'expensive'
+
+
+class Rejection:
+    """Why a request was turned away: HTTP status, Retry-After seconds and a message"""
+
+    def __init__(self, status, retry_after, reason, message):
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+        self.message = message
+
+
+class TokenBuckets:
+    """Per-client token buckets (LRU-bounded, thread-safe)"""
+
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST, max_clients=MAX_TRACKED_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # client -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, client, cost=1.0):
+        """
+        Spend cost tokens from the client's bucket
+
+        Returns:
+            float: 0 if admitted, otherwise seconds until enough tokens accrue
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (min(cost, self.burst) - tokens) / self.rate
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+class AdmissionController:
+    """In-flight limits with priority for cheap requests, plus per-client rate limits"""
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, max_expensive=MAX_EXPENSIVE_IN_FLIGHT, buckets=None):
+        self.max_in_flight = max_in_flight
+        self.max_expensive = max_expensive
+        self.buckets = buckets or TokenBuckets()
+        self._in_flight = 0
+        self._expensive = 0
+        self._lock = threading.Lock()
+
+    def admit(self, client, priority):
+        """
+        Try to admit a request
+
+        Returns:
+            None if admitted (call release(priority) when done), else a Rejection
+        """
+        wait = self.buckets.take(client, EXPENSIVE_COST if priority == EXPENSIVE else 1)
+        if wait:
+            return self._reject(429, math.ceil(wait), 'rate_limited', priority,
+                                'Too many requests, slow down')
+
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                rejection = 'overloaded'
+            elif priority == EXPENSIVE and self._expensive >= self.max_expensive:
+                rejection = 'expensive_limit'
+            else:
+                self._in_flight += 1
+                if priority == EXPENSIVE:
+                    self._expensive += 1
+                return None
+        return self._reject(503, OVERLOAD_RETRY_AFTER, rejection, priority,
+                            'Server is busy, please retry shortly')
+
+    def release(self, priority):
+        with self._lock:
+            self._in_flight -= 1
+            if priority == EXPENSIVE:
+                self._expensive -= 1
+
+    def _reject(self, status, retry_after, reason, priority, message):
+        metrics.inc('admission_rejections_total', reason=reason, priority=priority)
+        return Rejection(status, retry_after, reason, message)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
@@ -1,8 +1,12 @@
-from flask import Flask, request, render_template, jsonify
+from flask import Flask, Response, g, request, render_template, jsonify, stream_with_context
+from werkzeug.middleware.proxy_fix import ProxyFix
 import pandas as pd
 import os
 from datetime import datetime, timedelta
-import ta
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
@@ -10,113 +14,537 @@ warnings.filterwarnings('ignore')
 # Import our custom stock API using Twelve Data
 from stock_api import (
     get_stock_history, 
+    get_batch_stock_history,
     get_intraday_data,
     get_company_news,
+    get_batch_company_news,
     get_sentiment_analysis,
     get_quote_data,
     get_company_profile,
-    get_company_metrics
+    get_company_metrics,
+    BATCH_SYMBOLS_PER_REQUEST
 )
+from quote_stream import QuoteHub, HEARTBEAT_INTERVAL
+from model_manager import ModelManager
+from cache_backend import get_cache, decode_value, MODEL_GENERATION_KEY
+from metrics import metrics
+from log_config import get_logger
+from prewarmer import Prewarmer, RefreshTask, PREWARM_ENABLED
+from sentiment import score_news_batch
+from request_memo import RequestMemo
+from singleflight import SingleFlight
+from symbols import check_symbol, get_symbol_index, MAX_RESULTS as MAX_SYMBOL_RESULTS
+from admission import AdmissionController, ADMISSION_ENABLED, CHEAP, EXPENSIVE
 
-print("="*60)
-print("🚀 Stock Predictor App - Using Twelve Data API")
-print("="*60)
+logger = get_logger(__name__)
+logger.info("Stock Predictor App - Using Twelve Data API")
+
+# Proxy hops in front of the app (App Service front end = 1) whose
+# X-Forwarded-For entries are trusted for request.remote_addr; entries a
+# client adds itself are ignored. 0 when clients connect directly.
+PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', 1))
 
 application = Flask(__name__)
+if PROXY_FIX_X_FOR > 0:
+    application.wsgi_app = ProxyFix(application.wsgi_app, x_for=PROXY_FIX_X_FOR)
 app = application
 
-# Model will be loaded lazily on first use
+# Model will be loaded lazily on first use, once per worker process; the
+# manager makes loading and inference safe for threaded/gevent workers
 MODEL_PATH = 'artifacts/stock_lstm_model.h5'
-model = None
-model_loading_attempted = False
+model_manager = ModelManager(MODEL_PATH)
 
 def load_lstm_model():
     """Load the pre-trained LSTM model (lazy loading)"""
-    global model, model_loading_attempted
-    
-    if model_loading_attempted:
-        return model
-        
-    model_loading_attempted = True
-    
-    try:
-        if os.path.exists(MODEL_PATH):
-            print(f"📦 Loading TensorFlow model from {MODEL_PATH}...")
-            # Import TensorFlow only when needed
-            from tensorflow.keras.models import load_model
-            model = load_model(MODEL_PATH)
-            print(f" Model loaded successfully from {MODEL_PATH}")
-        else:
-            print(f"Model file not found at {MODEL_PATH}")
-            print(f"   Current directory: {os.getcwd()}")
-            print(f"   Files in artifacts/: {os.listdir('artifacts/') if os.path.exists('artifacts/') else 'Directory not found'}")
-    except Exception as e:
-        print(f" Error loading model: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return model
+    return model_manager.get()
 
 @app.route('/')
 def index():
     return render_template('dashboard.html')
 
-@app.route('/api/stock_data/<ticker>')
-def get_stock_data(ticker):
-    """Get comprehensive stock data with prediction and profit/loss analysis"""
-    days = request.args.get('days', default=1, type=int)
-    days = max(1, min(days, 7))  # Limit between 1-7 days
-    
+# Request metrics: latency histogram and request count per route template
+# (not per URL, so tickers don't explode the label set), plus in-flight count.
+# Exposed for the whole server at /metrics (see metrics.py).
+@app.before_request
+def start_request_metrics():
+    metrics.start_background_flush()
+    if PREWARM_ENABLED:
+        prewarmer.start()
+    g.metrics_start = time.perf_counter()
+    metrics.gauge_add('http_requests_in_flight', 1)
+
+# Admission control (see admission.py): page, metrics and theme requests are
+# never shed; the quote stream has its own per-connection limits
+ADMISSION_EXEMPT_ENDPOINTS = {'index', 'static', 'prometheus_metrics', 'toggle_theme', 'stream_quotes', 'search_symbols'}
+EXPENSIVE_ENDPOINTS = {'get_batch_stock_data', 'get_batch_sentiment', 'predict_stock_old'}
+CACHE_AWARE_ENDPOINTS = {'get_stock_data', 'get_stock_data_delta', 'get_dashboard'}
+admission = AdmissionController()
+
+def request_priority():
+    """Cheap unless the request will fetch and predict from scratch"""
+    if request.endpoint in EXPENSIVE_ENDPOINTS:
+        return EXPENSIVE
+    if request.endpoint in CACHE_AWARE_ENDPOINTS:
+        ticker = (request.view_args or {}).get('ticker', '').upper()
+        try:
+            if get_cache().get(f'history:{ticker}:60') is None:
+                return EXPENSIVE
+        except Exception:
+            return EXPENSIVE
+    return CHEAP
+
+@app.before_request
+def admit_request():
+    if not ADMISSION_ENABLED or request.endpoint is None or request.endpoint in ADMISSION_EXEMPT_ENDPOINTS:
+        return None
+    priority = request_priority()
+    rejection = admission.admit(request.remote_addr or 'unknown', priority)
+    if rejection is not None:
+        response = jsonify({'success': False, 'error': rejection.message})
+        response.status_code = rejection.status
+        response.headers['Retry-After'] = str(rejection.retry_after)
+        return response
+    g.admission_priority = priority
+    return None
+
+# Tickers that are malformed, not in the symbol universe, or recently
+# reported missing by the upstream are answered without any upstream call
+SYMBOL_REJECTION_MESSAGES = {
+    'malformed': 'Invalid ticker symbol: {ticker}',
+    'unknown': 'Unknown ticker symbol: {ticker}. Please check the ticker symbol.',
+    'not_found': 'No data found for {ticker}. Please check the ticker symbol or try again later.',
+}
+
+@app.before_request
+def reject_unknown_symbol():
+    ticker = (request.view_args or {}).get('ticker')
+    if ticker is None:
+        return None
+    ticker = ticker.upper()
+    reason = check_symbol(ticker)
+    if reason is None:
+        return None
+    return jsonify({
+        'success': False,
+        'error': SYMBOL_REJECTION_MESSAGES[reason].format(ticker=ticker)
+    }), 404
+
+@app.after_request
+def record_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc=None):
+    priority = g.pop('admission_priority', None)
+    if priority is not None:
+        admission.release(priority)
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    status = g.pop('metrics_status', 500)
+    metrics.gauge_add('http_requests_in_flight', -1)
+    metrics.observe('http_request_duration_seconds', time.perf_counter() - start,
+                    route=route, method=request.method)
+    metrics.inc('http_requests_total', route=route, method=request.method, status=status)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Live quote streaming: one upstream poller per subscribed ticker, shared by
+# every viewer. Each open stream holds a connection for its whole lifetime, so
+# it is only advertised to the dashboard when the server runs a worker class
+# that can afford that (see gunicorn_config.py).
+QUOTE_STREAM_ENABLED = os.getenv('QUOTE_STREAM_ENABLED', 'false').lower() == 'true'
+# Open streams per worker process; beyond this new streams get a 503 and the
+# dashboard keeps polling instead (must stay below gunicorn's gthread threads)
+QUOTE_STREAM_MAX_CONNECTIONS = int(os.getenv('QUOTE_STREAM_MAX_CONNECTIONS', 4))
+QUOTE_STREAM_RETRY_AFTER = 60  # seconds
+MAX_STREAM_TICKERS = 10
+quote_hub = QuoteHub()
+quote_stream_slots = threading.BoundedSemaphore(QUOTE_STREAM_MAX_CONNECTIONS)
+
+# Market data, indicators and predictions go through the shared cache (see
+# cache_backend.py) so every worker - and the next worker after a restart -
+# can reuse them instead of going back upstream
+HISTORY_CACHE_TTL = 60  # seconds
+QUOTE_CACHE_TTL = 15  # seconds
+INDICATOR_CACHE_TTL = 300  # seconds
+PREDICTION_CACHE_TTL = 3600  # seconds
+SENTIMENT_CACHE_TTL = 300  # seconds
+
+
+def _cached_call(key, ttl, loader):
+    """Return the cached value for key, calling loader() when missing or expired"""
+    cache = get_cache()
+    namespace = key.split(':', 1)[0]
+    try:
+        payload = cache.get(key)
+        if payload is not None:
+            metrics.inc('cache_requests_total', namespace=namespace, result='hit')
+            return decode_value(payload)
+    except Exception as e:
+        logger.warning("Cache read error for %s: %s", key, e)
+    metrics.inc('cache_requests_total', namespace=namespace, result='miss')
+
+    value = loader()
+    try:
+        cache.set_value(key, value, ttl)
+    except Exception as e:
+        logger.warning("Cache write error for %s: %s", key, e)
+    return value
+
+
+def get_cached_history(ticker, days=60):
+    """Daily history through the shared cache (each call returns a fresh DataFrame)"""
+    return _cached_call(f'history:{ticker}:{days}', HISTORY_CACHE_TTL,
+                        lambda: get_stock_history(ticker, days=days))
+
+
+def get_cached_quote(ticker):
+    """Real-time quote, preferring a fresh tick from the live stream over the TTL cache"""
+    streamed = quote_hub.latest(ticker, max_age=QUOTE_CACHE_TTL)
+    if streamed is not None:
+        return streamed
+    return _cached_call(f'quote:{ticker}', QUOTE_CACHE_TTL, lambda: get_quote_data(ticker))
+
+
+def get_cached_histories(tickers, days=60):
+    """Daily histories for several tickers, fetching only cache misses in batches"""
+    cache = get_cache()
+    keys = {ticker: f'history:{ticker}:{days}' for ticker in tickers}
+    try:
+        cached = cache.get_values(keys.values())
+    except Exception as e:
+        logger.warning("Cache read error for batch histories: %s", e)
+        cached = {}
+    metrics.inc('cache_requests_total', len(cached), namespace='history', result='hit')
+    metrics.inc('cache_requests_total', len(tickers) - len(cached), namespace='history', result='miss')
+
+    histories = {}
+    missing = []
+    for ticker in tickers:
+        if keys[ticker] in cached:
+            histories[ticker] = cached[keys[ticker]]
+        else:
+            missing.append(ticker)
+
+    if missing:
+        fetched = get_batch_stock_history(missing, days=days)
+        for ticker in missing:
+            hist = fetched.get(ticker, pd.DataFrame())
+            try:
+                cache.set_value(keys[ticker], hist, HISTORY_CACHE_TTL)
+            except Exception as e:
+                logger.warning("Cache write error for %s: %s", keys[ticker], e)
+            histories[ticker] = hist
+    return histories
+
+
+def get_model_version():
+    """Identifier of the model currently used for predictions (changes after retraining)"""
+    try:
+        generation = get_cache().get_counter(MODEL_GENERATION_KEY)
+    except Exception:
+        generation = 0
+    if os.path.exists(MODEL_PATH):
+        return f"lstm-{int(os.path.getmtime(MODEL_PATH))}.{generation}"
+    return f"technical.{generation}"
+
+
+def get_cached_indicators(ticker, hist, memo=None):
+    """
+    add_prediction_indicators through the shared cache, keyed by the latest bar
+
+    With a request memo, a miss derives them from the request's technical
+    frame, so RSI/MACD are computed once for every panel of the request.
+    """
+    key = f"indicators:{ticker}:{len(hist)}:{hist.index[-1].isoformat()}:{float(hist['Close'].iloc[-1]):.4f}"
+    if memo is None:
+        loader = lambda: add_prediction_indicators(hist)
+    else:
+        loader = lambda: prediction_indicators(get_technical_frame(memo, ticker, hist))
+    return _cached_call(key, INDICATOR_CACHE_TTL, loader)
+
+
+def get_request_history(memo, ticker):
+    """The 60-day history, loaded once per request (each call returns a private copy)"""
+    return memo.get(('history', ticker), lambda: get_cached_history(ticker, days=60)).copy()
+
+
+def get_technical_frame(memo, ticker, hist):
+    """add_technical_indicators of the request's history, computed once per request (read-only)"""
+    return memo.get(('technical', ticker), lambda: add_technical_indicators(hist.copy()))
+
+
+def get_cached_predictions(ticker, hist, current_price, days):
+    """predict_multi_day_lstm through the shared cache, keyed by latest bar and model"""
+    key = (f"predictions:{ticker}:{days}:{get_model_version()}:"
+           f"{hist.index[-1].isoformat()}:{current_price:.4f}")
+    return _cached_call(key, PREDICTION_CACHE_TTL, lambda: predict_multi_day_lstm(hist, current_price, days))
+
+
+# Pre-warming: the most requested tickers get their history (plus indicators
+# and predictions for the horizon last asked for) and quote refreshed shortly
+# before the cached copies expire (see prewarmer.py)
+prediction_horizons = {}  # ticker -> days most recently requested
+
+
+def warm_history(ticker):
+    hist, ok = get_stock_history.refresh(ticker, days=60)
+    if not ok or len(hist) < 2:
+        return False
+    get_cache().set_value(f'history:{ticker}:60', hist, HISTORY_CACHE_TTL)
+    current_price = float(hist['Close'].iloc[-1])
+    hist = get_cached_indicators(ticker, hist)
+    if len(hist) >= 5:
+        get_cached_predictions(ticker, hist, current_price, prediction_horizons.get(ticker, 1))
+    return True
+
+
+def warm_quote(ticker):
+    quote, ok = get_quote_data.refresh(ticker)
+    if ok:
+        get_cache().set_value(f'quote:{ticker}', quote, QUOTE_CACHE_TTL)
+    return ok
+
+
+prewarmer = Prewarmer([
+    RefreshTask('history', HISTORY_CACHE_TTL, 'twelve_data', warm_history),
+    RefreshTask('quote', QUOTE_CACHE_TTL, 'finnhub', warm_quote),
+])
+
+
+def record_ticker_request(ticker, days):
+    prewarmer.record(ticker)
+    prediction_horizons[ticker] = days
+
+
+def add_prediction_indicators(hist):
+    """Add the indicators used by the prediction pipeline and drop warm-up rows"""
+    # Import ta when needed (kept off the worker boot path)
+    import ta
+    with metrics.timer('stage_duration_seconds', stage='indicators'):
+        hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
+        hist['SMA_50'] = hist['Close'].rolling(window=50).mean()
+        hist['RSI'] = ta.momentum.RSIIndicator(hist['Close']).rsi()
+        hist['MACD'] = ta.trend.MACD(hist['Close']).macd()
+        return hist.dropna()
+
+
+TECHNICAL_ONLY_INDICATORS = ['EMA_20', 'MACD_signal', 'MACD_diff']
+
+
+def add_technical_indicators(hist):
+    """
+    Every indicator the dashboard shows (the prediction set plus EMA and the
+    MACD signal/histogram), keeping warm-up rows
+    """
+    import ta
+    with metrics.timer('stage_duration_seconds', stage='indicators'):
+        hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
+        hist['SMA_50'] = hist['Close'].rolling(window=50).mean()
+        hist['EMA_20'] = hist['Close'].ewm(span=20, adjust=False).mean()
+        hist['RSI'] = ta.momentum.RSIIndicator(hist['Close']).rsi()
+        macd_indicator = ta.trend.MACD(hist['Close'])
+        hist['MACD'] = macd_indicator.macd()
+        hist['MACD_signal'] = macd_indicator.macd_signal()
+        hist['MACD_diff'] = macd_indicator.macd_diff()
+        return hist
+
+
+def prediction_indicators(technical):
+    """add_prediction_indicators' result, taken from an add_technical_indicators frame"""
+    return technical.drop(columns=TECHNICAL_ONLY_INDICATORS).dropna()
+
+
+def compute_indicator_panel(closes):
+    """
+    Vectorized SMA/RSI/MACD for many tickers at once
+
+    Args:
+        closes: DataFrame of close prices, one column per ticker, aligned on
+            the most recent bar (shorter histories padded with leading NaN)
+
+    Returns:
+        dict: indicator name -> DataFrame shaped like closes. Matches
+        ta.momentum.RSIIndicator / ta.trend.MACD with default windows.
+    """
+    diff = closes.diff(1)
+    up = diff.where(diff > 0, 0.0).where(closes.notna())
+    down = (-diff.where(diff < 0, 0.0)).where(closes.notna())
+    ema_up = up.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    ema_down = down.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    rsi = 100 - (100 / (1 + ema_up / ema_down))
+    rsi = rsi.mask((ema_down == 0) & ema_down.notna(), 100.0)
+
+    ema_fast = closes.ewm(span=12, min_periods=12, adjust=False).mean()
+    ema_slow = closes.ewm(span=26, min_periods=26, adjust=False).mean()
+
+    return {
+        'SMA_20': closes.rolling(window=20).mean(),
+        'SMA_50': closes.rolling(window=50).mean(),
+        'RSI': rsi,
+        'MACD': ema_fast - ema_slow
+    }
+
+
+def add_prediction_indicators_batch(histories):
+    """add_prediction_indicators for a dict of histories in one vectorized pass"""
+    if not histories:
+        return {}
+
+    length = max(len(hist) for hist in histories.values())
+    closes = pd.DataFrame({
+        ticker: np.concatenate([np.full(length - len(hist), np.nan), hist['Close'].to_numpy(dtype=float)])
+        for ticker, hist in histories.items()
+    })
+    with metrics.timer('stage_duration_seconds', stage='indicators'):
+        panel = compute_indicator_panel(closes)
+
+    enriched = {}
+    for ticker, hist in histories.items():
+        offset = length - len(hist)
+        for name, values in panel.items():
+            hist[name] = values[ticker].to_numpy()[offset:]
+        enriched[ticker] = hist.dropna()
+    return enriched
+
+
+def build_candles(hist):
+    """Candlestick and volume points for the technical chart"""
+    ohlc_columns = ['Open', 'High', 'Low', 'Close']
+    volume_present = 'Volume' in hist.columns
+    selected_columns = ohlc_columns + (['Volume'] if volume_present else [])
+    candlestick_data = []
+    volume_data = []
+    for index, row in hist[selected_columns].iterrows():
+        candlestick_data.append({
+            'x': index.strftime('%Y-%m-%d'),
+            'o': float(round(row['Open'], 2)),
+            'h': float(round(row['High'], 2)),
+            'l': float(round(row['Low'], 2)),
+            'c': float(round(row['Close'], 2))
+        })
+        if volume_present:
+            volume_value = 0
+            if not pd.isna(row['Volume']):
+                volume_value = int(float(row['Volume']))
+            volume_data.append({
+                'x': index.strftime('%Y-%m-%d'),
+                'y': volume_value
+            })
+    return candlestick_data, volume_data
+
+
+def build_moving_averages(hist):
+    """SMA20/SMA50 line points for the technical chart"""
+    moving_average_data = {
+        'sma20': [],
+        'sma50': []
+    }
+    recent_ma = hist[['SMA_20', 'SMA_50']]
+    has_sma20 = 'SMA_20' in recent_ma.columns
+    has_sma50 = 'SMA_50' in recent_ma.columns
+    for index, row in recent_ma.iterrows():
+        date_str = index.strftime('%Y-%m-%d')
+        if has_sma20 and not pd.isna(row['SMA_20']):
+            moving_average_data['sma20'].append({
+                'x': date_str,
+                'y': float(round(row['SMA_20'], 2))
+            })
+        if has_sma50 and not pd.isna(row['SMA_50']):
+            moving_average_data['sma50'].append({
+                'x': date_str,
+                'y': float(round(row['SMA_50'], 2))
+            })
+    return moving_average_data
+
+
+def build_prediction_details(predictions, current_price, today):
+    """Per-day prediction rows with profit/loss against the current price"""
+    prediction_details = []
+    for i, pred_price in enumerate(predictions):
+        day_num = i + 1
+        future_date = today + timedelta(days=day_num)
+        profit_loss = pred_price - current_price
+        profit_loss_percent = (profit_loss / current_price) * 100 if current_price else 0
+
+        prediction_details.append({
+            'day': day_num,
+            'date': future_date.strftime('%Y-%m-%d'),
+            'day_name': future_date.strftime('%A'),
+            'price': float(round(pred_price, 2)),
+            'profit_loss': float(round(profit_loss, 2)),
+            'profit_loss_percent': float(round(profit_loss_percent, 2)),
+            'is_profit': bool(profit_loss > 0)
+        })
+    return prediction_details
+
+
+def apply_quote(quote_data, current_price, previous_close):
+    """Overlay a real-time quote on the daily close; returns (price, change, change %)"""
+    if quote_data:
+        current_price = float(round(quote_data.get('current', current_price), 2))
+        previous_close = float(quote_data.get('previous_close', previous_close)) if previous_close else quote_data.get('previous_close', previous_close)
+        day_change = float(quote_data.get('change', current_price - previous_close))
+        day_change_percent = float(quote_data.get('change_percent', (day_change / previous_close) * 100 if previous_close else 0))
+    else:
+        day_change = current_price - previous_close
+        day_change_percent = (day_change / previous_close) * 100 if previous_close else 0
+    return current_price, day_change, day_change_percent
+
+
+def build_stock_data(ticker, days, memo):
+    """
+    Price, predictions, profit/loss and chart data for one ticker
+
+    Returns:
+        tuple: (payload dict, HTTP status)
+    """
     try:
-        ticker = ticker.upper()
-        
         # Fetch stock data using Twelve Data API (cloud-friendly, no blocking)
-        hist = get_stock_history(ticker, days=60)
+        hist = get_request_history(memo, ticker)
         
         # Validate data
         if hist.empty or len(hist) < 2:
-            print(f"No data found for {ticker}")
-            return jsonify({
+            logger.info("No data found for %s", ticker)
+            return {
                 'success': False,
                 'error': f'No data found for {ticker}. Please check the ticker symbol or try again later.'
-            }), 404
+            }, 404
         
         # Handle multi-index columns if needed
         if isinstance(hist.columns, pd.MultiIndex):
-            print(f"  Flattening MultiIndex columns...")
             hist.columns = hist.columns.get_level_values(0)
         
         # Ensure we have Close column
         if 'Close' not in hist.columns:
-            print(f"❌ Invalid columns: {list(hist.columns)}")
-            return jsonify({
+            logger.error("Invalid columns for %s: %s", ticker, list(hist.columns))
+            return {
                 'success': False,
                 'error': f'Invalid data structure for {ticker}. Columns: {list(hist.columns)}'
-            }), 500
-        
-        print(f"✓ Data validated: {len(hist)} rows, columns: {list(hist.columns)}")
+            }, 500
         
         # Current price
         current_price = float(hist['Close'].iloc[-1])
         previous_close = float(hist['Close'].iloc[-2]) if len(hist) > 1 else current_price
         
-        print(f"✓ Fetched {ticker}: Current=${current_price:.2f}, Predicting {days} days")
+        logger.debug("Fetched %s: current=%.2f, predicting %d days", ticker, current_price, days)
         
         # Calculate technical indicators
-        hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
-        hist['SMA_50'] = hist['Close'].rolling(window=50).mean()
-        hist['RSI'] = ta.momentum.RSIIndicator(hist['Close']).rsi()
-        hist['MACD'] = ta.trend.MACD(hist['Close']).macd()
-        hist = hist.dropna()
+        hist = get_cached_indicators(ticker, hist, memo)
         
         if hist.empty or len(hist) < 5:
-            return jsonify({
+            return {
                 'success': False,
                 'error': f'Insufficient data for technical analysis for {ticker}'
-            }), 500
+            }, 500
         
         # Predict multiple days using LSTM model
-        predictions = predict_multi_day_lstm(hist, current_price, days)
+        predictions = get_cached_predictions(ticker, hist, current_price, days)
         
         today = datetime.now()
 
@@ -145,7 +573,7 @@ def get_stock_data(ticker):
                 intraday_times = [d.strftime('%m/%d') for d in hist.index[-10:]]
                 intraday_prices = hist['Close'].tail(10).tolist()
         except Exception as e:
-            print(f"Intraday data error: {e}")
+            logger.warning("Intraday data error for %s: %s", ticker, e)
             # Fallback to daily data
             intraday_times = [d.strftime('%m/%d') for d in hist.index[-10:]]
             intraday_prices = hist['Close'].tail(10).tolist()
@@ -153,7 +581,7 @@ def get_stock_data(ticker):
         # Stock info from Finnhub
         company_profile = get_company_profile(ticker)
         company_metrics = get_company_metrics(ticker)
-        quote_data = get_quote_data(ticker)
+        quote_data = get_cached_quote(ticker)
 
         company_name = company_profile.get('name', ticker)
         market_cap = company_profile.get('market_cap', 'N/A')
@@ -162,76 +590,14 @@ def get_stock_data(ticker):
 
         volume = int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0
 
-        if quote_data:
-            current_price = float(round(quote_data.get('current', current_price), 2))
-            previous_close = float(quote_data.get('previous_close', previous_close)) if previous_close else quote_data.get('previous_close', previous_close)
-            day_change = float(quote_data.get('change', current_price - previous_close))
-            day_change_percent = float(quote_data.get('change_percent', (day_change / previous_close) * 100 if previous_close else 0))
-        else:
-            day_change = current_price - previous_close
-            day_change_percent = (day_change / previous_close) * 100 if previous_close else 0
+        current_price, day_change, day_change_percent = apply_quote(quote_data, current_price, previous_close)
 
         # Recalculate profit/loss metrics using (potentially updated) current price
-        prediction_details = []
-        for i, pred_price in enumerate(predictions):
-            day_num = i + 1
-            future_date = today + timedelta(days=day_num)
-            profit_loss = pred_price - current_price
-            profit_loss_percent = (profit_loss / current_price) * 100 if current_price else 0
-
-            prediction_details.append({
-                'day': day_num,
-                'date': future_date.strftime('%Y-%m-%d'),
-                'day_name': future_date.strftime('%A'),
-                'price': float(round(pred_price, 2)),
-                'profit_loss': float(round(profit_loss, 2)),
-                'profit_loss_percent': float(round(profit_loss_percent, 2)),
-                'is_profit': bool(profit_loss > 0)
-            })
+        prediction_details = build_prediction_details(predictions, current_price, today)
 
         # Prepare technical chart data (last 60 sessions)
-        ohlc_columns = ['Open', 'High', 'Low', 'Close']
-        volume_present = 'Volume' in hist.columns
-        selected_columns = ohlc_columns + (['Volume'] if volume_present else [])
-        recent_ohlcv = hist[selected_columns].tail(60)
-        candlestick_data = []
-        volume_data = []
-        for index, row in recent_ohlcv.iterrows():
-            candlestick_data.append({
-                'x': index.strftime('%Y-%m-%d'),
-                'o': float(round(row['Open'], 2)),
-                'h': float(round(row['High'], 2)),
-                'l': float(round(row['Low'], 2)),
-                'c': float(round(row['Close'], 2))
-            })
-            if volume_present:
-                volume_value = 0
-                if not pd.isna(row['Volume']):
-                    volume_value = int(float(row['Volume']))
-                volume_data.append({
-                    'x': index.strftime('%Y-%m-%d'),
-                    'y': volume_value
-                })
-
-        moving_average_data = {
-            'sma20': [],
-            'sma50': []
-        }
-        recent_ma = hist[['SMA_20', 'SMA_50']].tail(60)
-        has_sma20 = 'SMA_20' in recent_ma.columns
-        has_sma50 = 'SMA_50' in recent_ma.columns
-        for index, row in recent_ma.iterrows():
-            date_str = index.strftime('%Y-%m-%d')
-            if has_sma20 and not pd.isna(row['SMA_20']):
-                moving_average_data['sma20'].append({
-                    'x': date_str,
-                    'y': float(round(row['SMA_20'], 2))
-                })
-            if has_sma50 and not pd.isna(row['SMA_50']):
-                moving_average_data['sma50'].append({
-                    'x': date_str,
-                    'y': float(round(row['SMA_50'], 2))
-                })
+        candlestick_data, volume_data = build_candles(hist.tail(60))
+        moving_average_data = build_moving_averages(hist.tail(60))
 
         # First day prediction (tomorrow)
         predicted_price = predictions[0] if predictions else current_price
@@ -272,21 +638,472 @@ def get_stock_data(ticker):
                 'volumes': volume_data,
                 'moving_averages': moving_average_data
             },
+            'cursor': {
+                'last_bar': hist.index[-1].strftime('%Y-%m-%d'),
+                'model_version': get_model_version()
+            },
+            'live_stream': QUOTE_STREAM_ENABLED,
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         
-        return jsonify(response)
+        return response, 200
         
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"ERROR fetching {ticker}: {str(e)}")
-        print(error_details)
+        logger.exception("Error fetching %s", ticker)
+        return {
+            'success': False,
+            'error': f'Error fetching data for {ticker}: {str(e)}'
+        }, 500
+
+
+# Concurrent requests for the same ticker and horizon share one build (one
+# fetch -> indicators -> inference pass); payloads are read-only once built
+route_flight = SingleFlight('route')
+
+
+def coalesced_stock_data(ticker, days, memo):
+    return route_flight.do(('stock_data', ticker, days), lambda: build_stock_data(ticker, days, memo))
+
+
+def coalesced_technical(ticker, memo):
+    return route_flight.do(('technical', ticker), lambda: build_technical(ticker, memo))
+
+
+@app.route('/api/stock_data/<ticker>')
+def get_stock_data(ticker):
+    """Get comprehensive stock data with prediction and profit/loss analysis"""
+    days = request.args.get('days', default=1, type=int)
+    days = max(1, min(days, 7))  # Limit between 1-7 days
+    ticker = ticker.upper()
+    record_ticker_request(ticker, days)
+
+    payload, status = coalesced_stock_data(ticker, days, RequestMemo())
+    with metrics.timer('stage_duration_seconds', stage='serialization'):
+        return jsonify(payload), status
+
+@app.route('/api/stock_data/<ticker>/delta')
+def get_stock_data_delta(ticker):
+    """
+    Get only what changed since the client's cursor (used by dashboard auto-refresh)
+
+    Query params:
+        since: date of the last bar the client holds (cursor.last_bar)
+        model_version: model version the client's predictions came from
+        days: number of days predicted (1-7)
+
+    Bars from the cursor bar onwards are always returned so an in-progress
+    session bar gets refreshed; predictions are only recomputed when a new bar
+    arrived or the model changed. If the cursor has fallen out of the history
+    window the response asks the client for a full reload instead.
+    """
+    days = request.args.get('days', default=1, type=int)
+    days = max(1, min(days, 7))  # Limit between 1-7 days
+    since = request.args.get('since', default='', type=str)
+    client_model_version = request.args.get('model_version', default='', type=str)
+
+    try:
+        ticker = ticker.upper()
+        record_ticker_request(ticker, days)
+
+        hist = get_cached_history(ticker, days=60)
+        if hist.empty or len(hist) < 2 or 'Close' not in hist.columns:
+            return jsonify({
+                'success': False,
+                'error': f'No data found for {ticker}. Please check the ticker symbol or try again later.'
+            }), 404
+
+        current_price = float(hist['Close'].iloc[-1])
+        previous_close = float(hist['Close'].iloc[-2])
+
+        hist = get_cached_indicators(ticker, hist)
+        if hist.empty or len(hist) < 5:
+            return jsonify({
+                'success': False,
+                'error': f'Insufficient data for technical analysis for {ticker}'
+            }), 500
+
+        try:
+            since_ts = pd.Timestamp(since) if since else None
+        except (ValueError, TypeError):
+            since_ts = None
+
+        if since_ts is None or since_ts < hist.index[0]:
+            return jsonify({
+                'success': True,
+                'ticker': ticker,
+                'full_refresh': True
+            })
+
+        last_bar = hist.index[-1].strftime('%Y-%m-%d')
+        model_version = get_model_version()
+
+        new_bars = hist[hist.index >= since_ts]
+        candlestick_data, volume_data = build_candles(new_bars)
+
+        quote_data = get_cached_quote(ticker)
+        volume = int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0
+        quote_price, day_change, day_change_percent = apply_quote(quote_data, current_price, previous_close)
+
+        response = {
+            'success': True,
+            'ticker': ticker,
+            'full_refresh': False,
+            'cursor': {
+                'last_bar': last_bar,
+                'model_version': model_version
+            },
+            'quote': {
+                'current_price': float(round(quote_price, 2)),
+                'day_change': float(round(day_change, 2)),
+                'day_change_percent': float(round(day_change_percent, 2)),
+                'volume': int(volume)
+            },
+            'bars': {
+                'dates': [d.strftime('%Y-%m-%d') for d in new_bars.index],
+                'prices': [float(round(p, 2)) for p in new_bars['Close']],
+                'candles': candlestick_data,
+                'volumes': volume_data,
+                'moving_averages': build_moving_averages(new_bars)
+            },
+            'predictions': None,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        if last_bar != since_ts.strftime('%Y-%m-%d') or model_version != client_model_version:
+            predictions = get_cached_predictions(ticker, hist, current_price, days)
+            today = datetime.now()
+            predicted_price = predictions[0] if predictions else current_price
+            response['predictions'] = {
+                'days_predicted': int(days),
+                'predicted_price': float(round(predicted_price, 2)),
+                'predictions': build_prediction_details(predictions, quote_price, today),
+                'future_dates': [(today + timedelta(days=i+1)).strftime('%Y-%m-%d') for i in range(days)],
+                'future_prices': [float(round(p, 2)) for p in predictions],
+                'predicted_date': (today + timedelta(days=1)).strftime('%Y-%m-%d')
+            }
+
+        with metrics.timer('stage_duration_seconds', stage='serialization'):
+            return jsonify(response)
+
+    except Exception as e:
+        logger.exception("Error fetching delta for %s", ticker)
         return jsonify({
             'success': False,
             'error': f'Error fetching data for {ticker}: {str(e)}'
         }), 500
 
+MAX_BATCH_TICKERS = 50
+
+
+def build_watchlist_entry(ticker, hist, current_price, previous_close, predictions, today):
+    """Compact per-ticker summary returned by the batch endpoint"""
+    predicted_price = predictions[0] if predictions else current_price
+    profit_loss = predicted_price - current_price
+    day_change = current_price - previous_close
+    last_row = hist.iloc[-1]
+    return {
+        'ticker': ticker,
+        'success': True,
+        'current_price': float(round(current_price, 2)),
+        'day_change': float(round(day_change, 2)),
+        'day_change_percent': float(round((day_change / previous_close) * 100 if previous_close else 0, 2)),
+        'predicted_price': float(round(predicted_price, 2)),
+        'profit_loss': float(round(profit_loss, 2)),
+        'profit_loss_percent': float(round((profit_loss / current_price) * 100 if current_price else 0, 2)),
+        'is_profit': bool(profit_loss > 0),
+        'predictions': build_prediction_details(predictions, current_price, today),
+        'indicators': {
+            'sma_20': float(round(last_row['SMA_20'], 2)),
+            'sma_50': float(round(last_row['SMA_50'], 2)),
+            'rsi': float(round(last_row['RSI'], 2)),
+            'macd': float(round(last_row['MACD'], 2))
+        },
+        'last_bar': hist.index[-1].strftime('%Y-%m-%d')
+    }
+
+
+def iter_watchlist_entries(tickers, days, isolate_chunks=False):
+    """
+    Yield per-ticker batch results, one upstream batch at a time
+
+    Each chunk is fetched with a single multi-symbol request, gets its
+    indicators in one vectorized pass and its predictions in one batched
+    forward pass, so results stream out as chunks complete.
+
+    Args:
+        isolate_chunks: If a chunk fails, yield an error entry for each of its
+            tickers not yielded yet and go on with the next chunk (instead of
+            raising), so every ticker gets exactly one entry
+    """
+    known = []
+    for ticker in tickers:
+        reason = check_symbol(ticker)
+        if reason is None:
+            known.append(ticker)
+        else:
+            yield {'ticker': ticker, 'success': False, 'error': SYMBOL_REJECTION_MESSAGES[reason].format(ticker=ticker)}
+
+    chunk_size = BATCH_SYMBOLS_PER_REQUEST
+    for start in range(0, len(known), chunk_size):
+        chunk = known[start:start + chunk_size]
+        if not isolate_chunks:
+            yield from iter_chunk_entries(chunk, days)
+            continue
+        done = set()
+        try:
+            for entry in iter_chunk_entries(chunk, days):
+                done.add(entry['ticker'])
+                yield entry
+        except Exception as e:
+            logger.exception("Error building watchlist entries for %s", ','.join(chunk))
+            for ticker in chunk:
+                if ticker not in done:
+                    yield {'ticker': ticker, 'success': False, 'error': f'Error fetching stock data: {str(e)}'}
+
+
+def iter_chunk_entries(chunk, days):
+    """Batch results for one chunk of known tickers (see iter_watchlist_entries)"""
+    histories = get_cached_histories(chunk, days=60)
+
+    current_prices = {}
+    previous_closes = {}
+    valid = {}
+    for ticker in chunk:
+        hist = histories.get(ticker, pd.DataFrame())
+        if hist.empty or len(hist) < 2 or 'Close' not in hist.columns:
+            yield {'ticker': ticker, 'success': False, 'error': f'No data found for {ticker}'}
+            continue
+        current_prices[ticker] = float(hist['Close'].iloc[-1])
+        previous_closes[ticker] = float(hist['Close'].iloc[-2])
+        valid[ticker] = hist
+
+    enriched = add_prediction_indicators_batch(valid)
+    ready = {}
+    for ticker, hist in enriched.items():
+        if hist.empty or len(hist) < 5:
+            yield {'ticker': ticker, 'success': False, 'error': f'Insufficient data for technical analysis for {ticker}'}
+            continue
+        ready[ticker] = hist
+
+    predictions = predict_multi_day_lstm_batch(ready, current_prices, days)
+    today = datetime.now()
+    for ticker, hist in ready.items():
+        yield build_watchlist_entry(
+            ticker, hist, current_prices[ticker], previous_closes[ticker],
+            predictions.get(ticker, []), today
+        )
+
+
+@app.route('/api/batch/stock_data')
+def get_batch_stock_data():
+    """
+    Watchlist summary (price, predictions, indicators) for many tickers
+
+    Query params:
+        tickers: comma-separated symbols (at most MAX_BATCH_TICKERS)
+        days: number of days to predict (1-7)
+        stream: '1' to stream newline-delimited JSON, one line per ticker
+    """
+    days = request.args.get('days', default=1, type=int)
+    days = max(1, min(days, 7))
+    stream = request.args.get('stream', default='0', type=str) == '1'
+
+    tickers = []
+    for symbol in request.args.get('tickers', default='', type=str).split(','):
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in tickers:
+            tickers.append(symbol)
+
+    if not tickers:
+        return jsonify({
+            'success': False,
+            'error': 'No tickers requested'
+        }), 400
+
+    if len(tickers) > MAX_BATCH_TICKERS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {MAX_BATCH_TICKERS} tickers can be requested at once'
+        }), 400
+
+    for ticker in tickers:
+        record_ticker_request(ticker, days)
+
+    if stream:
+        def generate():
+            # A failing chunk becomes error lines, so a complete stream has one line per ticker
+            for entry in iter_watchlist_entries(tickers, days, isolate_chunks=True):
+                yield json.dumps(entry) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    try:
+        results = {entry['ticker']: entry for entry in iter_watchlist_entries(tickers, days)}
+        return jsonify({
+            'success': True,
+            'days_predicted': int(days),
+            'count': len(results),
+            'results': [results[ticker] for ticker in tickers],
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+    except Exception as e:
+        logger.exception("Error fetching batch stock data")
+        return jsonify({
+            'success': False,
+            'error': f'Error fetching batch stock data: {str(e)}'
+        }), 500
+
+@app.route('/api/batch/sentiment')
+def get_batch_sentiment():
+    """
+    News sentiment for many tickers plus the aggregate across them
+
+    News comes from the local store (synced concurrently for every ticker)
+    and all articles are scored in one pass; results are cached for
+    SENTIMENT_CACHE_TTL per ticker set. Tickers rejected by check_symbol get
+    a per-ticker error and are left out of the aggregate.
+
+    Query params:
+        tickers: comma-separated symbols (at most MAX_BATCH_TICKERS)
+    """
+    tickers = []
+    for symbol in request.args.get('tickers', default='', type=str).split(','):
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in tickers:
+            tickers.append(symbol)
+
+    if not tickers:
+        return jsonify({
+            'success': False,
+            'error': 'No tickers requested'
+        }), 400
+
+    if len(tickers) > MAX_BATCH_TICKERS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {MAX_BATCH_TICKERS} tickers can be requested at once'
+        }), 400
+
+    known = []
+    rejected = {}
+    for ticker in tickers:
+        reason = check_symbol(ticker)
+        if reason is None:
+            known.append(ticker)
+        else:
+            rejected[ticker] = SYMBOL_REJECTION_MESSAGES[reason].format(ticker=ticker)
+
+    def load():
+        results, aggregate = score_news_batch(get_batch_company_news(known, days=7) if known else {})
+        return {'results': results, 'aggregate': aggregate}
+
+    try:
+        scored = _cached_call(f"batch_sentiment:{','.join(sorted(known))}", SENTIMENT_CACHE_TTL, load)
+        return jsonify({
+            'success': True,
+            'count': len(tickers),
+            'results': [
+                {'ticker': ticker, 'success': False, 'error': rejected[ticker]} if ticker in rejected
+                else dict(scored['results'][ticker], ticker=ticker, success=True)
+                for ticker in tickers
+            ],
+            'aggregate': scored['aggregate'],
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+    except Exception as e:
+        logger.exception("Error fetching batch sentiment")
+        return jsonify({
+            'success': False,
+            'error': f'Error fetching batch sentiment: {str(e)}'
+        }), 500
+
+@app.route('/api/symbols/search')
+def search_symbols():
+    """
+    Ticker autocomplete from the local symbol universe (no upstream call)
+
+    Query params:
+        q: prefix of a symbol or company name
+        limit: maximum number of results (at most MAX_SYMBOL_RESULTS)
+    """
+    query = request.args.get('q', default='', type=str)
+    limit = max(1, min(request.args.get('limit', default=MAX_SYMBOL_RESULTS, type=int), MAX_SYMBOL_RESULTS))
+    results = get_symbol_index().search(query, limit)
+    return jsonify({
+        'success': True,
+        'query': query,
+        'results': results,
+        'count': len(results)
+    })
+
+@app.route('/api/stream/quotes')
+def stream_quotes():
+    """
+    Server-Sent Events stream of live quotes
+
+    Query params:
+        tickers: comma-separated symbols (at most MAX_STREAM_TICKERS)
+
+    Emits a `quote` event per tick and a comment heartbeat when idle so
+    proxies keep the connection open.
+    """
+    raw_tickers = request.args.get('tickers', default='', type=str)
+    tickers = []
+    for symbol in raw_tickers.split(','):
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in tickers:
+            tickers.append(symbol)
+
+    if not tickers:
+        return jsonify({
+            'success': False,
+            'error': 'No tickers requested'
+        }), 400
+
+    if len(tickers) > MAX_STREAM_TICKERS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {MAX_STREAM_TICKERS} tickers can be streamed at once'
+        }), 400
+
+    if not quote_stream_slots.acquire(blocking=False):
+        metrics.inc('quote_stream_rejections_total')
+        response = jsonify({
+            'success': False,
+            'error': 'Too many live quote streams, use polling'
+        })
+        response.headers['Retry-After'] = str(QUOTE_STREAM_RETRY_AFTER)
+        return response, 503
+
+    subscription = quote_hub.subscribe(tickers)
+
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            while not subscription.closed:
+                event = subscription.get(timeout=HEARTBEAT_INTERVAL)
+                if event is None:
+                    yield ': heartbeat\n\n'
+                    continue
+                yield f"event: quote\ndata: {json.dumps(event)}\n\n"
+        finally:
+            quote_hub.unsubscribe(subscription)
+
+    def release():
+        # Also runs when the client is gone before the stream ever started
+        quote_hub.unsubscribe(subscription)
+        quote_stream_slots.release()
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    response.call_on_close(release)
+    return response
+
 def predict_multi_day_lstm(hist, current_price, days):
     """Predict multiple days ahead using LSTM model"""
     predictions = []
@@ -326,7 +1143,7 @@ def predict_multi_day_lstm(hist, current_price, days):
             input_seq = np.array(last_sequence[-sequence_length:]).reshape(1, sequence_length, 1)
             
             # Make prediction
-            predicted_scaled = current_model.predict(input_seq, verbose=0)[0][0]
+            predicted_scaled = model_manager.predict(input_seq)[0][0]
             
             # Add prediction to sequence for next iteration
             last_sequence.append([predicted_scaled])
@@ -338,7 +1155,7 @@ def predict_multi_day_lstm(hist, current_price, days):
         return predictions
         
     except Exception as e:
-        print(f"Multi-day LSTM prediction error: {e}")
+        logger.warning("Multi-day LSTM prediction error: %s", e)
         # Fallback to technical analysis
         for day in range(days):
             pred = predict_with_technical_analysis(hist, current_price)
@@ -346,6 +1163,66 @@ def predict_multi_day_lstm(hist, current_price, days):
             current_price = pred
         return predictions
 
+def predict_multi_day_lstm_batch(histories, current_prices, days):
+    """
+    predict_multi_day_lstm for many tickers with one model forward pass per day
+
+    Each ticker is min-max scaled on its own closes (as in the single-ticker
+    path); tickers with the same sequence length share a batch.
+
+    Args:
+        histories: ticker -> history with prediction indicators
+        current_prices: ticker -> latest close
+        days: number of days to predict
+
+    Returns:
+        dict: ticker -> list of predicted prices
+    """
+    predictions = {}
+
+    try:
+        current_model = load_lstm_model()
+
+        if current_model is None:
+            for ticker, hist in histories.items():
+                predictions[ticker] = predict_multi_day_lstm(hist, current_prices[ticker], days)
+            return predictions
+
+        groups = {}
+        for ticker, hist in histories.items():
+            sequence_length = min(60, len(hist))
+            groups.setdefault(sequence_length, []).append(ticker)
+
+        for sequence_length, tickers in groups.items():
+            closes = np.stack([histories[t]['Close'].to_numpy(dtype=float)[-sequence_length:] for t in tickers])
+            # Same scaling as MinMaxScaler(feature_range=(0, 1)) fitted per ticker
+            minimum = np.stack([histories[t]['Close'].min() for t in tickers]).reshape(-1, 1)
+            data_range = np.stack([histories[t]['Close'].max() for t in tickers]).reshape(-1, 1) - minimum
+            data_range[data_range == 0] = 1.0
+
+            window = (closes - minimum) / data_range
+            predicted = np.empty((len(tickers), days))
+            for day in range(days):
+                input_seq = window[:, -sequence_length:].reshape(len(tickers), sequence_length, 1)
+                predicted_scaled = model_manager.predict(input_seq)[:, 0]
+                window = np.concatenate([window, predicted_scaled.reshape(-1, 1)], axis=1)
+                predicted[:, day] = predicted_scaled
+
+            prices = predicted * data_range + minimum
+            for i, ticker in enumerate(tickers):
+                predictions[ticker] = [float(p) for p in prices[i]]
+
+        return predictions
+
+    except Exception as e:
+        logger.warning("Batch LSTM prediction error: %s", e)
+        for ticker, hist in histories.items():
+            if ticker not in predictions:
+                predictions[ticker] = [
+                    float(p) for p in predict_multi_day_lstm(hist, current_prices[ticker], days)
+                ]
+        return predictions
+
 def predict_next_day_lstm(hist, current_price):
     """Predict next day price using LSTM model"""
     try:
@@ -375,13 +1252,13 @@ def predict_next_day_lstm(hist, current_price):
         last_sequence = last_sequence.reshape(1, sequence_length, 1)
         
         # Make prediction
-        predicted_scaled = current_model.predict(last_sequence, verbose=0)
+        predicted_scaled = model_manager.predict(last_sequence)
         predicted_price = scaler.inverse_transform(predicted_scaled)[0][0]
         
         return float(predicted_price)
         
     except Exception as e:
-        print(f"LSTM prediction error: {e}")
+        logger.warning("LSTM prediction error: %s", e)
         # Fallback to technical analysis
         return predict_with_technical_analysis(hist, current_price)
 
@@ -428,28 +1305,42 @@ def predict_with_technical_analysis(hist, current_price):
         return predicted_price
         
     except Exception as e:
-        print(f"Technical analysis prediction error: {e}")
+        logger.warning("Technical analysis prediction error: %s", e)
         # If all fails, predict slight upward trend
         return current_price * 1.002
 
+def build_news(ticker, days=7, limit=10):
+    """Latest news articles for one ticker (payload of /api/news)"""
+    news = get_company_news(ticker, days=days, limit=limit)
+    return {
+        'success': True,
+        'ticker': ticker,
+        'news': news,
+        'count': len(news)
+    }
+
+
+def build_sentiment(ticker):
+    """Sentiment for one ticker (payload of /api/sentiment)"""
+    return {
+        'success': True,
+        'ticker': ticker,
+        'sentiment': get_sentiment_analysis(ticker)
+    }
+
+
 @app.route('/api/news/<ticker>')
 def get_news(ticker):
-    """Get company news from Finnhub API"""
+    """Get company news (served from the local news store, synced from Finnhub)"""
     try:
         ticker = ticker.upper()
         days = request.args.get('days', default=7, type=int)
+        limit = request.args.get('limit', default=10, type=int)
         
-        news = get_company_news(ticker, days=days)
-        
-        return jsonify({
-            'success': True,
-            'ticker': ticker,
-            'news': news,
-            'count': len(news)
-        })
+        return jsonify(build_news(ticker, days, limit))
         
     except Exception as e:
-        print(f"ERROR fetching news for {ticker}: {str(e)}")
+        logger.exception("Error fetching news for %s", ticker)
         return jsonify({
             'success': False,
             'error': f'Error fetching news: {str(e)}'
@@ -461,54 +1352,39 @@ def get_sentiment(ticker):
     try:
         ticker = ticker.upper()
         
-        sentiment = get_sentiment_analysis(ticker)
-        
-        return jsonify({
-            'success': True,
-            'ticker': ticker,
-            'sentiment': sentiment
-        })
+        return jsonify(build_sentiment(ticker))
         
     except Exception as e:
-        print(f"ERROR fetching sentiment for {ticker}: {str(e)}")
+        logger.exception("Error fetching sentiment for %s", ticker)
         return jsonify({
             'success': False,
             'error': f'Error fetching sentiment: {str(e)}'
         }), 500
 
-@app.route('/api/technical/<ticker>')
-def get_technical_indicators(ticker):
-    """Get technical indicators for a stock"""
+def build_technical(ticker, memo):
+    """
+    RSI, EMA and MACD values and trends for one ticker
+
+    Returns:
+        tuple: (payload dict, HTTP status)
+    """
     try:
-        ticker = ticker.upper()
-        
-        # Fetch stock data
-        hist = get_stock_history(ticker, days=60)
+        hist = get_request_history(memo, ticker)
         
         if hist.empty or len(hist) < 2:
-            return jsonify({
+            return {
                 'success': False,
                 'error': f'No data found for {ticker}'
-            }), 404
-        
-        # Calculate technical indicators
-        hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
-        hist['EMA_20'] = hist['Close'].ewm(span=20, adjust=False).mean()
-        hist['RSI'] = ta.momentum.RSIIndicator(hist['Close']).rsi()
+            }, 404
         
-        # MACD
-        macd_indicator = ta.trend.MACD(hist['Close'])
-        hist['MACD'] = macd_indicator.macd()
-        hist['MACD_signal'] = macd_indicator.macd_signal()
-        hist['MACD_diff'] = macd_indicator.macd_diff()
-        
-        hist = hist.dropna()
+        # Technical indicators (shared with the prediction panel of the request)
+        hist = get_technical_frame(memo, ticker, hist).drop(columns=['SMA_50']).dropna()
         
         if hist.empty:
-            return jsonify({
+            return {
                 'success': False,
                 'error': 'Insufficient data for technical analysis'
-            }), 500
+            }, 500
         
         last_row = hist.iloc[-1]
         
@@ -543,20 +1419,98 @@ def get_technical_indicators(ticker):
             }
         }
         
-        return jsonify({
+        return {
             'success': True,
             'ticker': ticker,
             'indicators': indicators
-        })
+        }, 200
         
     except Exception as e:
-        print(f"ERROR fetching technical indicators for {ticker}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
+        logger.exception("Error fetching technical indicators for %s", ticker)
+        return {
             'success': False,
             'error': f'Error fetching technical indicators: {str(e)}'
-        }), 500
+        }, 500
+
+
+@app.route('/api/technical/<ticker>')
+def get_technical_indicators(ticker):
+    """Get technical indicators for a stock"""
+    payload, status = coalesced_technical(ticker.upper(), RequestMemo())
+    return jsonify(payload), status
+
+# Composite dashboard: every panel of the page in one request. Panels run
+# concurrently and share the request's history and indicators through a
+# RequestMemo, so nothing is fetched or computed twice per page load.
+DASHBOARD_THREADS = 16
+dashboard_executor = ThreadPoolExecutor(max_workers=DASHBOARD_THREADS, thread_name_prefix='dashboard')
+
+
+def dashboard_panels(ticker, days):
+    """Panel name -> callable returning (payload, status), sharing one request memo"""
+    memo = RequestMemo()
+    return {
+        'stock_data': lambda: coalesced_stock_data(ticker, days, memo),
+        'technical': lambda: coalesced_technical(ticker, memo),
+        'news': lambda: (build_news(ticker), 200),
+        'sentiment': lambda: (build_sentiment(ticker), 200),
+    }
+
+
+def run_dashboard_panel(name, build):
+    try:
+        with metrics.timer('stage_duration_seconds', stage=f'dashboard_{name}'):
+            return build()
+    except Exception as e:
+        logger.exception("Dashboard panel %s failed", name)
+        return {
+            'success': False,
+            'error': f'Error fetching {name}: {str(e)}'
+        }, 500
+
+
+@app.route('/api/dashboard/<ticker>')
+def get_dashboard(ticker):
+    """
+    Every dashboard panel for a ticker (stock_data, technical, news, sentiment) in one request
+
+    Query params:
+        days: number of days to predict (1-7)
+        stream: '1' to stream newline-delimited JSON, one line per panel as
+            soon as it is ready, so the slowest panel doesn't hold up the rest
+
+    Each panel is {'panel', 'status', 'data'}, where data is what the panel's
+    own endpoint (e.g. /api/news/<ticker>) returns and status its HTTP status.
+    """
+    days = request.args.get('days', default=1, type=int)
+    days = max(1, min(days, 7))  # Limit between 1-7 days
+    stream = request.args.get('stream', default='0', type=str) == '1'
+    ticker = ticker.upper()
+    record_ticker_request(ticker, days)
+
+    futures = {
+        dashboard_executor.submit(run_dashboard_panel, name, build): name
+        for name, build in dashboard_panels(ticker, days).items()
+    }
+
+    if stream:
+        def generate():
+            for future in as_completed(futures):
+                payload, status = future.result()
+                yield json.dumps({'panel': futures[future], 'status': status, 'data': payload}) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    panels = []
+    for future, name in futures.items():
+        payload, status = future.result()
+        panels.append({'panel': name, 'status': status, 'data': payload})
+    with metrics.timer('stage_duration_seconds', stage='serialization'):
+        return jsonify({
+            'success': True,
+            'ticker': ticker,
+            'panels': panels
+        })
 
 @app.route('/api/company/<ticker>')
 def get_company_info(ticker):
@@ -575,7 +1529,7 @@ def get_company_info(ticker):
         })
         
     except Exception as e:
-        print(f"ERROR fetching company info for {ticker}: {str(e)}")
+        logger.exception("Error fetching company info for %s", ticker)
         return jsonify({
             'success': False,
             'error': f'Error fetching company info: {str(e)}'
@@ -600,6 +1554,7 @@ def predict_stock_old():
                 return render_template('home.html', results=f"No data found for ticker: {ticker}. Please check the ticker symbol.", chart_data=None)
             
             # Calculate technical indicators
+            import ta
             daily_data['SMA_20'] = daily_data['Close'].rolling(window=20).mean()
             daily_data['SMA_50'] = daily_data['Close'].rolling(window=50).mean()
             daily_data['RSI'] = ta.momentum.RSIIndicator(daily_data['Close']).rsi()
@@ -0,0 +1,80 @@
+"""
+Cold Start Benchmark
+Measures what a freshly booted worker pays before it is useful:
+`import app` and the latency of its first and second /api/stock_data request
+
+Each run is a fresh interpreter (no warm module cache), pointed at the fake
+upstream so the request numbers exclude real network time. Reports the
+median and max over --runs.
+
+Usage:
+    python benchmarks/cold_start_bench.py --runs 5 --latency 0.05
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_upstream import start_fake_upstream
+from harness import PROJECT_ROOT
+
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+import app
+import_s = time.perf_counter() - start
+client = app.app.test_client()
+timings = {'import_app_s': import_s}
+for label, path in (('first_request_s', '/api/stock_data/AAPL?days=7'),
+                    ('second_request_s', '/api/stock_data/MSFT?days=7')):
+    start = time.perf_counter()
+    status = client.get(path).status_code
+    timings[label] = time.perf_counter() - start
+    assert status == 200, (path, status)
+timings['heavy_modules'] = sorted(m for m in ('ta', 'sklearn', 'tensorflow') if m in sys.modules)
+print('RESULT ' + json.dumps(timings))
+'''
+
+
+def cold_start_once(upstream):
+    env = dict(os.environ)
+    env.update({
+        'TWELVE_DATA_BASE_URL': upstream.twelve_data_url,
+        'FINNHUB_BASE_URL': upstream.finnhub_url,
+        'CACHE_BACKEND': 'memory',
+        'LOG_LEVEL': 'WARNING',
+    })
+    result = subprocess.run([sys.executable, '-c', CHILD], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith('RESULT '):
+            return json.loads(line[len('RESULT '):])
+    raise RuntimeError(f'cold start run failed:\n{result.stderr[-2000:]}')
+
+
+def run(args):
+    upstream = start_fake_upstream(latency=args.latency)
+    runs = [cold_start_once(upstream) for _ in range(args.runs)]
+    upstream.shutdown()
+
+    report = {'runs': args.runs, 'upstream_latency_s': args.latency}
+    for key in ('import_app_s', 'first_request_s', 'second_request_s'):
+        values = [r[key] * 1000 for r in runs]
+        report[key[:-2] + '_ms'] = {
+            'median': round(statistics.median(values), 1),
+            'max': round(max(values), 1),
+        }
+    report['heavy_modules_after_requests'] = runs[-1]['heavy_modules']
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean simulated upstream latency (s)')
+    run(parser.parse_args())
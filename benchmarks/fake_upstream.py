@@ -0,0 +1,264 @@
+"""
+Fake Upstream Server
+Local stand-in for the Twelve Data and Finnhub endpoints used by stock_api.py,
+with configurable latency and per-endpoint call counters, so benchmarks and
+load tests never touch the real APIs or burn API credits
+
+Twelve Data is served at the root, Finnhub under /finnhub. Point the app at it
+with TWELVE_DATA_BASE_URL=http://host:port and FINNHUB_BASE_URL=http://host:port/finnhub.
+Symbols starting with 'INVALID' are answered with a "symbol not found" error.
+
+Usage:
+    python benchmarks/fake_upstream.py --port 9100 --latency 0.2
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+
+def _seed(symbol):
+    return int(hashlib.md5(symbol.encode('utf-8')).hexdigest()[:8], 16)
+
+
+def synthetic_bars(symbol, count, interval='1day'):
+    """Deterministic random-walk OHLCV bars for a symbol, newest first"""
+    rng = np.random.default_rng(_seed(symbol))
+    closes = 50 + rng.random() * 400 + np.cumsum(rng.normal(0, 2, count))
+    closes = np.maximum(closes, 1.0)
+    step = timedelta(days=1) if interval in ('1day', '1week', '1month') else timedelta(minutes=5)
+    end = datetime.now().replace(second=0, microsecond=0)
+    if step == timedelta(days=1):
+        end = end.replace(hour=0, minute=0)
+    fmt = '%Y-%m-%d' if step == timedelta(days=1) else '%Y-%m-%d %H:%M:%S'
+    values = []
+    for i in range(count):
+        close = float(closes[count - 1 - i])
+        values.append({
+            'datetime': (end - step * i).strftime(fmt),
+            'open': f'{close * 0.995:.4f}',
+            'high': f'{close * 1.01:.4f}',
+            'low': f'{close * 0.99:.4f}',
+            'close': f'{close:.4f}',
+            'volume': str(int(1_000_000 + rng.integers(0, 500_000)))
+        })
+    return values
+
+
+def _not_found(symbol):
+    return {'code': 400, 'message': f'**symbol** {symbol} not found', 'status': 'error'}
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    server_version = 'FakeUpstream/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        path = parsed.path
+
+        if path == '/__stats':
+            return self._json(200, self.server.stats())
+        if path == '/__reset':
+            self.server.reset()
+            return self._json(200, {'reset': True})
+
+        self.server.record(path)
+        latency = self.server.latency
+        if latency:
+            time.sleep(max(0.0, random.gauss(latency, latency * self.server.jitter)))
+
+        handler = ROUTES.get(path)
+        if handler is None:
+            return self._json(404, {'status': 'error', 'message': f'Unknown endpoint {path}'})
+        status, payload = handler(params)
+        return self._json(status, payload)
+
+    def _json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _time_series(params):
+    symbols = [s for s in params.get('symbol', '').split(',') if s]
+    count = min(int(params.get('outputsize', 30)), 5000)
+    interval = params.get('interval', '1day')
+
+    def one(symbol):
+        if symbol.startswith('INVALID'):
+            return _not_found(symbol)
+        return {
+            'meta': {'symbol': symbol, 'interval': interval},
+            'values': synthetic_bars(symbol, count, interval),
+            'status': 'ok'
+        }
+
+    if len(symbols) == 1:
+        return 200, one(symbols[0])
+    return 200, {symbol: one(symbol) for symbol in symbols}
+
+
+def _td_quote(params):
+    symbol = params.get('symbol', '')
+    if symbol.startswith('INVALID'):
+        return 200, _not_found(symbol)
+    bar = synthetic_bars(symbol, 1)[0]
+    return 200, dict(bar, symbol=symbol, name=f'{symbol} Inc')
+
+
+def _td_statistics(params):
+    symbol = params.get('symbol', '')
+    rng = random.Random(_seed(symbol))
+    return 200, {'statistics': {'valuations_metrics': {
+        'market_capitalization': rng.randint(1, 3000) * 1e9,
+        'trailing_pe': round(rng.uniform(5, 60), 2)
+    }}}
+
+
+def _td_profile(params):
+    symbol = params.get('symbol', '')
+    return 200, {'symbol': symbol, 'name': f'{symbol} Inc', 'exchange': 'NASDAQ'}
+
+
+def _td_stocks(params):
+    symbols = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX', 'AMD', 'INTC']
+    return 200, {'data': [
+        {'symbol': s, 'name': f'{s} Inc', 'exchange': 'NASDAQ', 'country': 'United States', 'type': 'Common Stock'}
+        for s in symbols
+    ], 'status': 'ok'}
+
+
+def _fh_quote(params):
+    symbol = params.get('symbol', '')
+    bars = synthetic_bars(symbol, 2)
+    current, previous = float(bars[0]['close']), float(bars[1]['close'])
+    return 200, {
+        'c': current, 'h': current * 1.01, 'l': current * 0.99, 'o': previous,
+        'pc': previous, 't': int(time.time())
+    }
+
+
+def _fh_profile(params):
+    symbol = params.get('symbol', '')
+    rng = random.Random(_seed(symbol))
+    return 200, {
+        'name': f'{symbol} Inc', 'ticker': symbol, 'marketCapitalization': rng.randint(1000, 3_000_000),
+        'finnhubIndustry': 'Technology', 'logo': '', 'country': 'US', 'currency': 'USD', 'exchange': 'NASDAQ'
+    }
+
+
+def _fh_metric(params):
+    symbol = params.get('symbol', '')
+    rng = random.Random(_seed(symbol))
+    pe = round(rng.uniform(5, 60), 2)
+    return 200, {'metric': {'peBasicExclExtraTTM': pe, 'peTTM': round(pe * 1.02, 2), 'epsBasicExclExtraTTM': round(rng.uniform(0.5, 10), 2)}}
+
+
+HEADLINES = [
+    '{s} shares surge after earnings beat', '{s} stock falls on weak guidance',
+    '{s} announces product update', 'Analysts see strong growth ahead for {s}',
+    '{s} misses revenue estimates', '{s} hits record high as rally continues'
+]
+
+
+def _fh_company_news(params):
+    symbol = params.get('symbol', '')
+    now = int(time.time())
+    articles = []
+    for i in range(20):
+        articles.append({
+            'id': _seed(symbol) + i,
+            'headline': HEADLINES[i % len(HEADLINES)].format(s=symbol),
+            'summary': f'Coverage of {symbol} number {i}.',
+            'source': 'FakeWire',
+            'url': f'https://news.example.com/{symbol}/{i}',
+            'image': '',
+            'datetime': now - i * 3600
+        })
+    return 200, articles
+
+
+def _fh_news_sentiment(params):
+    # Premium endpoint on the real API; mimic the 403 most keys get
+    return 403, {'error': "You don't have access to this resource."}
+
+
+ROUTES = {
+    '/time_series': _time_series,
+    '/quote': _td_quote,
+    '/statistics': _td_statistics,
+    '/profile': _td_profile,
+    '/stocks': _td_stocks,
+    '/finnhub/quote': _fh_quote,
+    '/finnhub/stock/profile2': _fh_profile,
+    '/finnhub/stock/metric': _fh_metric,
+    '/finnhub/company-news': _fh_company_news,
+    '/finnhub/news-sentiment': _fh_news_sentiment,
+}
+
+
+class FakeUpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.2):
+        super().__init__(address, FakeUpstreamHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, path):
+        with self._lock:
+            self._counts[path] += 1
+
+    def stats(self):
+        with self._lock:
+            return {'total': sum(self._counts.values()), 'by_endpoint': dict(self._counts)}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+    @property
+    def twelve_data_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    @property
+    def finnhub_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/finnhub'
+
+
+def start_fake_upstream(port=0, latency=0.0, jitter=0.2):
+    """Start the server on a background thread and return it"""
+    server = FakeUpstreamServer(('127.0.0.1', port), latency=latency, jitter=jitter)
+    threading.Thread(target=server.serve_forever, name='fake-upstream', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency', type=float, default=0.2, help='Mean upstream latency in seconds')
+    args = parser.parse_args()
+
+    server = FakeUpstreamServer(('127.0.0.1', args.port), latency=args.latency)
+    print(f"Fake upstream listening on {server.twelve_data_url} (Finnhub at {server.finnhub_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
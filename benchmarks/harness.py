@@ -0,0 +1,204 @@
+"""
+Benchmark Harness
+Helpers shared by the benchmark scripts: launching the real app under
+gunicorn against the fake upstream, and driving concurrent HTTP load
+"""
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class GunicornServer:
+    """The app running under gunicorn with gunicorn_config.py, pointed at a fake upstream"""
+
+    def __init__(self, upstream, worker_class='gthread', workers=1, threads=8, env=None, app='app:app'):
+        self.port = free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        self.worker_class = worker_class
+        self.workers = workers
+        self.threads = threads
+        self.app = app
+        self.env = dict(os.environ)
+        self.env.update({
+            'TWELVE_DATA_BASE_URL': upstream.twelve_data_url,
+            'FINNHUB_BASE_URL': upstream.finnhub_url,
+            'CACHE_BACKEND': 'memory',
+            'GUNICORN_WORKER_CLASS': worker_class,
+            'GUNICORN_WORKERS': str(workers),
+            'GUNICORN_THREADS': str(threads),
+            # All load comes from one address, so per-client rate limits
+            # would throttle the whole benchmark; in-flight limits still apply
+            'RATE_LIMIT_PER_SECOND': '1000000',
+            'RATE_LIMIT_BURST': '1000000',
+            # The cold ticker mix makes up symbols on purpose
+            'SYMBOL_VALIDATION': 'off',
+        })
+        self.env.update(env or {})
+        self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self, timeout=60):
+        command = [
+            sys.executable, '-m', 'gunicorn', self.app,
+            '--config', 'gunicorn_config.py',
+            '--bind', f'127.0.0.1:{self.port}',
+            '--access-logfile', '/dev/null',
+            '--log-level', 'warning',
+        ]
+        self.process = subprocess.Popen(
+            command, cwd=PROJECT_ROOT, env=self.env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with code {self.process.returncode}')
+            try:
+                with urllib.request.urlopen(self.url + '/toggle_theme', data=b'', timeout=1):
+                    return
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.2)
+        raise RuntimeError('gunicorn did not become ready in time')
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def worker_pids(self):
+        """PIDs of the gunicorn worker processes (children of the master)"""
+        pids = []
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    fields = f.read().rsplit(')', 1)[1].split()
+                if int(fields[1]) == self.process.pid:
+                    pids.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+        return pids
+
+
+def rss_mb(pid):
+    """Resident set size of a process in MB (Linux /proc)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def drive_load(base_url, make_path, concurrency, duration, timeout=60, seed=0, label=None):
+    """
+    Hammer base_url from `concurrency` client threads for `duration` seconds
+
+    Args:
+        make_path: Callable(random.Random) -> request path
+        concurrency: Number of concurrent clients
+        duration: Seconds to run
+        label: Optional callable(path) -> group name (e.g. route) recorded per request
+
+    Returns:
+        dict: latencies (seconds), (label, status) per request, status counts
+              and elapsed wall time
+    """
+    latencies = []
+    labels = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def client(index):
+        rng = random.Random(seed + index)
+        local_latencies = []
+        local_labels = []
+        local_statuses = {}
+        while time.time() < deadline:
+            path = make_path(rng)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + path, timeout=timeout) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                e.read()
+                status = e.code
+            except (urllib.error.URLError, ConnectionError, OSError):
+                status = 'error'
+            local_latencies.append(time.perf_counter() - start)
+            local_labels.append((label(path) if label else None, status))
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            labels.extend(local_labels)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.time()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {'latencies': latencies, 'labels': labels, 'statuses': statuses, 'elapsed': time.time() - started}
+
+
+def split_by_label(result):
+    """Split a labelled drive_load result into one result per label"""
+    groups = {}
+    for latency, (name, status) in zip(result['latencies'], result['labels']):
+        group = groups.setdefault(name, {'latencies': [], 'labels': [], 'statuses': {}, 'elapsed': result['elapsed']})
+        group['latencies'].append(latency)
+        group['labels'].append((name, status))
+        group['statuses'][status] = group['statuses'].get(status, 0) + 1
+    return groups
+
+
+def summarize(result):
+    """Throughput and latency percentiles (ms) for a drive_load result"""
+    latencies = np.array(result['latencies']) * 1000
+    count = len(latencies)
+    if count == 0:
+        return {'requests': 0, 'rps': 0.0}
+    return {
+        'requests': count,
+        'rps': round(count / result['elapsed'], 2),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 1),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 1),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 1),
+        'max_ms': round(float(latencies.max()), 1),
+        'statuses': {str(k): v for k, v in sorted(result['statuses'].items(), key=lambda kv: str(kv[0]))},
+    }
@@ -0,0 +1,98 @@
+"""
+Import Profile
+Reports where worker boot time goes by running `python -X importtime` on a
+module (app by default) in a fresh interpreter
+
+Prints the slowest imports by cumulative time, the top-level packages that
+account for it, and whether the heavy optional modules (ta, sklearn,
+TensorFlow) were imported at all.
+
+Usage:
+    python benchmarks/import_profile.py
+    python benchmarks/import_profile.py --module wsgi --top 30 --json profile.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import PROJECT_ROOT
+
+LAZY_MODULES = ('ta', 'sklearn', 'tensorflow', 'keras')
+
+
+def profile_imports(module, env=None):
+    """
+    Import `module` in a fresh interpreter under -X importtime
+
+    Returns:
+        list of dicts: name, depth, self_ms, cumulative_ms (in import order)
+    """
+    run_env = dict(os.environ)
+    run_env.setdefault('CACHE_BACKEND', 'memory')
+    run_env.update(env or {})
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, env=run_env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append({
+            'name': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    return entries
+
+
+def summarize(entries, top):
+    by_package = {}
+    for entry in entries:
+        package = entry['name'].split('.')[0]
+        by_package[package] = by_package.get(package, 0.0) + entry['self_ms']
+
+    imported = {entry['name'].split('.')[0] for entry in entries}
+    return {
+        'total_ms': round(sum(entry['self_ms'] for entry in entries), 1),
+        'slowest': sorted(entries, key=lambda e: e['cumulative_ms'], reverse=True)[:top],
+        'packages': dict(sorted(((k, round(v, 1)) for k, v in by_package.items()),
+                                key=lambda kv: kv[1], reverse=True)[:top]),
+        'lazy_modules_imported': {name: name in imported for name in LAZY_MODULES},
+    }
+
+
+def print_report(module, report):
+    print(f"import {module}: {report['total_ms']:.1f} ms")
+    print("\nSlowest imports (cumulative):")
+    for entry in report['slowest']:
+        print(f"  {entry['cumulative_ms']:9.1f} ms  {'  ' * entry['depth']}{entry['name']}")
+    print("\nSelf time by top-level package:")
+    for package, ms in report['packages'].items():
+        print(f"  {ms:9.1f} ms  {package}")
+    print("\nHeavy optional modules imported at boot:")
+    for name, imported in report['lazy_modules_imported'].items():
+        print(f"  {name:12s} {'yes' if imported else 'no'}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json', help='Also write the report to this file')
+    args = parser.parse_args()
+
+    report = summarize(profile_imports(args.module), args.top)
+    print_report(args.module, report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,284 @@
+"""
+Load Test
+Drives the real app under gunicorn (gunicorn_config.py) against the fake
+upstream with a weighted mix of API routes and tickers, and writes a JSON
+baseline that later runs can be compared against
+
+Reported overall and per route: requests/sec, p50/p95/p99/max latency and
+status counts; plus peak and final RSS per worker and upstream calls per
+endpoint (and per request).
+
+Ticker mixes:
+    hot      - a few tickers get most of the traffic (Zipf-like weights)
+    uniform  - every ticker in --tickers equally often
+    cold     - a new symbol on every request (no cache hits)
+
+Usage:
+    python benchmarks/loadtest.py --concurrency 16 --duration 30 --output baseline.json
+    python benchmarks/loadtest.py --output current.json --compare baseline.json
+    python benchmarks/loadtest.py --routes stock_data=1 --mix cold --workers 2
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_upstream import start_fake_upstream
+from harness import PROJECT_ROOT, GunicornServer, drive_load, rss_mb, split_by_label, summarize
+
+ROUTES = {
+    'stock_data': '/api/stock_data/{ticker}?days=7',
+    'technical': '/api/technical/{ticker}',
+    'news': '/api/news/{ticker}',
+    'sentiment': '/api/sentiment/{ticker}',
+    'company': '/api/company/{ticker}',
+}
+DEFAULT_ROUTE_MIX = 'stock_data=50,technical=15,news=15,sentiment=10,company=10'
+DEFAULT_TICKERS = 'AAPL,MSFT,GOOGL,AMZN,TSLA,META,NVDA,NFLX,AMD,INTC'
+
+# Relative change beyond which --compare reports a regression
+DEFAULT_TOLERANCE = 10.0  # percent
+
+
+def parse_weights(spec):
+    """'a=3,b=1' -> {'a': 3.0, 'b': 1.0}"""
+    weights = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in ROUTES:
+            raise SystemExit(f"Unknown route '{name}' (choose from {', '.join(ROUTES)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def make_path_factory(route_weights, tickers, mix):
+    routes = list(route_weights)
+    route_cum = _cumulative(route_weights.values())
+    ticker_cum = _cumulative(1.0 / (rank + 1) for rank in range(len(tickers))) if mix == 'hot' else None
+
+    def make_path(rng):
+        route = routes[_pick(rng, route_cum)]
+        if mix == 'cold':
+            ticker = f'SYM{rng.randrange(10 ** 9)}'
+        elif mix == 'hot':
+            ticker = tickers[_pick(rng, ticker_cum)]
+        else:
+            ticker = rng.choice(tickers)
+        return ROUTES[route].format(ticker=ticker)
+
+    return make_path
+
+
+def _cumulative(weights):
+    total, cumulative = 0.0, []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return [c / total for c in cumulative]
+
+
+def _pick(rng, cumulative):
+    r = rng.random()
+    for i, bound in enumerate(cumulative):
+        if r <= bound:
+            return i
+    return len(cumulative) - 1
+
+
+def route_of(path):
+    return path.split('?')[0].split('/')[2]
+
+
+class RSSSampler(threading.Thread):
+    """Samples the RSS of every gunicorn worker while the load runs"""
+
+    def __init__(self, server, interval=0.5):
+        super().__init__(daemon=True)
+        self.server = server
+        self.interval = interval
+        self.peak = {}
+        self.peak_total = 0.0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            sample = {pid: rss_mb(pid) for pid in self.server.worker_pids()}
+            for pid, rss in sample.items():
+                self.peak[pid] = max(self.peak.get(pid, 0.0), rss)
+            self.peak_total = max(self.peak_total, sum(sample.values()))
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        final = {pid: rss_mb(pid) for pid in self.server.worker_pids()}
+        return {
+            'peak_per_worker_mb': {str(pid): round(mb, 1) for pid, mb in self.peak.items()},
+            'final_per_worker_mb': {str(pid): round(mb, 1) for pid, mb in final.items()},
+            'peak_total_mb': round(self.peak_total, 1),
+        }
+
+
+def upstream_stats(upstream):
+    with urllib.request.urlopen(upstream.twelve_data_url + '/__stats') as response:
+        return json.load(response)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    route_weights = parse_weights(args.routes)
+    tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()]
+    make_path = make_path_factory(route_weights, tickers, args.mix)
+
+    upstream = start_fake_upstream(latency=args.latency)
+    with GunicornServer(upstream, worker_class=args.worker_class, workers=args.workers, threads=args.threads) as server:
+        if args.warmup:
+            drive_load(server.url, make_path, args.concurrency, args.warmup, seed=10_000)
+        upstream.reset()
+
+        sampler = RSSSampler(server)
+        sampler.start()
+        result = drive_load(server.url, make_path, args.concurrency, args.duration, label=route_of)
+        memory = sampler.stop()
+        calls = upstream_stats(upstream)
+    upstream.shutdown()
+
+    overall = summarize(result)
+    routes = {name: summarize(group) for name, group in sorted(split_by_label(result).items())}
+    report = {
+        'meta': {
+            'git_revision': git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {
+            'routes': route_weights,
+            'tickers': tickers,
+            'mix': args.mix,
+            'concurrency': args.concurrency,
+            'duration_s': args.duration,
+            'warmup_s': args.warmup,
+            'upstream_latency_s': args.latency,
+            'worker_class': args.worker_class,
+            'workers': args.workers,
+            'threads': args.threads,
+        },
+        'overall': overall,
+        'routes': routes,
+        'memory': memory,
+        'upstream': {
+            'total': calls['total'],
+            'per_request': round(calls['total'] / overall['requests'], 3) if overall['requests'] else None,
+            'by_endpoint': dict(sorted(calls['by_endpoint'].items())),
+        },
+    }
+    return report
+
+
+def print_report(report):
+    print(f"{'route':12s} {'requests':>9s} {'rps':>8s} {'p50_ms':>8s} {'p95_ms':>8s} {'p99_ms':>8s}  statuses")
+    rows = [('overall', report['overall'])] + list(report['routes'].items())
+    for name, s in rows:
+        if not s.get('requests'):
+            continue
+        print(f"{name:12s} {s['requests']:9d} {s['rps']:8.1f} {s['p50_ms']:8.1f} {s['p95_ms']:8.1f} {s['p99_ms']:8.1f}  {s['statuses']}")
+    print(f"\nWorker RSS: peak total {report['memory']['peak_total_mb']} MB, "
+          f"peak per worker {report['memory']['peak_per_worker_mb']}")
+    print(f"Upstream calls: {report['upstream']['total']} "
+          f"({report['upstream']['per_request']} per request) {report['upstream']['by_endpoint']}")
+
+
+def compare(baseline, current, tolerance):
+    """
+    Print metric deltas against a baseline report
+
+    Returns:
+        list of regression descriptions (empty if none exceed tolerance)
+    """
+    regressions = []
+    print(f"\nCompared with baseline {baseline['meta'].get('git_revision')} ({baseline['meta'].get('timestamp')}):")
+    print(f"{'route':12s} {'metric':8s} {'baseline':>10s} {'current':>10s} {'change':>9s}")
+
+    names = ['overall'] + sorted(set(baseline['routes']) | set(current['routes']))
+    for name in names:
+        old = baseline['overall'] if name == 'overall' else baseline['routes'].get(name, {})
+        new = current['overall'] if name == 'overall' else current['routes'].get(name, {})
+        for metric, higher_is_better in (('rps', True), ('p50_ms', False), ('p95_ms', False), ('p99_ms', False)):
+            if metric not in old or metric not in new:
+                continue
+            change = _percent_change(old[metric], new[metric])
+            flag = ''
+            if change is not None and (-change if higher_is_better else change) > tolerance:
+                flag = '  REGRESSION'
+                regressions.append(f'{name} {metric}: {old[metric]} -> {new[metric]} ({change:+.1f}%)')
+            change_text = f'{change:+.1f}%' if change is not None else 'n/a'
+            print(f"{name:12s} {metric:8s} {old[metric]:10.1f} {new[metric]:10.1f} {change_text:>9s}{flag}")
+
+    for label, old, new in (
+        ('upstream calls/request', baseline['upstream']['per_request'], current['upstream']['per_request']),
+        ('peak total RSS (MB)', baseline['memory']['peak_total_mb'], current['memory']['peak_total_mb']),
+    ):
+        change = _percent_change(old, new)
+        change_text = f'{change:+.1f}%' if change is not None else 'n/a'
+        print(f"{label:22s} {old} -> {new} ({change_text})")
+        if change is not None and change > tolerance:
+            regressions.append(f'{label}: {old} -> {new} ({change:+.1f}%)')
+
+    if baseline['config'] != current['config']:
+        print("\nNote: load configuration differs from the baseline; deltas are not like-for-like")
+    return regressions
+
+
+def _percent_change(old, new):
+    if old is None or new is None or not old:
+        return None
+    return (new - old) / old * 100
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--routes', default=DEFAULT_ROUTE_MIX, help='Weighted route mix, e.g. stock_data=3,news=1')
+    parser.add_argument('--tickers', default=DEFAULT_TICKERS)
+    parser.add_argument('--mix', choices=('hot', 'uniform', 'cold'), default='hot')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured warm-up seconds')
+    parser.add_argument('--latency', type=float, default=0.1, help='Mean simulated upstream latency (s)')
+    parser.add_argument('--worker-class', default='gthread')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--output', help='Write the report (baseline) to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON to diff against; exits 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='Regression threshold in percent')
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        if regressions:
+            print("\nRegressions beyond tolerance:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
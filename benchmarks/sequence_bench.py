@@ -0,0 +1,103 @@
+"""
+Sequence Builder Benchmark
+Time and peak memory of turning scaled price rows into LSTM training windows:
+the old list-of-slices loop, DataTransformation.create_sequences (strided
+view) and a full epoch of batches copied out of that view one at a time (as
+window_dataset feeds training)
+
+Runs at one ticker (--bars x --features) and at multi-ticker scale (--tickers
+of those, one after another as batch training sees them). Peak memory is
+what tracemalloc sees numpy allocate, excluding the input rows.
+
+Usage:
+    python benchmarks/sequence_bench.py --bars 5000 --features 6 --tickers 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.components.data_transformation import DataTransformation
+
+
+def loop_sequences(data, seq_length):
+    """The list-of-slices builder create_sequences replaced (baseline)"""
+    X, y = [], []
+    for i in range(len(data) - seq_length):
+        X.append(data[i:i+seq_length])
+        y.append(data[i+seq_length, 0])
+    return np.array(X), np.array(y)
+
+
+def sequence_batches(X, y, batch_size, shuffle=False, seed=None):
+    """One epoch of (X_batch, y_batch) copied out of create_sequences' windows one batch at a time"""
+    order = np.random.default_rng(seed).permutation(len(X)) if shuffle else np.arange(len(X))
+    for start in range(0, len(X), batch_size):
+        rows = order[start:start + batch_size]
+        yield X[rows], y[rows]
+
+
+def measure(fn, datasets):
+    """Run fn over every dataset; returns (seconds, peak MB allocated while running)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    for data in datasets:
+        fn(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def run(args):
+    transformation = DataTransformation()
+    rng = np.random.default_rng(0)
+
+    def build_loop(data):
+        X, y = loop_sequences(data, args.seq_length)
+        return float(X[-1, -1, 0] + y[-1])
+
+    def build_view(data):
+        X, y = transformation.create_sequences(data, args.seq_length)
+        return float(X[-1, -1, 0] + y[-1])
+
+    def epoch_batches(data):
+        total = 0.0
+        X, y = transformation.create_sequences(data, args.seq_length)
+        for X_batch, y_batch in sequence_batches(X, y, args.batch_size, shuffle=True):
+            total += float(X_batch[0, 0, 0] + y_batch[0])
+        return total
+
+    report = {'seq_length': args.seq_length, 'batch_size': args.batch_size}
+    for label, tickers in (('single_ticker', 1), ('multi_ticker', args.tickers)):
+        datasets = [rng.random((args.bars, args.features)) for _ in range(tickers)]
+        windows = sum(max(len(data) - args.seq_length, 0) for data in datasets)
+        scale = {
+            'tickers': tickers,
+            'bars': args.bars,
+            'features': args.features,
+            'windows': windows,
+            'full_tensor_mb': round(windows * args.seq_length * args.features * 8 / 2**20, 1),
+        }
+        for name, fn in (('loop', build_loop), ('view', build_view), ('batched_epoch', epoch_batches)):
+            elapsed, peak_mb = measure(fn, datasets)
+            scale[name] = {'ms': round(elapsed * 1000, 2), 'peak_mb': round(peak_mb, 2)}
+        report[label] = scale
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=5000)
+    parser.add_argument('--features', type=int, default=6)
+    parser.add_argument('--tickers', type=int, default=20, help='Tickers for the multi-ticker scale')
+    parser.add_argument('--seq-length', type=int, default=60)
+    parser.add_argument('--batch-size', type=int, default=32)
+    run(parser.parse_args())
@@ -0,0 +1,66 @@
+"""
+Worker Mode Benchmark
+Compares /api/stock_data throughput of the previous single sync worker with
+the threaded (gthread) worker mode from gunicorn_config.py
+
+Every request uses a fresh ticker so it misses the cache and pays the
+(simulated) upstream latency, which is what blocks a sync worker.
+
+Usage:
+    python benchmarks/worker_mode_bench.py --latency 0.2 --concurrency 16 --duration 20
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_upstream import start_fake_upstream
+from harness import GunicornServer, drive_load, summarize
+
+
+def cold_ticker_path(rng):
+    return f'/api/stock_data/SYM{rng.randrange(10 ** 9)}?days=1'
+
+
+def run(args):
+    upstream = start_fake_upstream(latency=args.latency)
+    modes = [
+        ('sync x1', {'worker_class': 'sync', 'threads': 1}),
+        (f'gthread x1 ({args.threads} threads)', {'worker_class': 'gthread', 'threads': args.threads}),
+    ]
+    if args.gevent:
+        modes.append(('gevent x1', {'worker_class': 'gevent', 'threads': 1}))
+
+    results = {}
+    for label, options in modes:
+        with GunicornServer(upstream, workers=1, **options) as server:
+            # Warm the worker (imports, model load) outside the measured window
+            drive_load(server.url, cold_ticker_path, concurrency=1, duration=1)
+            results[label] = summarize(drive_load(server.url, cold_ticker_path, args.concurrency, args.duration))
+        print(f"{label:28s} {results[label]}")
+
+    baseline = results['sync x1']['rps'] or 1
+    for label, summary in results.items():
+        summary['speedup_vs_sync'] = round(summary['rps'] / baseline, 2)
+
+    report = {
+        'upstream_latency_s': args.latency,
+        'concurrency': args.concurrency,
+        'duration_s': args.duration,
+        'results': results,
+    }
+    print(json.dumps(report, indent=2))
+    upstream.shutdown()
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.2, help='Mean simulated upstream latency (s)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--gevent', action='store_true', help='Also measure the gevent worker (needs gevent)')
+    run(parser.parse_args())
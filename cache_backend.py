@@ -0,0 +1,482 @@
+"""
+Shared Cache Backend
+Pluggable cache for market data, indicators and predictions that is shared by
+every gunicorn worker and the MLOps scheduler, and survives worker restarts
+
+Backends:
+    memory  - in-process dict (tests, single worker)
+    sqlite  - SQLite file in WAL mode (several workers on one host)
+    redis   - any server speaking the Redis protocol (several hosts)
+
+Values are stored in a compact binary encoding (raw column buffers plus a
+small JSON header for DataFrames/arrays, JSON for plain data) rather than
+pickles, so any backend can be read safely by any process.
+"""
+import json
+import os
+import socket
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'sqlite')
+CACHE_PATH = os.getenv('CACHE_PATH', os.path.join(tempfile.gettempdir(), 'vionex_cache.sqlite3'))
+REDIS_URL = os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+# Bumped by the training scheduler whenever new models are registered so that
+# cached predictions from older models stop being served
+MODEL_GENERATION_KEY = 'model_generation'
+
+
+# ===== ENCODING =====
+
+_HEADER = struct.Struct('>I')
+
+
+def _pack(tag, header, *buffers):
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return tag + _HEADER.pack(len(header_bytes)) + header_bytes + b''.join(buffers)
+
+
+def _unpack(payload):
+    (header_length,) = _HEADER.unpack_from(payload, 1)
+    start = 1 + _HEADER.size
+    header = json.loads(payload[start:start + header_length].decode('utf-8'))
+    return header, memoryview(payload)[start + header_length:]
+
+
+def _encode_array(values):
+    """Header entry and raw buffer for a 1-D array (JSON list for object data)"""
+    array = np.asarray(values)
+    if array.dtype.kind in 'biufcmM':
+        array = np.ascontiguousarray(array)
+        return {'dtype': array.dtype.str, 'size': len(array)}, array.tobytes()
+    return {'dtype': 'json', 'values': [None if pd.isna(v) else str(v) for v in array]}, b''
+
+
+def _decode_array(meta, buffer, offset):
+    """Inverse of _encode_array; returns (array, new offset)"""
+    if meta['dtype'] == 'json':
+        return np.array(meta['values'], dtype=object), offset
+    dtype = np.dtype(meta['dtype'])
+    end = offset + dtype.itemsize * meta['size']
+    return np.frombuffer(buffer[offset:end], dtype=dtype).copy(), end
+
+
+def encode_value(value):
+    """
+    Serialize a value for the cache
+
+    Args:
+        value: None, bytes, pd.DataFrame, np.ndarray or JSON-serializable data
+
+    Returns:
+        bytes: Tagged binary payload
+    """
+    if value is None:
+        return b'N'
+    if isinstance(value, bytes):
+        return b'B' + value
+    if isinstance(value, pd.DataFrame):
+        index_meta, index_buffer = _encode_array(value.index)
+        buffers = [index_buffer]
+        columns = []
+        for name in value.columns:
+            meta, buffer = _encode_array(value[name].to_numpy())
+            meta['name'] = str(name)
+            columns.append(meta)
+            buffers.append(buffer)
+        header = {'index': index_meta, 'index_name': value.index.name, 'columns': columns}
+        return _pack(b'D', header, *buffers)
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        return _pack(b'A', {'dtype': array.dtype.str, 'shape': list(array.shape)}, array.tobytes())
+    return b'J' + json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def decode_value(payload):
+    """Inverse of encode_value"""
+    tag = payload[:1]
+    if tag == b'N':
+        return None
+    if tag == b'B':
+        return payload[1:]
+    if tag == b'J':
+        return json.loads(payload[1:].decode('utf-8'))
+    if tag == b'A':
+        header, buffer = _unpack(payload)
+        return np.frombuffer(buffer, dtype=np.dtype(header['dtype'])).reshape(header['shape']).copy()
+    if tag == b'D':
+        header, buffer = _unpack(payload)
+        index, offset = _decode_array(header['index'], buffer, 0)
+        data = {}
+        for meta in header['columns']:
+            data[meta['name']], offset = _decode_array(meta, buffer, offset)
+        frame = pd.DataFrame(data, index=pd.Index(index, name=header['index_name']),
+                             columns=[meta['name'] for meta in header['columns']])
+        return frame
+    raise ValueError(f"Unknown cache payload tag: {tag!r}")
+
+
+# ===== BACKENDS =====
+
+class CacheBackend:
+    """
+    Byte-level cache interface
+
+    Subclasses implement get/get_many/set/add/delete/incr on raw bytes;
+    get_value/set_value add the binary encoding on top.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def get_many(self, keys):
+        return {key: self.get(key) for key in keys}
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def add(self, key, value, ttl):
+        """Set key only if it does not exist; returns True if it was set"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key):
+        """Atomically increment an integer counter (no expiry) and return it"""
+        raise NotImplementedError
+
+    def get_value(self, key, default=None):
+        """Decoded value for key, or default on a miss"""
+        payload = self.get(key)
+        return default if payload is None else decode_value(payload)
+
+    def get_values(self, keys):
+        """Decoded values for the keys that are present"""
+        return {key: decode_value(payload) for key, payload in self.get_many(keys).items() if payload is not None}
+
+    def set_value(self, key, value, ttl):
+        self.set(key, encode_value(value), ttl)
+
+    def get_counter(self, key):
+        payload = self.get(key)
+        return int(payload) if payload is not None else 0
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process backend (per worker); stores encoded bytes like the shared backends"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry[0]
+
+    def get(self, key):
+        with self._lock:
+            return self._live(key, time.time())
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl if ttl else None)
+
+    def add(self, key, value, ttl):
+        with self._lock:
+            now = time.time()
+            if self._live(key, now) is not None:
+                return False
+            self._data[key] = (value, now + ttl if ttl else None)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._live(key, time.time()) or 0) + 1
+            self._data[key] = (str(value).encode(), None)
+            return value
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Single-host shared backend on a SQLite file
+
+    WAL mode lets readers in every worker proceed while one writes; each
+    thread gets its own connection. Expired rows are purged periodically.
+    """
+
+    PURGE_EVERY = 500  # writes
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, time.time())
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def get_many(self, keys):
+        keys = list(keys)
+        results = {key: None for key in keys}
+        if keys:
+            placeholders = ','.join('?' * len(keys))
+            rows = self._connect().execute(
+                f'SELECT key, value FROM cache WHERE key IN ({placeholders}) '
+                'AND (expires_at IS NULL OR expires_at > ?)',
+                (*keys, time.time())
+            ).fetchall()
+            for key, value in rows:
+                results[key] = bytes(value)
+        return results
+
+    def set(self, key, value, ttl):
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, sqlite3.Binary(value), time.time() + ttl if ttl else None)
+        )
+        self._after_write(conn)
+
+    def add(self, key, value, ttl):
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM cache WHERE key = ? AND expires_at IS NOT NULL AND expires_at <= ?', (key, now))
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, sqlite3.Binary(value), now + ttl if ttl else None)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def incr(self, key):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+            value = int(bytes(row[0])) + 1 if row else 1
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, NULL)',
+                (key, sqlite3.Binary(str(value).encode()))
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return value
+
+    def _after_write(self, conn):
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            conn.execute('DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+
+
+def _safe_to_repeat(args):
+    """Whether applying a Redis command twice has the same effect as once"""
+    command = str(args[0]).upper()
+    if command == 'INCR':
+        return False
+    if command == 'SET':
+        return not any(str(arg).upper() == 'NX' for arg in args[3:])
+    return True
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend for any server speaking the Redis protocol (RESP2)
+
+    Implements the handful of commands the cache needs over a plain socket,
+    so no client library is required. One connection per thread.
+    """
+
+    def __init__(self, url=REDIS_URL, timeout=2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or '127.0.0.1'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            if self.password:
+                self._send(conn, 'AUTH', self.password)
+                self._read(conn[1])
+            if self.db:
+                self._send(conn, 'SELECT', self.db)
+                self._read(conn[1])
+        return conn
+
+    def _send(self, conn, *args):
+        sock, _ = conn
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        sock.sendall(b''.join(parts))
+
+    def _read(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError('Redis connection closed')
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest
+        if kind == b'-':
+            raise RuntimeError(rest.decode('utf-8', 'replace'))
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self._read(reader) for _ in range(count)]
+        raise RuntimeError(f'Unexpected Redis reply: {line!r}')
+
+    def execute(self, *args):
+        """
+        Run a command, reconnecting once if the connection went away
+
+        A failure while connecting or sending is retried on a new connection.
+        A failure while reading the reply (including a timeout) may come after
+        the server applied the command, so only commands that are safe to
+        apply twice are re-sent then; INCR and SET NX raise instead.
+        """
+        try:
+            conn = self._connection()
+            self._send(conn, *args)
+        except (ConnectionError, OSError):
+            self._reset()
+            conn = self._connection()
+            self._send(conn, *args)
+        try:
+            return self._read(conn[1])
+        except (ConnectionError, OSError):
+            self._reset()
+            if not _safe_to_repeat(args):
+                raise
+        conn = self._connection()
+        self._send(conn, *args)
+        return self._read(conn[1])
+
+    def _reset(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn[0].close()
+            except OSError:
+                pass
+
+    def get(self, key):
+        return self.execute('GET', key)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        return dict(zip(keys, self.execute('MGET', *keys)))
+
+    def set(self, key, value, ttl):
+        if ttl:
+            self.execute('SET', key, value, 'PX', int(ttl * 1000))
+        else:
+            self.execute('SET', key, value)
+
+    def add(self, key, value, ttl):
+        if ttl:
+            return self.execute('SET', key, value, 'NX', 'PX', int(ttl * 1000)) is not None
+        return self.execute('SET', key, value, 'NX') is not None
+
+    def delete(self, key):
+        self.execute('DEL', key)
+
+    def incr(self, key):
+        return self.execute('INCR', key)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def create_cache(backend=CACHE_BACKEND):
+    """Instantiate a backend by name ('memory', 'sqlite' or 'redis')"""
+    if backend == 'memory':
+        return MemoryCacheBackend()
+    if backend == 'sqlite':
+        return SQLiteCacheBackend(CACHE_PATH)
+    if backend == 'redis':
+        return RedisCacheBackend(REDIS_URL)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def get_cache():
+    """Process-wide cache configured from CACHE_BACKEND"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_cache()
+    return _cache
+
+
+def set_cache(cache):
+    """Replace the process-wide cache (tests, custom wiring)"""
+    global _cache
+    _cache = cache
@@ -0,0 +1,123 @@
+"""
+Circuit Breaker
+Per provider/endpoint breakers for upstream API calls, so a slow or failing
+Twelve Data / Finnhub endpoint fails fast instead of tying up a worker thread
+for the full timeout on every request
+
+States:
+    closed     - calls go through; outcomes are recorded in a rolling window
+    open       - calls are rejected with CircuitOpenError until RESET_TIMEOUT passes
+    half_open  - one probe call is let through; success closes the breaker,
+                 failure re-opens it
+
+A call counts as failed when it raises, returns 429/5xx, or takes longer than
+SLOW_CALL_THRESHOLD. The breaker opens when at least MIN_CALLS of the last
+WINDOW_SIZE calls were recorded and FAILURE_RATE of them failed.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+
+from log_config import get_logger
+from metrics import metrics
+
+logger = get_logger(__name__)
+
+WINDOW_SIZE = int(os.getenv('CIRCUIT_WINDOW_SIZE', 20))
+MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', 5))
+FAILURE_RATE = float(os.getenv('CIRCUIT_FAILURE_RATE', 0.5))
+RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))  # seconds
+SLOW_CALL_THRESHOLD = float(os.getenv('CIRCUIT_SLOW_CALL_THRESHOLD', 5))  # seconds
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an upstream endpoint whose breaker is open"""
+
+
+class CircuitBreaker:
+    """Rolling-window breaker for one upstream endpoint (thread-safe, per process)"""
+
+    def __init__(self, provider, endpoint, window_size=WINDOW_SIZE, min_calls=MIN_CALLS,
+                 failure_rate=FAILURE_RATE, reset_timeout=RESET_TIMEOUT,
+                 slow_call_threshold=SLOW_CALL_THRESHOLD):
+        self.provider = provider
+        self.endpoint = endpoint
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window_size)  # True = failed
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go upstream now (claims the probe slot when half-open)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._transition(HALF_OPEN)
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record(self, failed, duration=0.0):
+        """Record the outcome of a call that allow() let through"""
+        failed = failed or duration > self.slow_call_threshold
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                self._outcomes.clear()
+                if failed:
+                    self._open()
+                else:
+                    self._transition(CLOSED)
+                return
+
+            self._outcomes.append(failed)
+            if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._transition(OPEN)
+
+    def _transition(self, state):
+        if state == self.state:
+            return
+        logger.warning("Circuit for %s %s: %s -> %s", self.provider, self.endpoint, self.state, state)
+        self.state = state
+        metrics.inc('circuit_breaker_transitions_total', provider=self.provider,
+                    endpoint=self.endpoint, state=state)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider, endpoint):
+    """The process-wide breaker for a provider/endpoint pair"""
+    key = (provider, endpoint)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(key, CircuitBreaker(provider, endpoint))
+    return breaker
+
+
+def breaker_states():
+    """{'provider endpoint': state} for every breaker created so far"""
+    return {f'{provider} {endpoint}': breaker.state for (provider, endpoint), breaker in _breakers.items()}
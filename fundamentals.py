@@ -0,0 +1,268 @@
+"""
+Fundamentals Service
+One normalized record per ticker (name, industry, market cap, P/E, EPS, ...)
+merged from several upstream sources fetched in parallel, kept for the day
+in a snapshot file shared by every worker and the MLOps scheduler
+
+Market cap, P/E and industry change at most daily, so a record is fetched
+once per day: a record from an earlier day is still served while one
+background refresh replaces it. refresh() updates many tickers at once (the
+watchlist, daily or on demand; see `python fundamentals.py --help`).
+
+Snapshots are JSON files named fundamentals-YYYY-MM-DD.json in
+FUNDAMENTALS_DIR; each holds every known record, so the newest file is all a
+process needs to load. Files older than SNAPSHOT_KEEP_DAYS are removed.
+"""
+import argparse
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+FUNDAMENTALS_DIR = os.getenv('FUNDAMENTALS_DIR', os.path.join(tempfile.gettempdir(), 'vionex_fundamentals'))
+FUNDAMENTALS_WATCHLIST = os.getenv('FUNDAMENTALS_WATCHLIST', 'AAPL,TSLA,GOOGL,MSFT,AMZN')
+SNAPSHOT_KEEP_DAYS = 7
+SNAPSHOT_PREFIX = 'fundamentals-'
+FAILURE_BACKOFF = 300  # seconds before a failed background refresh is retried
+RELOAD_CHECK_INTERVAL = 5  # seconds between checks for snapshots written by other processes
+FETCH_THREADS = 8
+
+# Fields of a normalized record and their values when no source provided one
+DEFAULTS = {
+    'name': None,
+    'industry': 'N/A',
+    'logo': '',
+    'country': 'US',
+    'currency': 'USD',
+    'exchange': 'NASDAQ',
+    'market_cap': 0,  # millions
+    'pe_ratio': None,
+    'trailing_pe': None,
+    'eps': None,
+}
+
+
+def watchlist():
+    """Tickers refreshed in bulk (FUNDAMENTALS_WATCHLIST)"""
+    return [t.strip().upper() for t in FUNDAMENTALS_WATCHLIST.split(',') if t.strip()]
+
+
+class FundamentalsService:
+    """
+    Daily per-ticker fundamentals records (thread-safe, shared across processes via snapshot files)
+
+    Args:
+        sources: {name: callable(ticker) -> dict of record fields}; a source
+            raises when its upstream call fails
+        directory: Where the daily snapshot files live
+    """
+
+    def __init__(self, sources, directory=FUNDAMENTALS_DIR, threads=FETCH_THREADS):
+        self.sources = dict(sources)
+        self.directory = directory
+        self.threads = threads
+        self._records = {}
+        self._loaded = (None, 0.0)  # (snapshot path, mtime)
+        self._checked_at = 0.0
+        self._refreshing = {}  # ticker -> Future
+        self._failed_at = {}  # ticker -> time of the last refresh that failed entirely
+        self._lock = threading.Lock()
+        self._executor = None  # tickers
+        self._source_executor = None  # the source calls of those tickers
+        self._pid = None
+
+    # ----- reading -----
+
+    def get(self, ticker):
+        """
+        The ticker's record; fetched now if unknown, refreshed in the background if from an earlier day
+
+        Returns:
+            dict: Normalized record (DEFAULTS for fields no source provided)
+        """
+        self._reload_if_changed()
+        record = self._records.get(ticker)
+        if record is None:
+            # An unknown ticker whose fetch just failed is not fetched again until FAILURE_BACKOFF passes
+            record = None if self._backing_off(ticker) else self._wait(self._submit(ticker))
+            if record is None:
+                return self._placeholder(ticker)
+        elif record['as_of'] != date.today().isoformat():
+            if not self._backing_off(ticker):
+                self._submit(ticker)
+        return record
+
+    def _backing_off(self, ticker):
+        return time.time() - self._failed_at.get(ticker, 0) <= FAILURE_BACKOFF
+
+    def _placeholder(self, ticker):
+        return dict(DEFAULTS, ticker=ticker, name=ticker, as_of=None)
+
+    def _wait(self, future):
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning("Fundamentals fetch failed: %s", e)
+            return None
+
+    # ----- refreshing -----
+
+    def refresh(self, tickers, force=False):
+        """
+        Refresh many tickers in parallel (only those not refreshed today unless force)
+
+        Returns:
+            dict: ticker -> record, for the tickers that were refreshed
+        """
+        self._reload_if_changed()
+        today = date.today().isoformat()
+        due = [t for t in tickers if force or self._records.get(t, {}).get('as_of') != today]
+        futures = {ticker: self._submit(ticker) for ticker in due}
+        results = {ticker: self._wait(future) for ticker, future in futures.items()}
+        refreshed = {ticker: record for ticker, record in results.items() if record is not None}
+        logger.info("Refreshed fundamentals for %d of %d tickers", len(refreshed), len(due))
+        return refreshed
+
+    def _submit(self, ticker):
+        """Start (or join) the refresh of one ticker"""
+        with self._lock:
+            self._ensure_executors()
+            future = self._refreshing.get(ticker)
+            if future is None:
+                future = self._executor.submit(self._fetch_and_store, ticker)
+                self._refreshing[ticker] = future
+                future.add_done_callback(lambda _f, t=ticker: self._done(t))
+            return future
+
+    def _ensure_executors(self):
+        """Thread pools for this process (recreated after a fork); call with the lock held"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='fundamentals')
+            self._source_executor = ThreadPoolExecutor(max_workers=self.threads * len(self.sources),
+                                                       thread_name_prefix='fundamentals-source')
+            self._refreshing = {}
+
+    def _done(self, ticker):
+        with self._lock:
+            self._refreshing.pop(ticker, None)
+
+    def _fetch_and_store(self, ticker):
+        record = self.fetch(ticker, previous=self._records.get(ticker))
+        if record is None:
+            self._failed_at[ticker] = time.time()
+        else:
+            self._failed_at.pop(ticker, None)
+            self._save({ticker: record})
+        return record
+
+    def fetch(self, ticker, previous=None):
+        """
+        Fetch every source for one ticker in parallel and merge them into a record
+
+        Fields from a failed source keep their previous value. Returns None
+        if every source failed.
+        """
+        with self._lock:
+            self._ensure_executors()
+        calls = {name: self._source_executor.submit(source, ticker) for name, source in self.sources.items()}
+        record = dict(DEFAULTS, name=ticker)
+        if previous:
+            record.update({field: previous[field] for field in DEFAULTS if field in previous})
+        succeeded = 0
+        for name, call in calls.items():
+            try:
+                fields = call.result()
+            except Exception as e:
+                logger.warning("Fundamentals source %s failed for %s: %s", name, ticker, e)
+                continue
+            succeeded += 1
+            record.update({field: value for field, value in fields.items() if field in DEFAULTS and value is not None})
+        if not succeeded:
+            return None
+        record.update(ticker=ticker, as_of=date.today().isoformat(), updated_at=time.time())
+        return record
+
+    # ----- snapshots -----
+
+    def _snapshot_files(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if n.startswith(SNAPSHOT_PREFIX) and n.endswith('.json'))
+
+    def _read(self, name):
+        try:
+            with open(os.path.join(self.directory, name)) as f:
+                return json.load(f).get('records', {})
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read fundamentals snapshot %s: %s", name, e)
+            return {}
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        files = self._snapshot_files()
+        if not files:
+            return
+        path = os.path.join(self.directory, files[-1])
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return
+        if (path, mtime) != self._loaded:
+            records = self._read(files[-1])
+            with self._lock:
+                self._records = {**self._records, **records}
+                self._loaded = (path, mtime)
+
+    def _save(self, records):
+        """Merge records into today's snapshot (read-merge-write under a file lock)"""
+        os.makedirs(self.directory, exist_ok=True)
+        today_name = f'{SNAPSHOT_PREFIX}{date.today().isoformat()}.json'
+        with open(os.path.join(self.directory, '.snapshot.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            files = self._snapshot_files()
+            merged = self._read(files[-1]) if files else {}
+            merged.update(records)
+            path = os.path.join(self.directory, today_name)
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'date': date.today().isoformat(), 'records': merged}, f)
+            os.replace(tmp_path, path)
+            self._prune(files)
+        with self._lock:
+            self._records = {**self._records, **merged}
+            self._loaded = (path, os.path.getmtime(path))
+
+    def _prune(self, files):
+        oldest = f'{SNAPSHOT_PREFIX}{(date.today() - timedelta(days=SNAPSHOT_KEEP_DAYS)).isoformat()}.json'
+        for name in files:
+            if name < oldest:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Refresh the fundamentals snapshot for the watchlist')
+    parser.add_argument('tickers', nargs='*', help='Symbols to refresh (default: FUNDAMENTALS_WATCHLIST)')
+    parser.add_argument('--force', action='store_true', help='Refetch records already refreshed today')
+    args = parser.parse_args()
+
+    from stock_api import fundamentals_service
+    refreshed = fundamentals_service.refresh([t.upper() for t in args.tickers] or watchlist(), force=args.force)
+    for ticker, record in sorted(refreshed.items()):
+        print(f"{ticker:6s} {record['name']} | {record['industry']} | market cap {record['market_cap']} | P/E {record['pe_ratio']}")
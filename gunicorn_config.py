@@ -5,15 +5,46 @@ Optimized for ML model loading with TensorFlow/Keras
 
 import multiprocessing
 import os
+import tempfile
 
 # Server Socket
 bind = "0.0.0.0:8000"
-backlog = 2048
+# Keep the accept queue short: under overload it is better to refuse
+# connections early than to hold them for minutes (the app's admission
+# control sheds the excess it does accept, see admission.py)
+backlog = int(os.getenv('GUNICORN_BACKLOG', 128))
 
 # Worker Processes
-workers = 1  # Use 1 worker to avoid multiple model loads (saves memory)
-worker_class = 'sync'
-worker_connections = 1000
+# A sync worker handles one request at a time, so a single slow Twelve Data /
+# Finnhub call blocks every other user. Threaded (gthread) or gevent workers
+# keep serving while requests wait on upstream I/O; the model is still loaded
+# once per process (see model_manager.py) and shared by all threads.
+#   gthread - default, no extra dependencies
+#   gevent  - requires `pip install gevent`; best for many idle SSE streams
+#   sync    - previous behaviour
+workers = int(os.getenv('GUNICORN_WORKERS', 1))  # Each worker loads its own model copy
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 8))  # gthread only
+# Max concurrent connections per worker (gthread: beyond this, connections
+# wait in the backlog instead of in the worker's thread-pool queue)
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000 if worker_class == 'gevent' else threads * 4))
+
+# Live quote streams hold a connection - and under gthread a whole thread - for
+# as long as the dashboard is visible, so they are on by default only under
+# gevent. Under gthread (QUOTE_STREAM_ENABLED=true) open streams are capped
+# below the thread count so other requests always keep threads to run on;
+# dashboards turned away fall back to polling.
+os.environ.setdefault('QUOTE_STREAM_ENABLED', 'true' if worker_class == 'gevent' else 'false')
+os.environ.setdefault('QUOTE_STREAM_MAX_CONNECTIONS',
+                      str(worker_connections // 2 if worker_class == 'gevent' else max(threads // 2, 1)))
+# Admission control sheds requests beyond what the worker can run at once
+# (see admission.py): one below the thread count under gthread
+os.environ.setdefault('ADMISSION_MAX_IN_FLIGHT',
+                      str(worker_connections // 2 if worker_class == 'gevent' else max(threads - 1, 1)))
+# Metrics: workers of this server merge their snapshots in a directory of
+# their own (see metrics.py); set before the app (and metrics.py) is loaded
+os.environ['METRICS_SERVER_PID'] = str(os.getpid())
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'vionex_metrics', f'server-{os.getpid()}'))
 timeout = 600  # 10 minutes - allows time for model loading
 keepalive = 2
 graceful_timeout = 120
@@ -48,6 +79,10 @@ def on_starting(server):
     server.log.info("Loading TensorFlow and LSTM model...")
     server.log.info("=" * 60)
 
+    # Worker metric snapshots from a previous run would inflate /metrics
+    from metrics import clear_metrics_dir
+    clear_metrics_dir()
+
 def when_ready(server):
     """
     Called just after the server is started.
@@ -56,6 +91,17 @@ def when_ready(server):
     server.log.info("Gunicorn server ready and listening")
     server.log.info("=" * 60)
 
+def child_exit(server, worker):
+    """
+    Called in the master after a worker exits; folds its metrics into the
+    archive so /metrics totals survive worker restarts
+    """
+    from metrics import mark_process_dead
+    try:
+        mark_process_dead(worker.pid)
+    except OSError as e:
+        server.log.warning(f"Could not archive metrics for worker {worker.pid}: {e}")
+
 def worker_int(worker):
     """
     Called when worker receives INT or QUIT signal
@@ -0,0 +1,136 @@
+"""
+Logging Configuration
+Non-blocking logging for the serving hot path
+
+Modules log through per-module loggers (get_logger(__name__)) with lazy
+%-style arguments, so a disabled DEBUG message costs one level check and no
+string formatting. Records are handed to a bounded in-memory queue; a
+listener thread does the formatting and the stdout write, off the request
+thread. If the queue is full the record is dropped and counted rather than
+blocking the request.
+
+High-frequency messages can be sampled per call site:
+
+    logger.debug("Fetched %d rows for %s", len(df), ticker, extra=sample(100))
+
+logs the first and then every 100th occurrence of that message.
+
+Environment:
+    LOG_LEVEL       DEBUG | INFO | WARNING | ERROR (default INFO)
+    LOG_QUEUE_SIZE  Max records waiting for the listener (default 10000)
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+
+
+def sample(every):
+    """`extra` for a log call that should only pass once per `every` occurrences"""
+    return {'sample_every': every}
+
+
+class SamplingFilter(logging.Filter):
+    """Passes 1 in N records of each (logger, message template) that asked to be sampled"""
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, 'sample_every', None)
+        if not every or every <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % every == 0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Merge the arguments now (the caller may mutate them afterwards);
+        # timestamps, tracebacks and the write happen on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _start_listener():
+    global _listener
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = QueueListener(_handler.queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+
+
+def _stop_listener():
+    # Drain queued records on interpreter exit
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_after_fork():
+    # The listener thread does not survive fork (gunicorn preload_app), so
+    # each worker starts its own with a fresh queue
+    if _handler is None:
+        return
+    _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _handler.dropped = 0
+    _start_listener()
+
+
+def configure_logging(level=LOG_LEVEL):
+    """Route the root logger through the queue (idempotent)"""
+    global _handler
+    with _lock:
+        root = logging.getLogger()
+        root.setLevel(level)
+        if _handler is not None:
+            return
+        _handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        _handler.addFilter(SamplingFilter())
+        root.addHandler(_handler)
+        # urllib3 logs full request URLs, which carry the API keys
+        logging.getLogger('urllib3').setLevel(logging.WARNING)
+        _start_listener()
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def dropped_records():
+    """Records dropped in this process because the queue was full"""
+    return _handler.dropped if _handler is not None else 0
+
+
+def get_logger(name):
+    """Per-module logger; configures the pipeline on first use"""
+    if _handler is None:
+        configure_logging()
+    return logging.getLogger(name)
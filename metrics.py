@@ -0,0 +1,347 @@
+"""
+Metrics
+Low-overhead counters, gauges and histograms for the serving hot path,
+exposed in the Prometheus text format
+
+Each process keeps its metrics in memory (one lock, dict updates). Under
+gunicorn, workers snapshot them to METRICS_DIR at most every FLUSH_INTERVAL
+seconds and /metrics served by any worker merges the snapshots of the live
+workers, so the scrape covers the whole server. When gunicorn reaps a worker,
+its counters are folded into an archive file and its gauges dropped.
+
+gunicorn_config.py sets METRICS_SERVER_PID to the master's pid, and the
+default METRICS_DIR is namespaced by it, so two servers never merge each
+other's snapshots. A process not started by gunicorn (run.py, app.py,
+scripts) is a whole server on its own: it reports only its own metrics and
+writes no snapshots.
+"""
+import fcntl
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# gunicorn master's pid (set by gunicorn_config.py); 0 outside gunicorn
+SERVER_PID = int(os.getenv('METRICS_SERVER_PID', 0))
+METRICS_ROOT = os.path.join(tempfile.gettempdir(), 'vionex_metrics')
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(METRICS_ROOT, f'server-{SERVER_PID or os.getpid()}'))
+FLUSH_INTERVAL = 1.0  # seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ARCHIVE_FILE = 'archived.json'
+
+logger = logging.getLogger(__name__)
+
+HELP = {
+    'http_requests_total': 'HTTP requests by route, method and status',
+    'http_request_duration_seconds': 'HTTP request latency by route',
+    'http_requests_in_flight': 'HTTP requests currently being served',
+    'stage_duration_seconds': 'Latency of request pipeline stages',
+    'upstream_request_duration_seconds': 'Latency of upstream API calls by provider and endpoint',
+    'upstream_requests_total': 'Upstream API calls by provider, endpoint and outcome',
+    'cache_requests_total': 'Shared cache lookups by namespace and result',
+    'admission_rejections_total': 'Requests shed by admission control by reason and priority',
+    'quote_stream_rejections_total': 'Live quote streams refused because the per-worker limit was reached',
+    'prewarm_refreshes_total': 'Background pre-warm refreshes by task and result',
+    'circuit_breaker_transitions_total': 'Upstream circuit breaker state changes by provider and endpoint',
+    'symbol_rejections_total': 'Tickers rejected before any upstream call by reason',
+    'singleflight_calls_total': 'Coalescable calls by group and result (leader executed, shared waited)',
+}
+
+
+def _key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """Per-process metric store with cross-process aggregation through METRICS_DIR"""
+
+    def __init__(self, directory=METRICS_DIR, buckets=DEFAULT_BUCKETS, shared=bool(SERVER_PID)):
+        """
+        Args:
+            directory: Where worker snapshots are shared
+            shared: Whether snapshots are written and merged (gunicorn
+                workers); otherwise the process reports only its own metrics
+        """
+        self.directory = directory
+        self.shared = shared
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._dirty = False
+        self._flusher_pid = None
+
+    # ----- recording -----
+
+    def inc(self, name, value=1, **labels):
+        """Increment a counter"""
+        key = (name, _key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._dirty = True
+
+    def gauge_add(self, name, value, **labels):
+        """Add to (or subtract from) a gauge"""
+        key = (name, _key(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + value
+            self._dirty = True
+
+    def observe(self, name, value, **labels):
+        """Record an observation (seconds) in a histogram"""
+        key = (name, _key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[0][i] += 1
+                    break
+            histogram[1] += value
+            histogram[2] += 1
+            self._dirty = True
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time a block into a histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    # ----- cross-process snapshots -----
+
+    def snapshot(self):
+        """JSON-serializable copy of this process's metrics"""
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self._gauges.items()],
+                'histograms': [[name, list(labels), list(h[0]), h[1], h[2]] for (name, labels), h in self._histograms.items()],
+            }
+
+    def flush(self, force=False):
+        """Write this process's snapshot if it changed (throttled unless force)"""
+        if not self.shared:
+            return
+        now = time.time()
+        if not force and (not self._dirty or now - self._last_flush < FLUSH_INTERVAL):
+            return
+        self._last_flush = now
+        self._dirty = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f'worker-{os.getpid()}.json')
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Metrics flush error: %s", e)
+
+    def start_background_flush(self):
+        """Flush every FLUSH_INTERVAL from a daemon thread (once per process, fork-safe)"""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+
+        def loop():
+            while True:
+                time.sleep(FLUSH_INTERVAL)
+                self.flush()
+
+        threading.Thread(target=loop, name='metrics-flush', daemon=True).start()
+
+    def collect(self):
+        """Merge the snapshots of all live workers and the archive (only this process's metrics when not shared)"""
+        merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        if not self.shared:
+            _merge(merged, self.snapshot())
+            return merged
+        self.flush(force=True)
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        for filename in names:
+            if not filename.endswith('.json'):
+                continue
+            # A dead worker's snapshot counts once child_exit archives it
+            if filename.startswith('worker-') and not _pid_alive(_snapshot_pid(filename)):
+                continue
+            snapshot = _read_snapshot(os.path.join(self.directory, filename))
+            if snapshot is not None:
+                _merge(merged, snapshot)
+        return merged
+
+    def render(self):
+        """Prometheus text exposition of the merged metrics"""
+        merged = self.collect()
+        lines = []
+        seen = set()
+
+        def header(name, kind):
+            if name not in seen:
+                seen.add(name)
+                if name in HELP:
+                    lines.append(f'# HELP {name} {HELP[name]}')
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in sorted(merged['counters'].items()):
+            header(name, 'counter')
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+        for (name, labels), value in sorted(merged['gauges'].items()):
+            header(name, 'gauge')
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+        for (name, labels), (buckets, total, count) in sorted(merged['histograms'].items()):
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, buckets):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", repr(bound)),))} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _snapshot_pid(filename):
+    try:
+        return int(filename[len('worker-'):-len('.json')])
+    except ValueError:
+        return 0
+
+
+def _pid_alive(pid):
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(merged, snapshot):
+    for name, labels, value in snapshot.get('counters', []):
+        key = (name, tuple(tuple(pair) for pair in labels))
+        merged['counters'][key] = merged['counters'].get(key, 0) + value
+    for name, labels, value in snapshot.get('gauges', []):
+        key = (name, tuple(tuple(pair) for pair in labels))
+        merged['gauges'][key] = merged['gauges'].get(key, 0) + value
+    for name, labels, buckets, total, count in snapshot.get('histograms', []):
+        key = (name, tuple(tuple(pair) for pair in labels))
+        existing = merged['histograms'].get(key)
+        if existing is None:
+            merged['histograms'][key] = [list(buckets), total, count]
+        else:
+            existing[0] = [a + b for a, b in zip(existing[0], buckets)]
+            existing[1] += total
+            existing[2] += count
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def clear_metrics_dir(directory=METRICS_DIR):
+    """
+    Remove snapshots left by a previous server run (call before workers start),
+    and the default directories of servers that are no longer running
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = []
+    for filename in names:
+        if filename.endswith('.json'):
+            try:
+                os.remove(os.path.join(directory, filename))
+            except OSError:
+                pass
+
+    try:
+        servers = os.listdir(METRICS_ROOT)
+    except OSError:
+        return
+    for name in servers:
+        path = os.path.join(METRICS_ROOT, name)
+        if name.endswith(('.json', '.lock')) and os.path.isfile(path):
+            # Snapshots from before directories were kept per server
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        if not name.startswith('server-') or path == directory:
+            continue
+        try:
+            if _pid_alive(int(name[len('server-'):])):
+                continue
+        except ValueError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def mark_process_dead(pid, directory=METRICS_DIR):
+    """
+    Fold a dead worker's counters and histograms into the archive
+
+    Called from gunicorn's child_exit hook so restarted workers don't lose
+    their totals and their in-flight gauges don't linger.
+    """
+    path = os.path.join(directory, f'worker-{pid}.json')
+    snapshot = _read_snapshot(path)
+    if snapshot is None:
+        return
+    snapshot['gauges'] = []
+
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    with open(os.path.join(directory, '.archive.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        for existing in (_read_snapshot(archive_path), snapshot):
+            if existing is not None:
+                _merge(merged, existing)
+        archive = {
+            'counters': [[name, [list(p) for p in labels], value] for (name, labels), value in merged['counters'].items()],
+            'gauges': [],
+            'histograms': [[name, [list(p) for p in labels], h[0], h[1], h[2]] for (name, labels), h in merged['histograms'].items()],
+        }
+        tmp_path = f'{archive_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(archive, f)
+        os.replace(tmp_path, archive_path)
+        os.remove(path)
+
+
+# Process-wide registry used by the app, stock_api and model manager
+metrics = MetricsRegistry()
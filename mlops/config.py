@@ -17,6 +17,7 @@ class MLOpsConfig:
     LOGS_DIR = os.path.join(MLOPS_DIR, 'logs')
     CHECKPOINTS_DIR = os.path.join(MLOPS_DIR, 'checkpoints')
     ARTIFACTS_DIR = os.path.join(BASE_DIR, 'artifacts')
+    SERVED_MODEL_PATH = os.path.join(ARTIFACTS_DIR, 'stock_lstm_model.h5')  # loaded by app.py
     
     # Training configuration
     DEFAULT_EPOCHS = 50
@@ -24,9 +25,30 @@ class MLOpsConfig:
     DEFAULT_VALIDATION_SPLIT = 0.2
     EARLY_STOPPING_PATIENCE = 10
     
+    # Parallel batch training: tickers train in separate processes, each with
+    # TensorFlow's thread pools capped. 0 = split all CPUs but one between the
+    # workers, (CPUs - 1) // workers and at least 1, leaving a core for the web
+    # app, the scheduler and the OS (see training_threads)
+    TRAINING_WORKERS = int(os.getenv('TRAINING_WORKERS', 2))
+    TRAINING_THREADS_PER_WORKER = int(os.getenv('TRAINING_THREADS_PER_WORKER', 0))
+    TRAINING_INTER_OP_THREADS = 2
+    
+    # Incremental retraining: fine-tune the latest registered model on recent
+    # bars; retrain from scratch once the last full training is older than
+    # FULL_RETRAIN_MAX_AGE_HOURS or the model's loss on current data exceeds
+    # its registered val_loss by DEGRADATION_TOLERANCE x
+    INCREMENTAL_EPOCHS = int(os.getenv('INCREMENTAL_EPOCHS', 5))
+    INCREMENTAL_WINDOW_BARS = int(os.getenv('INCREMENTAL_WINDOW_BARS', 250))
+    FULL_RETRAIN_MAX_AGE_HOURS = float(os.getenv('FULL_RETRAIN_MAX_AGE_HOURS', 168))
+    DEGRADATION_TOLERANCE = float(os.getenv('DEGRADATION_TOLERANCE', 1.5))
+    
     # Scheduler configuration
     TRAINING_INTERVAL_HOURS = 1
     DEFAULT_STOCKS = ['AAPL', 'TSLA', 'GOOGL', 'MSFT', 'AMZN']
+    # Per-ticker hours between retrains, e.g. "TSLA=1,AAPL=6" (others: TRAINING_INTERVAL_HOURS)
+    TRAINING_CADENCES = os.getenv('TRAINING_CADENCES', '')
+    TRAINING_STATE_FILE = os.path.join(LOGS_DIR, 'training_state.json')
+    TRAINING_JOB_LOG = os.path.join(LOGS_DIR, 'training_jobs.jsonl')
     
     # Model configuration
     LOOKBACK_PERIOD = 60  # Days
@@ -37,6 +59,13 @@ class MLOpsConfig:
     LOG_FORMAT = '[%(asctime)s] %(levelname)s: %(message)s'
     LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
     
+    @classmethod
+    def training_threads(cls, workers: int) -> int:
+        """TensorFlow intra-op threads per batch training worker"""
+        if cls.TRAINING_THREADS_PER_WORKER:
+            return cls.TRAINING_THREADS_PER_WORKER
+        return max(1, ((os.cpu_count() or 1) - 1) // workers)
+    
     @classmethod
     def ensure_directories(cls):
         """Create all required directories"""
@@ -48,7 +77,3 @@ class MLOpsConfig:
             cls.ARTIFACTS_DIR
         ]:
             os.makedirs(dir_path, exist_ok=True)
-
-
-# Initialize directories on import
-MLOpsConfig.ensure_directories()
@@ -11,24 +11,29 @@ from tensorflow.keras.models import load_model
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 
-def evaluate_model():
-    """Evaluate the trained model"""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.components.data_transformation import dataset_dir, load_dataset
+from src.components.window_dataset import window_dataset, window_targets
+
+def evaluate_model(name: str = 'stock'):
+    """Evaluate the trained model on the test split of the dataset called name"""
     
     print("Starting model evaluation...")
     
-    # Load model and data
+    # Load model and data (test rows are memory-mapped, windows cut per batch)
     model = load_model('artifacts/stock_lstm_model.h5')
-    test_data = np.load('artifacts/processed_test.npy', allow_pickle=True).item()
+    manifest, splits = load_dataset(dataset_dir(name))
+    seq_length = manifest['seq_length']
     
-    # Split features and labels
-    X_test = test_data['X']
-    y_test = test_data['y']
+    y_test = window_targets(splits['test'], seq_length)
     
-    print(f"Test data shape: X={X_test.shape}, y={y_test.shape}")
+    print(f"Test data shape: rows={splits['test'].shape}, windows={len(y_test)}, seq_length={seq_length}")
     
     # Make predictions
-    y_pred = model.predict(X_test, verbose=0)
+    y_pred = model.predict(window_dataset(splits['test'], seq_length), verbose=0).reshape(-1)
     
     # Calculate metrics
     mse = mean_squared_error(y_test, y_pred)
@@ -0,0 +1,93 @@
+"""
+Market Calendar - US equity (NYSE/NASDAQ) trading sessions
+Used by the scheduler to skip retraining while no session has traded since
+a ticker was last trained (nights, weekends, exchange holidays)
+
+Holidays follow the NYSE rules (Saturday holidays observed on Friday, Sunday
+holidays on Monday, New Year's Day on a Saturday not observed). Early closes
+are treated as full sessions.
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+MARKET_TIMEZONE = ZoneInfo('America/New_York')
+SESSION_OPEN = time(9, 30)
+SESSION_CLOSE = time(16, 0)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th (1-based) weekday (Mon=0) of a month; n=-1 for the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=16)
+def market_holidays(year: int) -> frozenset:
+    """Full-day exchange holidays of a year"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),              # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),              # Washington's Birthday
+        _easter(year) - timedelta(days=2),        # Good Friday
+        _nth_weekday(year, 5, 0, -1),             # Memorial Day
+        _observed(date(year, 7, 4)),              # Independence Day
+        _nth_weekday(year, 9, 0, 1),              # Labor Day
+        _nth_weekday(year, 11, 3, 4),             # Thanksgiving
+        _observed(date(year, 12, 25)),            # Christmas
+    }
+    if date(year, 1, 1).weekday() != 5:
+        holidays.add(_observed(date(year, 1, 1)))  # New Year's Day
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return frozenset(holidays)
+
+
+def is_trading_day(day: date) -> bool:
+    """Whether the exchange holds a session on this day"""
+    return day.weekday() < 5 and day not in market_holidays(day.year)
+
+
+def had_session_between(start: datetime, end: datetime) -> bool:
+    """
+    Whether any trading session was open at some point in (start, end]
+
+    Args:
+        start, end: Timezone-aware datetimes
+    """
+    start = start.astimezone(MARKET_TIMEZONE)
+    end = end.astimezone(MARKET_TIMEZONE)
+    day = start.date()
+    while day <= end.date():
+        if is_trading_day(day):
+            session_open = datetime.combine(day, SESSION_OPEN, MARKET_TIMEZONE)
+            session_close = datetime.combine(day, SESSION_CLOSE, MARKET_TIMEZONE)
+            if session_open < end and session_close > start:
+                return True
+        day += timedelta(days=1)
+    return False
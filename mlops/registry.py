@@ -1,11 +1,17 @@
 """
 Model Registry - Version control and management for ML models
 Tracks model versions, performance metrics, and deployment status
+
+Several processes may register models at once (parallel batch training), so
+changes to metadata.json are made under an exclusive file lock on freshly
+reloaded metadata, and the file is replaced atomically.
 """
 
 import os
 import json
+import fcntl
 import shutil
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -29,7 +35,15 @@ class ModelRegistry:
         os.makedirs(registry_path, exist_ok=True)
         
         # Load or initialize metadata
-        self._initialize_metadata()
+        with self._locked():
+            self._initialize_metadata()
+    
+    @contextmanager
+    def _locked(self):
+        """Hold the registry's cross-process lock"""
+        with open(os.path.join(self.registry_path, '.registry.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
     
     def _initialize_metadata(self):
         """Initialize or load existing metadata"""
@@ -55,8 +69,10 @@ class ModelRegistry:
     def _save_metadata(self):
         """Save metadata to JSON file"""
         try:
-            with open(self.metadata_file, 'w') as f:
+            tmp_file = f"{self.metadata_file}.tmp"
+            with open(tmp_file, 'w') as f:
                 json.dump(self.metadata, f, indent=4)
+            os.replace(tmp_file, self.metadata_file)
         except Exception as e:
             print(f"Error saving metadata: {e}")
     
@@ -81,40 +97,44 @@ class ModelRegistry:
         Returns:
             Dictionary containing registered model information
         """
-        # Calculate version number
-        existing_models = [m for m in self.metadata['models'] if m['ticker'] == ticker]
-        version = len(existing_models) + 1
-        
-        # Create version-specific directory
-        version_id = f"{ticker}_v{version}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        version_dir = os.path.join(self.registry_path, version_id)
-        os.makedirs(version_dir, exist_ok=True)
-        
-        # Copy model and scaler files
-        model_filename = os.path.join(version_dir, 'model.h5')
-        shutil.copy(model_path, model_filename)
-        
-        scaler_filename = None
-        if scaler_path and os.path.exists(scaler_path):
-            scaler_filename = os.path.join(version_dir, 'scaler.pkl')
-            shutil.copy(scaler_path, scaler_filename)
-        
-        # Create model information
-        model_info = {
-            'ticker': ticker,
-            'version': version,
-            'version_id': version_id,
-            'registered_at': datetime.now().isoformat(),
-            'model_path': model_filename,
-            'scaler_path': scaler_filename,
-            'metrics': metrics,
-            'status': 'active',
-            'metadata': metadata or {}
-        }
-        
-        # Add to registry
-        self.metadata['models'].append(model_info)
-        self._save_metadata()
+        with self._locked():
+            # Other processes may have registered models since this one loaded
+            self._load_metadata()
+            
+            # Calculate version number
+            existing_models = [m for m in self.metadata['models'] if m['ticker'] == ticker]
+            version = len(existing_models) + 1
+            
+            # Create version-specific directory
+            version_id = f"{ticker}_v{version}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            version_dir = os.path.join(self.registry_path, version_id)
+            os.makedirs(version_dir, exist_ok=True)
+            
+            # Copy model and scaler files
+            model_filename = os.path.join(version_dir, 'model.h5')
+            shutil.copy(model_path, model_filename)
+            
+            scaler_filename = None
+            if scaler_path and os.path.exists(scaler_path):
+                scaler_filename = os.path.join(version_dir, 'scaler.pkl')
+                shutil.copy(scaler_path, scaler_filename)
+            
+            # Create model information
+            model_info = {
+                'ticker': ticker,
+                'version': version,
+                'version_id': version_id,
+                'registered_at': datetime.now().isoformat(),
+                'model_path': model_filename,
+                'scaler_path': scaler_filename,
+                'metrics': metrics,
+                'status': 'active',
+                'metadata': metadata or {}
+            }
+            
+            # Add to registry
+            self.metadata['models'].append(model_info)
+            self._save_metadata()
         
         print(f"Model registered: {ticker} v{version}")
         print(f"Validation Loss: {metrics.get('val_loss', 'N/A'):.6f}")
@@ -196,13 +216,15 @@ class ModelRegistry:
         Args:
             version_id: Unique version identifier
         """
-        for model in self.metadata['models']:
-            if model['version_id'] == version_id:
-                model['status'] = 'archived'
-                model['archived_at'] = datetime.now().isoformat()
-                self._save_metadata()
-                print(f"Model archived: {version_id}")
-                return
+        with self._locked():
+            self._load_metadata()
+            for model in self.metadata['models']:
+                if model['version_id'] == version_id:
+                    model['status'] = 'archived'
+                    model['archived_at'] = datetime.now().isoformat()
+                    self._save_metadata()
+                    print(f"Model archived: {version_id}")
+                    return
         
         print(f"Model not found: {version_id}")
     
@@ -5,14 +5,17 @@ Operates independently of Flask server
 
 import schedule
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 import sys
 import os
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mlops.training_pipeline import MLOpsTrainingPipeline
+from mlops.training_pipeline import MLOpsTrainingPipeline, batch_saved_seconds
+from mlops.training_jobs import TrainingJobTracker, parse_cadences
+from mlops.config import MLOpsConfig
+from cache_backend import get_cache, MODEL_GENERATION_KEY
 
 
 class SchedulerService:
@@ -20,21 +23,34 @@ class SchedulerService:
     Background service for automated model training
     """
     
-    def __init__(self, stocks: list = None, registry_path: str = 'mlops/model_registry'):
+    def __init__(
+        self,
+        stocks: list = None,
+        registry_path: str = 'mlops/model_registry',
+        interval_hours: float = MLOpsConfig.TRAINING_INTERVAL_HOURS
+    ):
         """
         Initialize the scheduler service
         
         Args:
             stocks: List of stock tickers to train
             registry_path: Path to model registry
+            interval_hours: Default hours between retrains of a ticker
+                (MLOpsConfig.TRAINING_CADENCES overrides it per ticker)
         """
         self.stocks = stocks or ['AAPL', 'TSLA', 'GOOGL', 'MSFT', 'AMZN']
         self.pipeline = MLOpsTrainingPipeline(registry_path)
+        self.jobs = TrainingJobTracker(
+            MLOpsConfig.TRAINING_STATE_FILE,
+            MLOpsConfig.TRAINING_JOB_LOG,
+            default_cadence_hours=interval_hours,
+            cadences=parse_cadences(MLOpsConfig.TRAINING_CADENCES)
+        )
         self.is_running = False
         self.training_count = 0
     
     def train_all_stocks(self):
-        """Train models for all configured stocks"""
+        """Retrain the configured stocks whose cadence is due and whose data changed"""
         self.training_count += 1
         
         print(f"\n{'#'*70}")
@@ -45,31 +61,99 @@ class SchedulerService:
         print(f"{'#'*70}\n")
         
         start_time = time.time()
-        results = self.pipeline.batch_train(
-            tickers=self.stocks,
-            epochs=50,
-            batch_size=32
-        )
+        # Trainings are dated from the data snapshot, i.e. the session start
+        session_started = datetime.now(timezone.utc)
+        served_model = self._served_model_signature()
+        due = {}
+        for ticker in self.stocks:
+            train, reason = self.jobs.decide(ticker, now=session_started)
+            print(f"{ticker}: {'train' if train else 'skip'} ({reason})")
+            if train:
+                due[ticker] = reason
+        
+        results = {}
+        if due:
+            # Each job skips its ticker if the data it ingests is unchanged
+            results = self.pipeline.batch_train(
+                tickers=list(due),
+                epochs=50,
+                batch_size=32,
+                mode='auto',
+                previous_fingerprints={ticker: self.jobs.last_fingerprint(ticker) for ticker in due}
+            )
+            for row in self.pipeline.last_batch_summary:
+                if row['error'] is not None:
+                    self.jobs.record(row['ticker'], 'failed', row['error'], row['fingerprint'], row['wall_time'])
+                elif row['skipped'] is not None:
+                    self.jobs.record(row['ticker'], 'skipped', row['skipped'], row['fingerprint'], row['wall_time'])
+                else:
+                    self.jobs.record(row['ticker'], 'trained', due[row['ticker']], row['fingerprint'], row['wall_time'], now=session_started)
         elapsed_time = time.time() - start_time
         
+        # Only a new served artifact changes predictions; web workers reload it
+        # and drop cached predictions of the old one
+        if self._served_model_signature() != served_model:
+            self._publish_model_generation()
+        
         # Print summary
         print(f"\n{'#'*70}")
         print(f"SESSION #{self.training_count} SUMMARY")
         print(f"{'#'*70}")
-        print(f"Successful: {len(results)}/{len(self.stocks)}")
+        unchanged = sum(1 for row in self.pipeline.last_batch_summary if row['skipped'] is not None) if due else 0
+        print(f"Trained: {len(results)}/{len(due)} due | Skipped: {len(self.stocks) - len(due) + unchanged}")
         print(f"Duration: {elapsed_time/60:.2f} minutes")
+        print(f"Saved by incremental retraining: {batch_saved_seconds(self.pipeline.last_batch_summary)/60:.2f} minutes")
         print(f"Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'#'*70}\n")
     
+    def refresh_fundamentals(self):
+        """Refresh the daily fundamentals snapshot for the watchlist and the trained stocks"""
+        try:
+            from fundamentals import watchlist
+            from stock_api import fundamentals_service
+            tickers = list(dict.fromkeys(watchlist() + self.stocks))
+            refreshed = fundamentals_service.refresh(tickers)
+            print(f"Fundamentals refreshed: {len(refreshed)}/{len(tickers)}")
+        except Exception as e:
+            print(f"Could not refresh fundamentals: {e}")
+    
+    def refresh_symbols(self):
+        """Refresh the local symbol universe used for autocomplete and ticker validation"""
+        try:
+            from stock_api import fetch_symbol_universe
+            from symbols import refresh_universe
+            print(f"Symbol universe refreshed: {refresh_universe(fetch_symbol_universe)} symbols")
+        except Exception as e:
+            print(f"Could not refresh symbol universe: {e}")
+    
+    @staticmethod
+    def _served_model_signature():
+        """(mtime, size) of the artifact the web app serves, None if missing"""
+        try:
+            stat = os.stat(MLOpsConfig.SERVED_MODEL_PATH)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _publish_model_generation(self):
+        """Bump the shared model generation so serving drops stale predictions"""
+        try:
+            generation = get_cache().incr(MODEL_GENERATION_KEY)
+            print(f"Model generation: {generation}")
+        except Exception as e:
+            print(f"Could not publish model generation: {e}")
+    
     def start(self, interval_hours: int = 1):
         """
         Start the scheduler service
         
         Args:
-            interval_hours: Training interval in hours (default: 1)
+            interval_hours: Hours between training sessions (each session
+                retrains only the tickers that are due; default: 1)
         """
         print(f"Configuration:")
-        print(f"Training Interval: Every {interval_hours} hour(s)")
+        print(f"Training Sessions: Every {interval_hours} hour(s)")
+        print(f"Cadences: {', '.join(f'{t}={self.jobs.cadence_hours(t):g}h' for t in self.stocks)}")
         print(f"Stocks: {', '.join(self.stocks)}")
         print(f"Auto-restart: Enabled")
         print(f"{'='*70}\n")
@@ -77,6 +161,12 @@ class SchedulerService:
         # Schedule training
         schedule.every(interval_hours).hours.do(self.train_all_stocks)
         
+        # Fundamentals change at most daily; refresh them once a day in bulk
+        schedule.every().day.at("06:00").do(self.refresh_fundamentals)
+        schedule.every().day.at("05:30").do(self.refresh_symbols)
+        self.refresh_symbols()
+        self.refresh_fundamentals()
+        
         # Run initial training immediately
         print(f"Running initial training session...\n")
         self.train_all_stocks()
@@ -85,6 +175,7 @@ class SchedulerService:
         self.is_running = True
         print(f"\n Scheduler is now running...")
         print(f" Next training: {schedule.jobs[0].next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f" Next fundamentals refresh: {schedule.jobs[1].next_run.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"  Press Ctrl+C to stop\n")
         
         try:
@@ -113,6 +204,7 @@ class SchedulerService:
             'is_running': self.is_running,
             'stocks': self.stocks,
             'training_count': self.training_count,
+            'last_trained': self.jobs.state,
             'next_run': schedule.jobs[0].next_run if schedule.jobs else None
         }
 
@@ -123,7 +215,7 @@ if __name__ == "__main__":
     INTERVAL_HOURS = 1  # Train every hour
     
     # Create and start scheduler
-    scheduler = SchedulerService(stocks=STOCKS)
+    scheduler = SchedulerService(stocks=STOCKS, interval_hours=INTERVAL_HOURS)
     
     try:
         scheduler.start(interval_hours=INTERVAL_HOURS)
@@ -26,7 +26,8 @@ def test_configuration():
         print(f"Checkpoints Directory: {MLOpsConfig.CHECKPOINTS_DIR}")
         print(f"Artifacts Directory: {MLOpsConfig.ARTIFACTS_DIR}")
         
-        # Check directories exist
+        # Directories are created on demand, not on import
+        MLOpsConfig.ensure_directories()
         for dir_path in [MLOpsConfig.REGISTRY_DIR, MLOpsConfig.LOGS_DIR, 
                          MLOpsConfig.CHECKPOINTS_DIR, MLOpsConfig.ARTIFACTS_DIR]:
             assert os.path.exists(dir_path), f"Directory not found: {dir_path}"
@@ -0,0 +1,155 @@
+"""
+Training Jobs - Decides which tickers a scheduler session retrains
+and records every decision
+
+A ticker is retrained only when all of these hold:
+    - its cadence has elapsed since it was last trained (per-ticker
+      TRAINING_CADENCES, e.g. "TSLA=1,AAPL=6", else the default interval)
+    - a trading session was open since then (see market_calendar)
+    - the fingerprint of its ingested data differs from the one it was last
+      trained on; the training job checks this on the data it ingests
+      (MLOpsTrainingPipeline.train_model, previous_fingerprint), so the data
+      is fetched once and the recorded fingerprint is that of the data the
+      model was trained on
+
+State (last training time and fingerprint per ticker) survives restarts in
+a JSON file; every trained, skipped and failed job is appended with its
+reason to a JSON-lines log.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from mlops.market_calendar import had_session_between
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """Hash of every row and index value (changes on a new bar or a revised one)"""
+    hashed = pd.util.hash_pandas_object(data, index=True).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def parse_cadences(spec: str) -> Dict[str, float]:
+    """'TSLA=1,AAPL=6' -> {'TSLA': 1.0, 'AAPL': 6.0} (hours)"""
+    cadences = {}
+    for item in spec.split(','):
+        ticker, _, hours = item.partition('=')
+        if ticker.strip() and hours.strip():
+            cadences[ticker.strip().upper()] = float(hours)
+    return cadences
+
+
+class TrainingJobTracker:
+    """
+    Per-ticker retraining decisions, state and job log
+
+    Args:
+        state_path: JSON file with each ticker's last training
+        log_path: JSON-lines job log
+        default_cadence_hours: Minimum hours between trainings of a ticker
+        cadences: Per-ticker overrides of default_cadence_hours
+    """
+
+    def __init__(
+        self,
+        state_path: str,
+        log_path: str,
+        default_cadence_hours: float = 1,
+        cadences: Optional[Dict[str, float]] = None
+    ):
+        self.state_path = state_path
+        self.log_path = log_path
+        self.default_cadence_hours = default_cadence_hours
+        self.cadences = cadences or {}
+        for path in (state_path, log_path):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Could not read training state {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=4)
+        os.replace(tmp_path, self.state_path)
+
+    def cadence_hours(self, ticker: str) -> float:
+        return self.cadences.get(ticker, self.default_cadence_hours)
+
+    def decide(self, ticker: str, now: Optional[datetime] = None) -> Tuple[bool, str]:
+        """
+        Whether ticker is due for retraining by cadence and market calendar
+        (skips are logged here; the data check is the training job's, see
+        last_fingerprint)
+
+        Args:
+            ticker: Stock ticker symbol
+            now: Timezone-aware time of the decision (default: now)
+
+        Returns:
+            (due?, reason)
+        """
+        now = now or datetime.now(timezone.utc)
+        last = self.state.get(ticker)
+        if not last:
+            return True, 'never trained'
+        trained_at = datetime.fromisoformat(last['trained_at'])
+        next_due = trained_at + timedelta(hours=self.cadence_hours(ticker))
+        if now < next_due:
+            return self._skip(ticker, f"cadence {self.cadence_hours(ticker):g}h: next due {next_due.isoformat(timespec='minutes')}", now)
+        if not had_session_between(trained_at, now):
+            return self._skip(ticker, 'market closed since last training', now)
+        return True, 'new data'
+
+    def last_fingerprint(self, ticker: str) -> Optional[str]:
+        """Fingerprint of the data ticker was last trained on (None if never trained)"""
+        return self.state.get(ticker, {}).get('fingerprint')
+
+    def _skip(self, ticker: str, reason: str, now: datetime):
+        self.record(ticker, 'skipped', reason, now=now)
+        return False, reason
+
+    def record(
+        self,
+        ticker: str,
+        action: str,
+        reason: str,
+        fingerprint: Optional[str] = None,
+        seconds: Optional[float] = None,
+        now: Optional[datetime] = None
+    ):
+        """
+        Append a job to the log; 'trained' jobs also become the ticker's state
+
+        Args:
+            action: 'trained', 'skipped' or 'failed'
+        """
+        now = now or datetime.now(timezone.utc)
+        entry = {
+            'time': now.isoformat(timespec='seconds'),
+            'ticker': ticker,
+            'action': action,
+            'reason': reason,
+            'fingerprint': fingerprint,
+            'seconds': round(seconds, 1) if seconds is not None else None
+        }
+        with open(self.log_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        if action == 'trained':
+            self.state[ticker] = {'trained_at': now.isoformat(), 'fingerprint': fingerprint}
+            self._save_state()
@@ -5,10 +5,14 @@ Handles end-to-end model training with logging, versioning, and registration
 
 import os
 import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import numpy as np
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, TensorBoard
+from tensorflow.keras.models import load_model
 import pickle
 
 # Add project root to path
@@ -17,7 +21,18 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.components.data_ingestion import DataIngestion
 from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
+from src.components.window_dataset import window_dataset, window_targets
 from mlops.registry import ModelRegistry
+from mlops.config import MLOpsConfig
+from mlops.training_jobs import data_fingerprint
+
+
+class DataUnchanged(Exception):
+    """The ingested data is the data the ticker was last trained on (training skipped)"""
+
+    def __init__(self, fingerprint: str):
+        super().__init__('data unchanged')
+        self.fingerprint = fingerprint
 
 
 class MLOpsTrainingPipeline:
@@ -32,7 +47,9 @@ class MLOpsTrainingPipeline:
         Args:
             registry_path: Path to model registry directory
         """
+        self.registry_path = registry_path
         self.registry = ModelRegistry(registry_path)
+        self.last_batch_summary = []
         self.logs_dir = 'mlops/logs'
         self.checkpoints_dir = 'mlops/checkpoints'
         self.artifacts_dir = 'artifacts'
@@ -47,21 +64,32 @@ class MLOpsTrainingPipeline:
         ticker: str = 'AAPL', 
         epochs: int = 50, 
         batch_size: int = 32,
-        validation_split: float = 0.2
+        validation_split: float = 0.2,
+        mode: str = 'auto',
+        previous_fingerprint: Optional[str] = None
     ) -> Dict:
         """
         Execute complete training pipeline for a stock ticker
         
         Args:
             ticker: Stock ticker symbol
-            epochs: Number of training epochs
+            epochs: Number of training epochs (full retrain)
             batch_size: Batch size for training
             validation_split: Validation data split ratio
+            mode: 'full' trains from scratch; 'incremental' fine-tunes the
+                latest registered model for MLOpsConfig.INCREMENTAL_EPOCHS on
+                the recent bars; 'auto' is incremental unless the last full
+                retrain is too old or the model degraded on current data
+            previous_fingerprint: Fingerprint of the data the ticker was last
+                trained on; training is skipped (DataUnchanged) if the
+                ingested data still has it
         
         Returns:
-            Dictionary containing model information and metrics
+            Dictionary containing model information and metrics; the
+            fingerprint of the data trained on is in metadata['data_fingerprint']
         """
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        started = time.perf_counter()
         
         print(f"\n{'='*70}")
         print(f"{'='*70}")
@@ -70,11 +98,19 @@ class MLOpsTrainingPipeline:
         print(f"{'='*70}\n")
         
         try:
+            base, reason = self._warm_start_base(ticker, mode)
+            model = None
+            
+
             # Step 1: Data Ingestion
             print("Step 1/6: Data Ingestion")
             print("-" * 70)
             raw_data = self._ingest_data(ticker)
-            print(f"Fetched {len(raw_data)} data points\n")
+            fingerprint = data_fingerprint(raw_data)
+            print(f"Fetched {len(raw_data)} data points (fingerprint {fingerprint})\n")
+            if fingerprint == previous_fingerprint:
+                print(f"Data unchanged since the last training of {ticker}, skipping\n")
+                raise DataUnchanged(fingerprint)
             
             # Step 2: Data Preprocessing
             print("🔧 Step 2/6: Data Preprocessing")
@@ -85,45 +121,80 @@ class MLOpsTrainingPipeline:
             # Step 3: Data Transformation
             print("Step 3/6: Data Transformation")
             print("-" * 70)
-            X_train, y_train, X_test, y_test, scaler = self._transform_data(
-                train_data, test_data
-            )
-            print(f"X_train: {X_train.shape} | y_train: {y_train.shape}\n")
+            if base is not None:
+                model, scaler = self._load_registered(base)
+                # Fine-tune on the recent bars only, scaled as the model was trained
+                recent = train_data.iloc[-(MLOpsConfig.INCREMENTAL_WINDOW_BARS + MLOpsConfig.LOOKBACK_PERIOD):]
+                train_features, test_features, scaler = self._transform_data(
+                    ticker, recent, test_data, scaler=scaler
+                )
+                degraded = self._degradation(model, base, test_features, batch_size)
+                if degraded:
+                    base, reason, model = None, degraded, None
+            if base is None:
+                train_features, test_features, scaler = self._transform_data(
+                    ticker, train_data, test_data
+                )
+            training_mode = 'full' if base is None else 'incremental'
+            # Windows actually trained on (incremental runs use only the recent bars)
+            train_windows = max(len(train_features) - MLOpsConfig.LOOKBACK_PERIOD, 0)
+            print(f"Mode: {training_mode} ({reason})")
+            print(f"Train windows: {train_windows} | "
+                  f"Test windows: {max(len(test_features) - MLOpsConfig.LOOKBACK_PERIOD, 0)} | "
+                  f"Features: {train_features.shape[1]}\n")
             
             # Step 4: Model Training
             print("Step 4/6: Model Training")
             print("-" * 70)
             model, history = self._train_model(
-                ticker, X_train, y_train, X_test, y_test,
-                epochs, batch_size
+                ticker, train_features, test_features,
+                MLOpsConfig.INCREMENTAL_EPOCHS if model is not None else epochs,
+                batch_size, model=model
             )
             print(f"Training completed in {len(history.history['loss'])} epochs\n")
             
             # Step 5: Model Evaluation
             print("Step 5/6: Model Evaluation")
             print("-" * 70)
-            metrics = self._evaluate_model(model, history, X_test, y_test, len(train_data))
+            metrics = self._evaluate_model(model, history, test_features, batch_size, train_windows)
             self._print_metrics(metrics)
             print()
             
             # Step 6: Save & Register
             print("Step 6/6: Save & Register Model")
             print("-" * 70)
+            training = {
+                'data_fingerprint': fingerprint,
+                'training_mode': training_mode,
+                'training_reason': reason,
+                'training_seconds': round(time.perf_counter() - started, 1)
+            }
+            if base is None:
+                training['full_trained_at'] = datetime.now().isoformat()
+                training['full_training_seconds'] = training['training_seconds']
+            else:
+                training['base_version'] = base['version']
+                training['full_trained_at'] = base['metadata'].get('full_trained_at')
+                training['full_training_seconds'] = base['metadata'].get('full_training_seconds')
+                if training['full_training_seconds']:
+                    training['saved_seconds'] = round(max(training['full_training_seconds'] - training['training_seconds'], 0), 1)
             model_info = self._save_and_register(
-                ticker, model, scaler, metrics
+                ticker, model, scaler, metrics, training
             )
             print()
             
             # Success summary
             print(f"{'='*70}")
             print(f"Ticker: {ticker}")
-            print(f"Version: v{model_info['version']}")
+            print(f"Version: v{model_info['version']} ({training_mode})")
             print(f"Validation Loss: {metrics['val_loss']:.6f}")
             print(f"Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"{'='*70}\n")
             
             return model_info
             
+        except DataUnchanged:
+            raise
         except Exception as e:
             print(f"\n{'='*70}")
             print(f" TRAINING FAILED")
@@ -134,6 +205,45 @@ class MLOpsTrainingPipeline:
             self._log_error(ticker, str(e))
             raise
     
+    def _warm_start_base(self, ticker: str, mode: str) -> Tuple[Optional[Dict], str]:
+        """
+        The registered model to fine-tune, or None for a full retrain
+        
+        Returns:
+            (model info or None, reason for the choice)
+        """
+        if mode == 'full':
+            return None, 'full retrain requested'
+        base = self.registry.get_latest_model(ticker)
+        if base is None:
+            return None, 'no registered model'
+        if not base.get('scaler_path') or not os.path.exists(base['model_path']) or not os.path.exists(base['scaler_path']):
+            return None, f"artifacts of v{base['version']} missing"
+        full_trained_at = base['metadata'].get('full_trained_at') or base['metadata'].get('trained_at')
+        if mode == 'auto' and full_trained_at:
+            age_hours = (datetime.now() - datetime.fromisoformat(full_trained_at)).total_seconds() / 3600
+            if age_hours > MLOpsConfig.FULL_RETRAIN_MAX_AGE_HOURS:
+                return None, f"last full retrain {age_hours:.0f}h ago"
+        return base, f"warm start from v{base['version']}"
+    
+    def _load_registered(self, model_info: Dict):
+        """Compiled model and scaler of a registry version"""
+        model = load_model(model_info['model_path'])
+        with open(model_info['scaler_path'], 'rb') as f:
+            scaler = pickle.load(f)
+        return model, scaler
+    
+    def _degradation(self, model, base: Dict, test_features, batch_size: int) -> Optional[str]:
+        """Why the registered model must be retrained from scratch, or None if it can be fine-tuned"""
+        registered_loss = base['metrics'].get('val_loss')
+        if not registered_loss:
+            return None
+        test_dataset = window_dataset(test_features, MLOpsConfig.LOOKBACK_PERIOD, batch_size)
+        current_loss = float(model.evaluate(test_dataset, verbose=0, return_dict=True)['loss'])
+        if current_loss > registered_loss * MLOpsConfig.DEGRADATION_TOLERANCE:
+            return f"degraded: loss {current_loss:.6f} vs registered {registered_loss:.6f}"
+        return None
+    
     def _ingest_data(self, ticker: str):
         """Ingest stock data from Yahoo Finance"""
         data_ingestion = DataIngestion(ticker=ticker)
@@ -152,26 +262,26 @@ class MLOpsTrainingPipeline:
         
         return train_data, test_data
     
-    def _transform_data(self, train_data, test_data):
-        """Transform data for LSTM model"""
+    def _transform_data(self, ticker: str, train_data, test_data, scaler=None):
+        """Scale data for the LSTM into memory-mapped feature files (windows are built while training)"""
         data_transformation = DataTransformation()
-        X_train, y_train, X_test, y_test, scaler = data_transformation.transform(
-            train_data, test_data
+        train_features, test_features, scaler = data_transformation.transform(
+            train_data, test_data, name=ticker, scaler=scaler,
+            seq_length=MLOpsConfig.LOOKBACK_PERIOD
         )
         
-        return X_train, y_train, X_test, y_test, scaler
+        return train_features, test_features, scaler
     
     def _train_model(
         self, 
         ticker: str, 
-        X_train, 
-        y_train, 
-        X_test, 
-        y_test, 
+        train_features, 
+        test_features, 
         epochs: int, 
-        batch_size: int
+        batch_size: int,
+        model=None
     ):
-        """Train LSTM model with callbacks"""
+        """Train LSTM model with callbacks, streaming windows from the feature files (fine-tunes model if given)"""
         # Create callbacks
         checkpoint_path = os.path.join(
             self.checkpoints_dir,
@@ -205,23 +315,37 @@ class MLOpsTrainingPipeline:
         
         # Train model
         model_trainer = ModelTrainer()
-        model, history = model_trainer.train_model(
-            X_train, y_train, X_test, y_test,
-            epochs=epochs,
-            batch_size=batch_size,
-            callbacks=callbacks
-        )
+        if model is not None:
+            model, history = model_trainer.fine_tune(
+                model, train_features, test_features,
+                epochs=epochs,
+                batch_size=batch_size,
+                callbacks=callbacks,
+                seq_length=MLOpsConfig.LOOKBACK_PERIOD
+            )
+        else:
+            model, history = model_trainer.train_model(
+                train_features, test_features,
+                epochs=epochs,
+                batch_size=batch_size,
+                callbacks=callbacks,
+                seq_length=MLOpsConfig.LOOKBACK_PERIOD
+            )
         
         return model, history
     
-    def _evaluate_model(self, model, history, X_test, y_test, train_samples: int) -> Dict:
-        """Evaluate model and collect metrics"""
+    def _evaluate_model(self, model, history, test_features, batch_size: int, train_samples: int) -> Dict:
+        """Evaluate model and collect metrics (train_samples: windows the model was trained on in this run)"""
+        seq_length = MLOpsConfig.LOOKBACK_PERIOD
+        test_dataset = window_dataset(test_features, seq_length, batch_size)
+        y_test = window_targets(test_features, seq_length)
+        
         train_loss = float(history.history['loss'][-1])
         val_loss = float(history.history['val_loss'][-1])
-        test_loss = float(model.evaluate(X_test, y_test, verbose=0))
+        test_loss = float(model.evaluate(test_dataset, verbose=0, return_dict=True)['loss'])
         
         # Calculate additional metrics
-        predictions = model.predict(X_test, verbose=0)
+        predictions = model.predict(test_dataset, verbose=0).reshape(-1)
         mse = float(np.mean((predictions - y_test) ** 2))
         rmse = float(np.sqrt(mse))
         mae = float(np.mean(np.abs(predictions - y_test)))
@@ -235,7 +359,7 @@ class MLOpsTrainingPipeline:
             'mae': mae,
             'epochs_trained': len(history.history['loss']),
             'train_samples': train_samples,
-            'test_samples': len(X_test)
+            'test_samples': len(y_test)
         }
         
         return metrics
@@ -249,7 +373,7 @@ class MLOpsTrainingPipeline:
         print(f" MAE:             {metrics['mae']:.6f}")
         print(f"  Epochs:          {metrics['epochs_trained']}")
     
-    def _save_and_register(self, ticker: str, model, scaler, metrics: Dict) -> Dict:
+    def _save_and_register(self, ticker: str, model, scaler, metrics: Dict, training: Optional[Dict] = None) -> Dict:
         """Save model artifacts and register in MLOps registry"""
         # Save model
         model_path = os.path.join(self.artifacts_dir, f'{ticker}_lstm_model.h5')
@@ -271,7 +395,8 @@ class MLOpsTrainingPipeline:
             metadata={
                 'framework': 'TensorFlow/Keras',
                 'model_type': 'LSTM',
-                'trained_at': datetime.now().isoformat()
+                'trained_at': datetime.now().isoformat(),
+                **(training or {})
             }
         )
         
@@ -285,46 +410,167 @@ class MLOpsTrainingPipeline:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             f.write(f"[{timestamp}] {ticker}: {error}\n")
     
-    def batch_train(self, tickers: list, **kwargs):
+    def batch_train(
+        self,
+        tickers: list,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        previous_fingerprints: Optional[Dict[str, str]] = None,
+        **kwargs
+    ):
         """
-        Train models for multiple tickers in batch
+        Train models for multiple tickers in parallel worker processes
+        
+        Each ticker trains in its own process (spawned, so TensorFlow state is
+        never forked) with TensorFlow's thread pools capped, so workers don't
+        oversubscribe the CPUs. A failing ticker, or a crashed worker, only
+        fails that ticker. Per-ticker wall and CPU times are printed and kept
+        in self.last_batch_summary.
         
         Args:
             tickers: List of stock ticker symbols
+            workers: Parallel training processes (default: MLOpsConfig.TRAINING_WORKERS);
+                1 trains in this process, one ticker after another
+            threads_per_worker: TensorFlow intra-op threads per worker
+                (default: MLOpsConfig.training_threads, (CPUs - 1) / workers
+                unless TRAINING_THREADS_PER_WORKER is set)
+            previous_fingerprints: Ticker -> fingerprint of the data it was last
+                trained on; tickers whose ingested data still has it are
+                skipped (see train_model)
             **kwargs: Additional arguments passed to train_model()
         
         Returns:
-            Dictionary mapping tickers to their model info
+            Dictionary mapping tickers to their model info (trained tickers only)
         """
-        results = {}
-        failed = []
+        workers = max(1, min(workers or MLOpsConfig.TRAINING_WORKERS, len(tickers) or 1))
+        threads = threads_per_worker or MLOpsConfig.training_threads(workers)
         
         print(f"\n{'#'*70}")
         print(f"BATCH TRAINING: {len(tickers)} stocks")
+        print(f"Workers: {workers} | TensorFlow threads per worker: {threads}")
         print(f"{'#'*70}\n")
         
-        for i, ticker in enumerate(tickers, 1):
-            print(f"\n[{i}/{len(tickers)}] Training {ticker}...")
-            
-            try:
-                model_info = self.train_model(ticker, **kwargs)
-                results[ticker] = model_info
-            except Exception as e:
-                print(f" Failed: {ticker} - {str(e)}")
-                failed.append(ticker)
+        previous_fingerprints = previous_fingerprints or {}
+        jobs = {ticker: dict(kwargs, previous_fingerprint=previous_fingerprints.get(ticker)) for ticker in tickers}
+        batch_start = time.perf_counter()
+        if workers == 1:
+            summary = []
+            for i, ticker in enumerate(tickers, 1):
+                print(f"\n[{i}/{len(tickers)}] Training {ticker}...")
+                summary.append(_train_ticker(self.registry_path, ticker, jobs[ticker]))
+        else:
+            summary = self._train_in_workers(tickers, workers, threads, jobs)
+        batch_wall_time = time.perf_counter() - batch_start
+        
+        # Keep the caller's order; workers finish in any order
+        order = {ticker: i for i, ticker in enumerate(tickers)}
+        summary.sort(key=lambda row: order[row['ticker']])
+        self.last_batch_summary = summary
+        # Registrations happened in other processes
+        self.registry._load_metadata()
+        
+        results = {row['ticker']: row['model_info'] for row in summary if row['model_info'] is not None}
+        skipped = [row['ticker'] for row in summary if row['skipped'] is not None]
+        failed = [row['ticker'] for row in summary if row['error'] is not None]
         
         # Summary
         print(f"\n{'#'*70}")
         print(f"BATCH TRAINING SUMMARY")
         print(f"{'#'*70}")
+        print(f"{'Ticker':<8} {'Status':<8} {'Mode':<12} {'Wall (s)':>10} {'CPU (s)':>10} {'Saved (s)':>10}")
+        for row in summary:
+            status = 'failed' if row['error'] is not None else 'skipped' if row['skipped'] is not None else 'ok'
+            training = (row['model_info'] or {}).get('metadata', {})
+            wall = f"{row['wall_time']:.1f}" if row['wall_time'] is not None else '-'
+            cpu = f"{row['cpu_time']:.1f}" if row['cpu_time'] is not None else '-'
+            saved = f"{training['saved_seconds']:.1f}" if training.get('saved_seconds') is not None else '-'
+            print(f"{row['ticker']:<8} {status:<8} {training.get('training_mode', '-'):<12} {wall:>10} {cpu:>10} {saved:>10}")
         print(f" Successful: {len(results)}/{len(tickers)}")
+        if skipped:
+            print(f" Skipped (data unchanged): {', '.join(skipped)}")
+        print(f" Incremental: {sum(1 for info in results.values() if info['metadata'].get('training_mode') == 'incremental')}"
+              f" | Saved vs full retrain: {batch_saved_seconds(summary):.1f}s")
         if failed:
             print(f" Failed: {', '.join(failed)}")
+            for row in summary:
+                if row['error'] is not None:
+                    print(f"   {row['ticker']}: {row['error']}")
+        print(f" Batch wall time: {batch_wall_time:.1f}s")
         print(f"{'#'*70}\n")
         
         return results
+    
+    def _train_in_workers(self, tickers: list, workers: int, threads: int, jobs: Dict[str, Dict]) -> List[Dict]:
+        """Train tickers (with their train_model arguments in jobs) in a spawned process pool; returns one summary row per ticker"""
+        inter_op_threads = min(MLOpsConfig.TRAINING_INTER_OP_THREADS, threads)
+        summary = []
+        # One process per ticker: TensorFlow memory is returned after each
+        # model and a crash can't leak into the next ticker
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_training_worker,
+            initargs=(threads, inter_op_threads),
+            max_tasks_per_child=1
+        ) as pool:
+            futures = {
+                pool.submit(_train_ticker, self.registry_path, ticker, jobs[ticker]): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    # The worker process died (e.g. killed for running out of memory)
+                    row = {'ticker': ticker, 'model_info': None, 'error': f"worker failed: {e}",
+                           'skipped': None, 'fingerprint': None, 'wall_time': None, 'cpu_time': None}
+                    self._log_error(ticker, row['error'])
+                status = f"failed - {row['error']}" if row['error'] is not None else row['skipped'] or 'done'
+                print(f"[{len(summary) + 1}/{len(tickers)}] {ticker} {status}")
+                summary.append(row)
+        return summary
 
 
+def batch_saved_seconds(summary: List[Dict]) -> float:
+    """Training time incremental runs saved against each ticker's last full retrain"""
+    return sum(
+        (row['model_info'] or {}).get('metadata', {}).get('saved_seconds') or 0
+        for row in summary
+    )
+
+
+def _init_training_worker(intra_op_threads: int, inter_op_threads: int):
+    """Cap TensorFlow's thread pools in a training worker (before it runs any op)"""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+
+def _train_ticker(registry_path: str, ticker: str, kwargs: Dict) -> Dict:
+    """
+    Train and register one ticker, timing it (runs in a batch worker)
+    
+    Returns:
+        Summary row: ticker, model_info, error (None on success), skipped
+        (reason, or None), fingerprint of the ingested data, wall_time, cpu_time
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    row = {'ticker': ticker, 'model_info': None, 'error': None, 'skipped': None, 'fingerprint': None}
+    try:
+        row['model_info'] = MLOpsTrainingPipeline(registry_path).train_model(ticker, **kwargs)
+        row['fingerprint'] = row['model_info']['metadata'].get('data_fingerprint')
+    except DataUnchanged as e:
+        row['skipped'] = str(e)
+        row['fingerprint'] = e.fingerprint
+    except Exception as e:
+        # train_model already logged it
+        row['error'] = str(e)
+    row['wall_time'] = time.perf_counter() - wall_start
+    row['cpu_time'] = time.process_time() - cpu_start
+    return row
+
 if __name__ == "__main__":
     # Example: Train single model
     pipeline = MLOpsTrainingPipeline()
@@ -0,0 +1,120 @@
+"""
+Model Manager
+Thread-safe lifecycle for the serving LSTM model so the app can run under
+threaded (gthread) or gevent gunicorn workers
+"""
+import os
+import threading
+
+from log_config import get_logger
+from metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class ModelManager:
+    """
+    Owns the Keras model for one worker process
+
+    - The model is loaded at most once per process: concurrent first requests
+      wait on a lock instead of each loading TensorFlow and the weights.
+    - When the artifact on disk is replaced (new mtime or size) the next
+      request reloads it, so served predictions follow the model version
+      (get_model_version in app.py includes the artifact's mtime). If the
+      new artifact fails to load the previous model keeps serving.
+    - A failed or missing model is remembered until the artifact changes, so
+      requests fall back to technical analysis without retrying every time.
+    - predict() serializes calls into Keras, whose predict() lazily builds
+      shared state and is not safe to enter from several threads at once.
+    """
+
+    def __init__(self, model_path, loader=None):
+        """
+        Args:
+            model_path: Path to the saved .h5 model
+            loader: Callable taking a path and returning a model
+                    (defaults to tensorflow.keras.models.load_model)
+        """
+        self.model_path = model_path
+        self._loader = loader
+        self._model = None
+        self._load_attempted = False
+        self._loaded_signature = None
+        self._load_lock = threading.Lock()
+        self._predict_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        """Return the model, loading it on first use or after the artifact changed (None if unavailable)"""
+        signature = self._signature()
+        if self._load_attempted and signature == self._loaded_signature:
+            return self._model
+
+        with self._load_lock:
+            if not self._load_attempted or signature != self._loaded_signature:
+                if self._load_attempted:
+                    logger.info("Model artifact %s changed, reloading", self.model_path)
+                with metrics.timer('stage_duration_seconds', stage='model_load'):
+                    model = self._load()
+                # A new artifact that fails to load leaves the previous model serving
+                if model is not None or signature is None:
+                    self._model = model
+                self._loaded_signature = signature
+                self._load_attempted = True
+        return self._model
+
+    def _signature(self):
+        """(mtime, size) of the artifact, None if it does not exist"""
+        try:
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        try:
+            if not os.path.exists(self.model_path):
+                artifacts_dir = os.path.dirname(self.model_path) or '.'
+                logger.warning("Model file not found at %s (cwd %s, %s contains %s)",
+                               self.model_path, os.getcwd(), artifacts_dir,
+                               os.listdir(artifacts_dir) if os.path.exists(artifacts_dir) else 'nothing')
+                return None
+
+            logger.info("Loading TensorFlow model from %s", self.model_path)
+            loader = self._loader
+            if loader is None:
+                # Import TensorFlow only when needed
+                from tensorflow.keras.models import load_model
+                loader = load_model
+            model = loader(self.model_path)
+            logger.info("Model loaded from %s", self.model_path)
+            return model
+        except Exception:
+            logger.exception("Error loading model from %s", self.model_path)
+            return None
+
+    def predict(self, inputs):
+        """
+        Run a forward pass
+
+        Args:
+            inputs: Array shaped (batch, sequence_length, features)
+
+        Returns:
+            np.ndarray of predictions, or None if no model is available
+        """
+        model = self.get()
+        if model is None:
+            return None
+        with self._predict_lock, metrics.timer('stage_duration_seconds', stage='inference'):
+            return model.predict(inputs, verbose=0)
+
+    def reset(self):
+        """Forget the loaded model so the next request reloads it from disk"""
+        with self._load_lock:
+            self._model = None
+            self._load_attempted = False
+            self._loaded_signature = None
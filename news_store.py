@@ -0,0 +1,279 @@
+"""
+News Store
+Local, incremental store of company news shared by every worker, so /api/news
+and the news-based sentiment fallback read from SQLite instead of refetching
+the whole window from Finnhub on every request
+
+- Articles are keyed by (ticker, Finnhub id, or a hash of the URL when there
+  is none) and by (ticker, normalized headline), so syndicated copies of the
+  same story from several sources are stored once.
+- A ticker is synced at most every NEWS_SYNC_INTERVAL seconds, by one worker
+  at a time, and each sync only asks Finnhub for articles from the day of the
+  newest stored one onwards. A sync holds an expiring claim (claimed_until),
+  so a worker that dies mid-sync blocks the ticker for SYNC_LEASE at most;
+  callers that find a ticker's first sync in progress wait for it (up to
+  FIRST_SYNC_WAIT) instead of fetching too.
+- Articles older than NEWS_RETENTION_DAYS are evicted.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+NEWS_STORE_PATH = os.getenv('NEWS_STORE_PATH', os.path.join(tempfile.gettempdir(), 'vionex_news.sqlite3'))
+NEWS_SYNC_INTERVAL = int(os.getenv('NEWS_SYNC_INTERVAL', 300))  # seconds
+NEWS_RETENTION_DAYS = int(os.getenv('NEWS_RETENTION_DAYS', 30))
+SYNC_RETRY_AFTER = 60  # seconds before a failed sync is retried
+SYNC_LEASE = 60  # seconds a sync claim holds before another worker may take it over
+FIRST_SYNC_WAIT = 15  # seconds a caller waits for another worker's first sync of a ticker
+FIRST_SYNC_POLL = 0.1  # seconds
+PURGE_EVERY = 100  # syncs
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS articles ('
+    'ticker TEXT NOT NULL, article_key TEXT NOT NULL, headline_key TEXT NOT NULL, '
+    'published INTEGER NOT NULL, datetime TEXT NOT NULL, headline TEXT, summary TEXT, '
+    'source TEXT, url TEXT, image TEXT, '
+    'PRIMARY KEY (ticker, article_key), UNIQUE (ticker, headline_key))',
+    'CREATE INDEX IF NOT EXISTS articles_by_time ON articles (ticker, published)',
+    # claimed_until marks a sync in progress (expires after SYNC_LEASE);
+    # covered_from is the oldest timestamp the stored articles are complete from
+    'CREATE TABLE IF NOT EXISTS sync ('
+    'ticker TEXT PRIMARY KEY, synced_at REAL NOT NULL, covered_from INTEGER NOT NULL, '
+    'completed INTEGER NOT NULL DEFAULT 0, claimed_until REAL NOT NULL DEFAULT 0)',
+)
+
+# _claim result when another worker is running the ticker's first sync
+FIRST_SYNC_PENDING = 'first_sync_pending'
+
+
+def article_key(article):
+    """Finnhub's article id, or a hash of the URL for articles without one"""
+    if article.get('id'):
+        return str(article['id'])
+    return hashlib.sha1(article.get('url', '').encode('utf-8')).hexdigest()
+
+
+def headline_key(headline):
+    """Headline with case, punctuation and spacing removed (syndicated copies collide)"""
+    return _NON_WORD.sub(' ', (headline or '').lower()).strip()
+
+
+class NewsStore:
+    """Per-ticker article store on a SQLite file in WAL mode (one connection per thread)"""
+
+    def __init__(self, path=NEWS_STORE_PATH, sync_interval=NEWS_SYNC_INTERVAL,
+                 retention_days=NEWS_RETENTION_DAYS):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.retention_days = retention_days
+        self._local = threading.local()
+        self._syncs = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        for statement in SCHEMA:
+            conn.execute(statement)
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(sync)')}
+        if 'claimed_until' not in columns:
+            # Stores created before sync claims expired
+            conn.execute('ALTER TABLE sync ADD COLUMN claimed_until REAL NOT NULL DEFAULT 0')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def sync(self, ticker, fetch, days):
+        """
+        Fetch new articles for ticker if its sync is due
+
+        Args:
+            ticker: Stock symbol
+            fetch: Callable(ticker, from_date, to_date) -> list of raw Finnhub articles
+            days: Window the caller is about to read (extends coverage backwards)
+
+        Returns:
+            int: Articles added (0 when not due, claimed by another worker, or failed)
+        """
+        now = time.time()
+        start = int(now - days * 86400)
+        claim = self._claim(ticker, now, start)
+        if claim is None:
+            return 0
+        if claim == FIRST_SYNC_PENDING:
+            self._wait_for_first_sync(ticker)
+            return 0
+
+        latest, covered_from = claim
+        # Only fetch what is not stored yet; Finnhub filters by whole days
+        since = latest if latest and covered_from <= start else start
+        try:
+            raw = fetch(ticker, datetime.fromtimestamp(since), datetime.fromtimestamp(now))
+        except Exception as e:
+            logger.warning("News sync for %s failed: %s", ticker, e)
+            self._connect().execute(
+                'UPDATE sync SET synced_at = ?, claimed_until = 0 WHERE ticker = ?',
+                (now - self.sync_interval + SYNC_RETRY_AFTER, ticker)
+            )
+            return 0
+
+        try:
+            added = self.add(ticker, raw)
+        except Exception:
+            self._connect().execute('UPDATE sync SET claimed_until = 0 WHERE ticker = ?', (ticker,))
+            raise
+        self._connect().execute(
+            'UPDATE sync SET covered_from = MIN(covered_from, ?), completed = 1, claimed_until = 0 WHERE ticker = ?',
+            (start, ticker)
+        )
+        self._syncs += 1
+        if self._syncs % PURGE_EVERY == 0:
+            self.purge()
+        logger.debug("News sync for %s: %d new of %d fetched", ticker, added, len(raw))
+        return added
+
+    def _claim(self, ticker, now, start):
+        """
+        Claim the ticker's sync if it is due (or the window grew) and no other
+        worker holds an unexpired claim on it
+
+        Returns:
+            (latest stored timestamp, covered_from); FIRST_SYNC_PENDING if
+            another worker holds the ticker's first sync; None if there is
+            nothing to do
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT synced_at, covered_from, completed, claimed_until FROM sync WHERE ticker = ?', (ticker,)
+            ).fetchone()
+            if row is None:
+                conn.execute('INSERT INTO sync (ticker, synced_at, covered_from, claimed_until) VALUES (?, ?, ?, ?)',
+                             (ticker, now, start, now + SYNC_LEASE))
+                row = (0.0, start, 0, 0.0)
+            else:
+                synced_at, covered_from, completed, claimed_until = row
+                if claimed_until > now:
+                    conn.execute('COMMIT')
+                    return None if completed else FIRST_SYNC_PENDING
+                due = now - synced_at >= self.sync_interval or covered_from > start
+                # A first sync that failed or expired is retried right away
+                if not due and completed:
+                    conn.execute('COMMIT')
+                    return None
+                conn.execute('UPDATE sync SET synced_at = ?, claimed_until = ? WHERE ticker = ?',
+                             (now, now + SYNC_LEASE, ticker))
+            latest = conn.execute('SELECT MAX(published) FROM articles WHERE ticker = ?', (ticker,)).fetchone()[0]
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return latest or 0, row[1]
+
+    def _wait_for_first_sync(self, ticker):
+        """Block until another worker's first sync of ticker finishes, fails or FIRST_SYNC_WAIT passes"""
+        deadline = time.time() + FIRST_SYNC_WAIT
+        conn = self._connect()
+        while time.time() < deadline:
+            row = conn.execute('SELECT completed, claimed_until FROM sync WHERE ticker = ?', (ticker,)).fetchone()
+            if row is None or row[0] or row[1] <= time.time():
+                return
+            time.sleep(FIRST_SYNC_POLL)
+
+    def add(self, ticker, raw_articles):
+        """Insert raw Finnhub articles, skipping ones already stored or syndicated; returns the count added"""
+        cutoff = time.time() - self.retention_days * 86400
+        rows = []
+        for article in raw_articles:
+            published = int(article.get('datetime') or 0)
+            if published < cutoff:
+                continue
+            headline = article.get('headline', 'No headline')
+            rows.append((
+                ticker, article_key(article), headline_key(headline), published,
+                datetime.fromtimestamp(published).strftime('%Y-%m-%d %H:%M'),
+                headline, article.get('summary', 'No summary available'),
+                article.get('source', 'Unknown'), article.get('url', '#'), article.get('image', '')
+            ))
+        if not rows:
+            return 0
+        conn = self._connect()
+        before = conn.total_changes
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR IGNORE INTO articles (ticker, article_key, headline_key, published, datetime, '
+                'headline, summary, source, url, image) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return conn.total_changes - before
+
+    def articles(self, ticker, days=7, limit=None):
+        """
+        Stored articles for ticker from the last `days` days, newest first
+
+        Returns:
+            list: Articles with headline, summary, source, url, image, datetime and timestamp
+        """
+        since = int(time.time() - days * 86400)
+        rows = self._connect().execute(
+            'SELECT headline, summary, source, url, image, datetime, published FROM articles '
+            'WHERE ticker = ? AND published >= ? ORDER BY published DESC LIMIT ?',
+            (ticker, since, -1 if limit is None else limit)
+        ).fetchall()
+        return [
+            {'headline': headline, 'summary': summary, 'source': source, 'url': url,
+             'image': image, 'datetime': formatted, 'timestamp': published}
+            for headline, summary, source, url, image, formatted, published in rows
+        ]
+
+    def purge(self):
+        """Evict articles past the retention window"""
+        cutoff = int(time.time() - self.retention_days * 86400)
+        conn = self._connect()
+        deleted = conn.execute('DELETE FROM articles WHERE published < ?', (cutoff,)).rowcount
+        conn.execute('UPDATE sync SET covered_from = MAX(covered_from, ?)', (cutoff,))
+        if deleted:
+            logger.info("Evicted %d news articles older than %d days", deleted, self.retention_days)
+        return deleted
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_news_store():
+    """Process-wide news store at NEWS_STORE_PATH"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = NewsStore()
+    return _store
+
+
+def fetch_window(days):
+    """Days of news to sync for a request of `days` (capped at the retention window)"""
+    return max(1, min(days, NEWS_RETENTION_DAYS))
+
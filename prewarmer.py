@@ -0,0 +1,221 @@
+"""
+Pre-warmer
+Refreshes the cached data of the most requested tickers shortly before it
+expires, so interactive requests for hot tickers hit a warm cache instead of
+paying the upstream fetch, indicators and inference themselves
+
+- Popularity is an exponentially decayed request count per ticker
+  (half-life POPULARITY_HALF_LIFE), so yesterday's hot ticker fades out.
+- Every PREWARM_INTERVAL the top-K tickers are checked; each refresh task
+  (history, quote, ...) runs when its entry is within PREWARM_LEAD seconds
+  (at most a quarter of its TTL) of expiring, on a bounded thread pool.
+- Upstream calls are limited by per-provider credit budgets per minute, spent
+  on the most popular tickers first.
+- With several workers only one runs refreshes: the holder of a lease in the
+  shared cache. It ranks tickers by the requests it served itself, which
+  with round-robin balancing is a fair sample of the whole server's traffic.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_backend import get_cache
+from log_config import get_logger
+from metrics import metrics
+
+logger = get_logger(__name__)
+
+PREWARM_ENABLED = os.getenv('PREWARM_ENABLED', 'true').lower() == 'true'
+PREWARM_TOP_K = int(os.getenv('PREWARM_TOP_K', 10))
+PREWARM_INTERVAL = 5  # seconds between scheduling passes
+PREWARM_LEAD = 10  # seconds before expiry that an entry is refreshed
+PREWARM_THREADS = 4
+POPULARITY_HALF_LIFE = 15 * 60  # seconds
+MAX_TRACKED_TICKERS = 1000
+MIN_SCORE = 0.5  # tickers decayed below this are not worth warming
+FAILURE_BACKOFF = 60  # seconds before retrying a refresh that failed
+
+# Upstream calls the pre-warmer may spend per minute, per provider. Twelve
+# Data's free tier allows 8 credits a minute in total, so leave most of it
+# to interactive requests.
+PREWARM_CREDITS = {
+    'twelve_data': int(os.getenv('PREWARM_TWELVE_DATA_CREDITS', 4)),
+    'finnhub': int(os.getenv('PREWARM_FINNHUB_CREDITS', 30)),
+}
+
+LEADER_KEY = 'prewarm:leader'
+LEADER_LEASE = 3 * PREWARM_INTERVAL  # seconds
+
+
+class PopularityTracker:
+    """Exponentially decayed request counts per ticker (thread-safe)"""
+
+    def __init__(self, half_life=POPULARITY_HALF_LIFE, max_items=MAX_TRACKED_TICKERS):
+        self.decay = math.log(2) / half_life
+        self.max_items = max_items
+        self._scores = {}  # ticker -> (score, updated_at)
+        self._lock = threading.Lock()
+
+    def _decayed(self, score, updated_at, now):
+        return score * math.exp(-self.decay * (now - updated_at))
+
+    def record(self, ticker, weight=1.0):
+        now = time.time()
+        with self._lock:
+            score, updated_at = self._scores.get(ticker, (0.0, now))
+            self._scores[ticker] = (self._decayed(score, updated_at, now) + weight, now)
+            if len(self._scores) > self.max_items:
+                self._prune(now)
+
+    def _prune(self, now):
+        ranked = sorted(self._scores.items(), key=lambda kv: self._decayed(*kv[1], now), reverse=True)
+        self._scores = dict(ranked[:self.max_items // 2])
+
+    def top(self, k, min_score=MIN_SCORE):
+        """The k highest-scoring tickers as [(ticker, score)]"""
+        now = time.time()
+        with self._lock:
+            scored = [(ticker, self._decayed(score, updated_at, now))
+                      for ticker, (score, updated_at) in self._scores.items()]
+        scored = [item for item in scored if item[1] >= min_score]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:k]
+
+
+class CreditBudget:
+    """Per-minute allowance of upstream calls for one provider"""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self._window = None
+        self._spent = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self, credits=1):
+        window = int(time.time() // 60)
+        with self._lock:
+            if window != self._window:
+                self._window, self._spent = window, 0
+            if self._spent + credits > self.per_minute:
+                return False
+            self._spent += credits
+            return True
+
+
+class RefreshTask:
+    """
+    One kind of cache entry to keep warm
+
+    Args:
+        name: Label for logs and metrics (e.g. 'history')
+        ttl: Lifetime of the cache entry the task refreshes (seconds)
+        provider: Key into the credit budgets
+        refresh: Callable(ticker) -> bool (True if the entry was refreshed)
+        credits: Upstream calls one refresh costs
+    """
+
+    def __init__(self, name, ttl, provider, refresh, credits=1):
+        self.name = name
+        self.ttl = ttl
+        self.provider = provider
+        self.refresh = refresh
+        self.credits = credits
+
+
+class Prewarmer:
+    """Background scheduler that keeps the top-K tickers' cache entries warm"""
+
+    def __init__(self, tasks, top_k=PREWARM_TOP_K, budgets=None, interval=PREWARM_INTERVAL,
+                 lead=PREWARM_LEAD, threads=PREWARM_THREADS):
+        self.tasks = list(tasks)
+        self.top_k = top_k
+        self.interval = interval
+        self.lead = lead
+        self.threads = threads
+        self.popularity = PopularityTracker()
+        self.budgets = {provider: CreditBudget(limit) for provider, limit in (budgets or PREWARM_CREDITS).items()}
+        self._refreshed_at = {}  # (task name, ticker) -> last refresh (pushed back after a failure)
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._executor = None
+
+    def record(self, ticker):
+        """Count an interactive request for ticker"""
+        self.popularity.record(ticker)
+
+    def start(self):
+        """Start the scheduler thread (once per process, fork-safe)"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='prewarm')
+        threading.Thread(target=self._run, name='prewarmer', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                if self._is_leader():
+                    self.schedule()
+            except Exception as e:
+                logger.warning("Pre-warmer pass failed: %s", e)
+
+    def _is_leader(self):
+        cache = get_cache()
+        me = str(self._pid).encode()
+        if cache.add(LEADER_KEY, me, LEADER_LEASE):
+            return True
+        if cache.get(LEADER_KEY) == me:
+            cache.set(LEADER_KEY, me, LEADER_LEASE)
+            return True
+        return False
+
+    def schedule(self):
+        """Submit the refreshes that are due, most popular tickers first"""
+        now = time.time()
+        submitted = 0
+        for ticker, _score in self.popularity.top(self.top_k):
+            for task in self.tasks:
+                key = (task.name, ticker)
+                with self._lock:
+                    if key in self._in_flight:
+                        continue
+                    refreshed_at = self._refreshed_at.get(key)
+                lead = min(self.lead, task.ttl / 4)
+                if refreshed_at is not None and now < refreshed_at + task.ttl - lead:
+                    continue
+                budget = self.budgets.get(task.provider)
+                if budget is not None and not budget.try_spend(task.credits):
+                    metrics.inc('prewarm_refreshes_total', task=task.name, result='over_budget')
+                    continue
+                with self._lock:
+                    self._in_flight.add(key)
+                self._executor.submit(self._refresh, task, ticker)
+                submitted += 1
+        return submitted
+
+    def _refresh(self, task, ticker):
+        key = (task.name, ticker)
+        result = 'error'
+        try:
+            with metrics.timer('stage_duration_seconds', stage=f'prewarm_{task.name}'):
+                refreshed = task.refresh(ticker)
+            result = 'ok' if refreshed else 'failed'
+        except Exception as e:
+            logger.warning("Pre-warm %s for %s failed: %s", task.name, ticker, e)
+        finally:
+            # A failed refresh is retried after FAILURE_BACKOFF, not every pass
+            refreshed_at = time.time()
+            if result != 'ok':
+                refreshed_at += FAILURE_BACKOFF - task.ttl + min(self.lead, task.ttl / 4)
+            with self._lock:
+                self._refreshed_at[key] = refreshed_at
+                self._in_flight.discard(key)
+            metrics.inc('prewarm_refreshes_total', task=task.name, result=result)
@@ -0,0 +1,166 @@
+"""
+Live Quote Streaming
+Fans quote ticks from one upstream poller per subscribed ticker out to every
+connected client, so upstream quote calls scale with distinct tickers rather
+than with viewers
+"""
+import os
+import queue
+import threading
+import time
+
+from log_config import get_logger
+from stock_api import get_quote_data
+
+logger = get_logger(__name__)
+
+QUOTE_POLL_INTERVAL = float(os.getenv('QUOTE_POLL_INTERVAL', 5))  # seconds
+HEARTBEAT_INTERVAL = 15  # seconds
+SUBSCRIBER_QUEUE_SIZE = 32
+MAX_DROPPED_EVENTS = 256  # a consumer dropping this many events without catching up is disconnected
+
+
+class Subscription:
+    """
+    A client's view of the hub: a bounded queue of quote events
+
+    The queue never blocks the publisher. When a slow consumer lets it fill
+    up, the oldest tick is dropped (only the latest quote matters), and a
+    consumer that keeps falling behind is closed so it can reconnect. Drops
+    are counted since the consumer last drained the queue, so occasional
+    bursts over a long-lived connection never add up to a disconnect.
+    """
+
+    def __init__(self, tickers, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.tickers = tuple(tickers)
+        self.dropped = 0  # since the queue was last drained
+        self.closed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def offer(self, event):
+        """Enqueue an event without blocking, dropping the oldest one if full"""
+        if self.closed:
+            return
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                self.dropped += 1
+                if self.dropped > MAX_DROPPED_EVENTS:
+                    self.closed = True
+                    return
+
+    def get(self, timeout=HEARTBEAT_INTERVAL):
+        """Next event, or None if nothing arrived within timeout"""
+        try:
+            event = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if self._queue.empty():
+            self.dropped = 0  # caught up
+        return event
+
+
+class QuotePoller(threading.Thread):
+    """Background thread polling the upstream quote for a single ticker"""
+
+    def __init__(self, hub, ticker, interval):
+        super().__init__(name=f'quote-poller-{ticker}', daemon=True)
+        self.hub = hub
+        self.ticker = ticker
+        self.interval = interval
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                quote = self.hub.fetch_quote(self.ticker)
+                if quote:
+                    self.hub.publish(self.ticker, quote)
+            except Exception as e:
+                logger.warning("Quote poller error for %s: %s", self.ticker, e)
+            self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class QuoteHub:
+    """
+    Reference-counted registry of tickers with live subscribers
+
+    The first subscriber to a ticker starts its poller, the last one to leave
+    stops it. Each tick is published to every subscriber of that ticker, and
+    new subscribers immediately receive the latest known quote.
+    """
+
+    def __init__(self, fetch_quote=get_quote_data.uncached, poll_interval=QUOTE_POLL_INTERVAL):
+        self.fetch_quote = fetch_quote
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._pollers = {}
+        self._latest = {}
+
+    def subscribe(self, tickers):
+        """Register a subscription for the given tickers"""
+        subscription = Subscription(tickers)
+        with self._lock:
+            for ticker in subscription.tickers:
+                self._subscribers.setdefault(ticker, set()).add(subscription)
+                if ticker not in self._pollers:
+                    poller = QuotePoller(self, ticker, self.poll_interval)
+                    self._pollers[ticker] = poller
+                    poller.start()
+                if ticker in self._latest:
+                    subscription.offer(self._latest[ticker][1])
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Release a subscription, stopping pollers nobody listens to anymore"""
+        subscription.closed = True
+        with self._lock:
+            for ticker in subscription.tickers:
+                subscribers = self._subscribers.get(ticker)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[ticker]
+                    poller = self._pollers.pop(ticker, None)
+                    if poller is not None:
+                        poller.stop()
+
+    def publish(self, ticker, quote):
+        """Fan a quote out to the ticker's subscribers (skips unchanged quotes)"""
+        event = dict(quote, ticker=ticker)
+        with self._lock:
+            previous = self._latest.get(ticker)
+            self._latest[ticker] = (time.time(), event)
+            if previous is not None and previous[1] == event:
+                return
+            subscribers = list(self._subscribers.get(ticker, ()))
+        for subscription in subscribers:
+            subscription.offer(event)
+
+    def latest(self, ticker, max_age):
+        """Latest streamed quote for a ticker if it is at most max_age seconds old"""
+        entry = self._latest.get(ticker)
+        if entry is None or time.time() - entry[0] > max_age:
+            return None
+        quote = dict(entry[1])
+        quote.pop('ticker', None)
+        return quote
+
+    def stats(self):
+        """Subscriber and poller counts"""
+        with self._lock:
+            return {
+                'tickers': sorted(self._pollers),
+                'subscribers': {ticker: len(subs) for ticker, subs in self._subscribers.items()}
+            }
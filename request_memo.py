@@ -0,0 +1,34 @@
+"""
+Request-scoped Memo
+Resolves each shared dependency of a request (history, indicators, ...) once,
+even when several panels of a composite response ask for it concurrently
+
+One RequestMemo lives for one request; nothing is shared between requests
+(the shared cache in cache_backend.py does that). The first caller of a key
+runs its loader, later callers wait for and share the same result or
+exception. Values are shared objects: callers must not mutate them.
+"""
+import threading
+from concurrent.futures import Future
+
+
+class RequestMemo:
+    """Per-request memo of keyed loaders (thread-safe)"""
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """Return loader()'s result for key, running loader at most once"""
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+        if owner:
+            try:
+                future.set_result(loader())
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
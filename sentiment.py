@@ -0,0 +1,200 @@
+"""
+Keyword Sentiment Scoring
+Scores news text against a bullish/bearish lexicon compiled once into a
+single regular expression
+
+The whole lexicon is one alternation anchored on word boundaries, so each
+text is scanned once regardless of lexicon size, every occurrence is
+counted, and words are only matched whole ('up' no longer matches 'update',
+'high' no longer matches 'highlight'). Inflected forms ('gains', 'surging',
+'dropped', 'highest', 'rose') are listed explicitly (see inflections) and
+count as their base word.
+"""
+import re
+from bisect import bisect_right
+
+POSITIVE_KEYWORDS = ['surge', 'gain', 'profit', 'growth', 'high', 'beat', 'success', 'bullish', 'rise', 'up', 'strong', 'outperform']
+NEGATIVE_KEYWORDS = ['fall', 'loss', 'decline', 'low', 'miss', 'weak', 'bearish', 'down', 'drop', 'underperform']
+
+# How keywords inflect: adjectives compare ('high' -> 'higher', 'highest'),
+# nouns only pluralise, everything else inflects as a verb
+ADJECTIVES = {'high', 'low', 'strong', 'weak'}
+NOUNS = {'growth', 'success', 'loss'}
+UNINFLECTED = {'bullish', 'bearish'}
+IRREGULAR_PAST = {'rise': ['rose', 'risen'], 'fall': ['fell', 'fallen'], 'beat': ['beat', 'beaten']}
+
+# One-syllable words ending consonant-vowel-consonant double the consonant ('drop' -> 'dropped')
+_DOUBLES_FINAL = re.compile(r'^[^aeiou]*[aeiou][^aeiouwxy]$')
+
+
+def inflections(word):
+    """
+    A keyword and its inflected forms
+
+    Examples:
+        'drop' -> drop, drops, dropped, dropping
+        'rise' -> rise, rises, rising, rose, risen
+        'high' -> high, higher, highest
+    """
+    if word in UNINFLECTED:
+        return {word}
+    if word in ADJECTIVES:
+        return {word, word + 'er', word + 'est'}
+    forms = {word, word + ('es' if word.endswith(('s', 'sh', 'ch', 'x')) else 's')}
+    if word in NOUNS:
+        return forms
+    if word.endswith('e'):
+        stem, past = word[:-1], [word + 'd']
+    else:
+        stem = word + word[-1] if _DOUBLES_FINAL.match(word) else word
+        past = [stem + 'ed']
+    forms.add(stem + 'ing')
+    forms.update(IRREGULAR_PAST.get(word, past))
+    return forms
+
+
+# Every form of every keyword -> +1 (bullish) / -1 (bearish)
+LEXICON = {form: 1 for word in POSITIVE_KEYWORDS for form in inflections(word)}
+LEXICON.update({form: -1 for word in NEGATIVE_KEYWORDS for form in inflections(word)})
+
+# Longest alternatives first so 'underperform' wins over shorter overlaps
+_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(word) for word in sorted(LEXICON, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+
+# Payload when there is no news to score
+NEUTRAL_SENTIMENT = {
+    'sentiment': 'NEUTRAL',
+    'sentiment_class': 'neutral',
+    'score': 0,
+    'bullish_percent': 50,
+    'bearish_percent': 50,
+    'buzz_articles': 0,
+    'buzz_score': 0
+}
+
+
+def score_text(text):
+    """
+    Count lexicon hits in a text
+
+    Returns:
+        tuple: (positive_count, negative_count)
+    """
+    positive = negative = 0
+    for word in _PATTERN.findall(text):
+        if LEXICON[word.lower()] > 0:
+            positive += 1
+        else:
+            negative += 1
+    return positive, negative
+
+
+def article_text(article):
+    return f"{article.get('headline', '')}\n{article.get('summary', '')}"
+
+
+def score_articles(articles):
+    """
+    Total lexicon hits over a list of news articles (headline + summary)
+
+    The articles are joined and scanned in one pass.
+
+    Returns:
+        tuple: (positive_count, negative_count)
+    """
+    return score_text('\n'.join(article_text(article) for article in articles))
+
+
+def summarize_sentiment(positive_count, negative_count, article_count):
+    """
+    Turn keyword counts into the sentiment payload served by /api/sentiment
+
+    Returns:
+        dict: sentiment label/class, score, bullish/bearish percent and buzz
+    """
+    total = positive_count + negative_count
+    if total == 0:
+        bullish_percent = 50
+        bearish_percent = 50
+    else:
+        bullish_percent = (positive_count / total) * 100
+        bearish_percent = (negative_count / total) * 100
+
+    score = (bullish_percent - bearish_percent) / 100
+
+    # Determine sentiment label
+    if score > 0.2:
+        sentiment_label = 'STRONG BUY'
+        sentiment_class = 'positive'
+    elif score > 0:
+        sentiment_label = 'BUY'
+        sentiment_class = 'positive'
+    elif score > -0.2:
+        sentiment_label = 'HOLD'
+        sentiment_class = 'neutral'
+    else:
+        sentiment_label = 'SELL'
+        sentiment_class = 'negative'
+
+    return {
+        'sentiment': sentiment_label,
+        'sentiment_class': sentiment_class,
+        'score': round(score, 2),
+        'bullish_percent': round(bullish_percent, 2),
+        'bearish_percent': round(bearish_percent, 2),
+        'buzz_articles': article_count,
+        'buzz_score': min(article_count / 10, 1.0)
+    }
+
+
+def count_news_batch(news_by_ticker):
+    """
+    Lexicon hits for many tickers' news in one scan
+
+    All articles are joined into a single text; each match is attributed to
+    its ticker by offset.
+
+    Returns:
+        dict: ticker -> (positive_count, negative_count)
+    """
+    tickers = list(news_by_ticker)
+    parts, offsets, position = [], [], 0
+    for ticker in tickers:
+        text = '\n'.join(article_text(article) for article in news_by_ticker[ticker])
+        offsets.append(position)
+        parts.append(text)
+        position += len(text) + 1
+    counts = [[0, 0] for _ in tickers]
+    for match in _PATTERN.finditer('\n'.join(parts)):
+        index = bisect_right(offsets, match.start()) - 1
+        counts[index][0 if LEXICON[match.group(1).lower()] > 0 else 1] += 1
+    return {ticker: tuple(count) for ticker, count in zip(tickers, counts)}
+
+
+def score_news_batch(news_by_ticker):
+    """
+    Sentiment for many tickers' news in one call, plus the aggregate over all of them
+
+    Args:
+        news_by_ticker (dict): ticker -> list of articles
+
+    Returns:
+        tuple: ({ticker: sentiment payload}, aggregate payload) (see summarize_sentiment)
+    """
+    counts = count_news_batch(news_by_ticker)
+    results = {}
+    for ticker, articles in news_by_ticker.items():
+        if articles:
+            results[ticker] = summarize_sentiment(*counts[ticker], len(articles))
+        else:
+            results[ticker] = dict(NEUTRAL_SENTIMENT)
+
+    article_count = sum(len(articles) for articles in news_by_ticker.values())
+    if not article_count:
+        return results, dict(NEUTRAL_SENTIMENT)
+    positive = sum(count[0] for count in counts.values())
+    negative = sum(count[1] for count in counts.values())
+    return results, summarize_sentiment(positive, negative, article_count)
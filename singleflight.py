@@ -0,0 +1,69 @@
+"""
+Singleflight
+Coalesces concurrent identical calls into one execution: while a call for a
+key is in flight, later callers with the same key wait for it and share its
+result (or exception) instead of repeating the work
+
+Used at two levels:
+    stock_api  - one upstream fetch per cache key (see stale_while_revalidate)
+    route      - one fetch -> indicators -> inference pipeline per
+                 ticker/horizon for concurrent /api/stock_data requests
+
+Coalescing is per worker process; across workers the shared cache and its
+refresh locks keep duplicate upstream work down. Calls are counted in
+singleflight_calls_total by group and result (leader = executed, shared =
+coalesced).
+"""
+import threading
+from concurrent.futures import Future
+
+from metrics import metrics
+
+
+class SingleFlight:
+    """
+    Per-process call coalescing for one group of calls (thread-safe)
+
+    Args:
+        group: Label for metrics
+        copy: Optional callable applied to the result handed to waiting
+            callers, for results the callers may mutate (e.g. DataFrames)
+    """
+
+    def __init__(self, group, copy=None):
+        self.group = group
+        self.copy = copy
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Return fn()'s result, sharing one execution among concurrent callers with the same key"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            metrics.inc('singleflight_calls_total', group=self.group, result='shared')
+            value = future.result()
+            return self.copy(value) if self.copy else value
+
+        metrics.inc('singleflight_calls_total', group=self.group, result='leader')
+        try:
+            value = fn()
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            raise
+        self._forget(key)
+        future.set_result(value)
+        return value
+
+    def _forget(self, key):
+        # Before the result is published, so later callers start a fresh call
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def in_flight(self):
+        return len(self._calls)
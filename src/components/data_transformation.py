@@ -1,40 +1,200 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 import joblib
+import hashlib
+import json
 import os
+from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Datasets live in FEATURES_DIR/<name>/: one plain float32 .npy of scaled
+# rows per split (memory-mappable, never pickled), the fitted scaler and a
+# manifest.json describing them. Windows are not stored: they are cut from
+# the rows on demand (create_sequences / window_dataset).
+FEATURES_DIR = os.path.join('artifacts', 'features')
+DATASET_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+SCALER_NAME = 'scaler.pkl'
+
+
+def save_features(path, features):
+    """
+    Write scaled feature rows as a float32 .npy file (atomically) and return it memory-mapped
+    
+    Args:
+        path: Destination .npy path
+        features: 2D array (rows, features), first column is the target
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, np.asarray(features, dtype=np.float32))
+    os.replace(tmp_path, path)
+    return load_features(path)
+
+
+def load_features(path):
+    """Feature rows from save_features, memory-mapped read-only"""
+    return np.load(path, mmap_mode='r')
+
+
+def dataset_dir(name, features_dir=FEATURES_DIR):
+    """Directory of the dataset called name"""
+    return os.path.join(features_dir, name)
+
+
+def source_fingerprint(*arrays):
+    """Hash of the unscaled source rows a dataset was built from"""
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def save_dataset(directory, splits, scaler, seq_length=60, fingerprint=None):
+    """
+    Write a dataset: one .npy per split, the scaler and manifest.json (written last)
+    
+    Args:
+        directory: Dataset directory
+        splits: {split name: scaled 2D rows}, first column is the target
+        scaler: Fitted scaler the rows were scaled with
+        seq_length: Window length the rows are meant to be cut into
+        fingerprint: source_fingerprint of the unscaled rows
+    
+    Returns:
+        dict: {split name: rows memory-mapped read-only}
+    """
+    features = {name: save_features(os.path.join(directory, f'{name}.npy'), rows) for name, rows in splits.items()}
+    joblib.dump(scaler, os.path.join(directory, SCALER_NAME))
+    manifest = {
+        'format_version': DATASET_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'seq_length': seq_length,
+        'target_column': 0,
+        'scaler': SCALER_NAME,
+        'source_fingerprint': fingerprint,
+        'splits': {
+            name: {
+                'file': f'{name}.npy',
+                'shape': list(rows.shape),
+                'dtype': str(rows.dtype),
+                'windows': max(len(rows) - seq_length, 0)
+            }
+            for name, rows in features.items()
+        }
+    }
+    tmp_path = os.path.join(directory, f'{MANIFEST_NAME}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+    return features
+
+
+def load_dataset(directory):
+    """
+    Read a dataset written by save_dataset
+    
+    Returns:
+        tuple: (manifest dict, {split name: rows memory-mapped read-only})
+    
+    Raises:
+        ValueError: Unknown format version, or a split that does not match the manifest
+    """
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != DATASET_FORMAT_VERSION:
+        raise ValueError(f"Unsupported dataset format {manifest.get('format_version')} in {directory}")
+    splits = {}
+    for name, info in manifest['splits'].items():
+        rows = load_features(os.path.join(directory, info['file']))
+        if list(rows.shape) != info['shape'] or str(rows.dtype) != info['dtype']:
+            raise ValueError(f"Split {name} in {directory} does not match its manifest")
+        splits[name] = rows
+    return manifest, splits
+
+
+def load_dataset_scaler(directory, manifest):
+    """The scaler a dataset's rows were scaled with"""
+    return joblib.load(os.path.join(directory, manifest['scaler']))
+
+
 class DataTransformation:
     def __init__(self):
         self.scaler = MinMaxScaler()
+    
+    def transform(self, train_data, test_data, name='stock', features_dir=FEATURES_DIR, scaler=None, seq_length=60):
+        """
+        Scale train/test rows (scaler fitted on train) into a memory-mapped dataset
+        
+        Windows are not built here: train from the returned rows with
+        window_dataset.window_dataset, which cuts them lazily per batch.
+        
+        Args:
+            train_data: DataFrame or 2D array of training rows, first column is the target
+            test_data: DataFrame or 2D array of test rows
+            name: Dataset name (e.g. the ticker), see dataset_dir
+            features_dir: Parent directory of the datasets
+            scaler: Already fitted scaler to reuse (e.g. to fine-tune the
+                model it was trained with); fitted on train_data if None
+            seq_length: Window length recorded in the manifest
+        
+        Returns:
+            tuple: (train features, test features, scaler); features are
+            float32 arrays memory-mapped read-only
+        """
+        train_rows = np.asarray(train_data, dtype=np.float64)
+        test_rows = np.asarray(test_data, dtype=np.float64)
+        if scaler is not None:
+            self.scaler = scaler
+            train_scaled = self.scaler.transform(train_rows)
+        else:
+            train_scaled = self.scaler.fit_transform(train_rows)
+        test_scaled = self.scaler.transform(test_rows)
+        features = save_dataset(
+            dataset_dir(name, features_dir),
+            {'train': train_scaled, 'test': test_scaled},
+            self.scaler, seq_length, source_fingerprint(train_rows, test_rows)
+        )
+        return features['train'], features['test'], self.scaler
         
     def create_sequences(self, data, seq_length=60):
-        X, y = [], []
-        for i in range(len(data) - seq_length):
-            X.append(data[i:i+seq_length])
-            y.append(data[i+seq_length, 0])
-        return np.array(X), np.array(y)
-    
-    def initiate_data_transformation(self, train_path, test_path):
-        os.makedirs('artifacts', exist_ok=True)
+        """
+        Windows of seq_length rows, each labelled with the first column of the next row
+        
+        X is a read-only strided view of data, shape (N, seq_length, features):
+        no window is copied, so it costs no memory beyond data itself. Take
+        np.array(X) where a contiguous copy is really needed.
         
+        Returns:
+            tuple: (X, y) with N = len(data) - seq_length
+        """
+        data = np.asarray(data)
+        count = max(len(data) - seq_length, 0)
+        if count == 0:
+            return np.empty((0, seq_length) + data.shape[1:], dtype=data.dtype), data[:0, 0]
+        # sliding_window_view puts the window axis last: (N, features, seq_length)
+        X = sliding_window_view(data, seq_length, axis=0)[:count].swapaxes(1, 2)
+        y = data[seq_length:seq_length + count, 0]
+        return X, y
+    
+    def initiate_data_transformation(self, train_path, test_path, name='stock'):
+        """Build the dataset called name from the train/test CSVs; returns its directory"""
         train_data = pd.read_csv(train_path).values
         test_data = pd.read_csv(test_path).values
         
-        train_scaled = self.scaler.fit_transform(train_data)
-        test_scaled = self.scaler.transform(test_data)
-        
-        X_train, y_train = self.create_sequences(train_scaled)
-        X_test, y_test = self.create_sequences(test_scaled)
-        
-        np.save('artifacts/processed_train.npy', {'X': X_train, 'y': y_train})
-        np.save('artifacts/processed_test.npy', {'X': X_test, 'y': y_test})
+        self.transform(train_data, test_data, name=name)
         joblib.dump(self.scaler, 'artifacts/scaler.pkl')
         
-        return X_train, y_train, X_test, y_test
+        return dataset_dir(name)
 
 if __name__ == "__main__":
     obj = DataTransformation()
@@ -8,6 +8,8 @@ import os
 import mlflow
 import mlflow.tensorflow
 from dotenv import load_dotenv
+from src.components.data_transformation import dataset_dir, load_dataset
+from src.components.window_dataset import as_sources, window_dataset, window_targets
 
 load_dotenv()
 
@@ -28,23 +30,67 @@ class ModelTrainer:
         ])
         self.model.compile(optimizer='adam', loss='mean_squared_error', metrics=['mae'])
         
-    def train(self, X_train, y_train, X_test, y_test, epochs=100, batch_size=32):
-        self.build_model((X_train.shape[1], X_train.shape[2]))
+    def train_model(self, train_features, val_features, epochs=50, batch_size=32, callbacks=None, seq_length=60):
+        """
+        Train on windows streamed from scaled feature rows
         
+        Windows are cut per batch from the (memory-mapped) rows inside a
+        tf.data pipeline, so memory stays bounded however many rows or
+        tickers are passed.
+        
+        Args:
+            train_features: Feature rows of one ticker, or a list of them for several
+            val_features: Validation rows, same form
+            epochs: Maximum training epochs
+            batch_size: Windows per batch
+            callbacks: Keras callbacks
+            seq_length: Rows per window
+        
+        Returns:
+            tuple: (model, history)
+        """
+        feature_count = as_sources(train_features)[0].shape[1]
+        self.build_model((seq_length, feature_count))
+        history = self.model.fit(
+            window_dataset(train_features, seq_length, batch_size, shuffle=True),
+            validation_data=window_dataset(val_features, seq_length, batch_size),
+            epochs=epochs, callbacks=callbacks or [], verbose=1
+        )
+        return self.model, history
+        
+    def fine_tune(self, model, train_features, val_features, epochs=5, batch_size=32, callbacks=None, seq_length=60):
+        """
+        Continue training an already trained model (warm start) on streamed windows
+        
+        Args: as train_model, plus the compiled model to continue from
+        
+        Returns:
+            tuple: (model, history)
+        """
+        self.model = model
+        history = self.model.fit(
+            window_dataset(train_features, seq_length, batch_size, shuffle=True),
+            validation_data=window_dataset(val_features, seq_length, batch_size),
+            epochs=epochs, callbacks=callbacks or [], verbose=1
+        )
+        return self.model, history
+        
+    def train(self, train_features, test_features, epochs=100, batch_size=32, seq_length=60):
         # Add early stopping to prevent overfitting
         from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
         early_stop = EarlyStopping(monitor='val_loss', patience=15, restore_best_weights=True)
         reduce_lr = ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=5, min_lr=0.00001)
         
-        history = self.model.fit(X_train, y_train, epochs=epochs, batch_size=batch_size, 
-                                validation_data=(X_test, y_test), verbose=1,
-                                callbacks=[early_stop, reduce_lr])
+        _, history = self.train_model(train_features, test_features, epochs=epochs, batch_size=batch_size,
+                                      callbacks=[early_stop, reduce_lr], seq_length=seq_length)
         
-        predictions = self.model.predict(X_test)
-        mse = mean_squared_error(y_test, predictions)
+        predictions = self.model.predict(window_dataset(test_features, seq_length, batch_size))
+        mse = mean_squared_error(window_targets(test_features, seq_length), predictions)
         
         os.makedirs('artifacts', exist_ok=True)
-        self.model.save('artifacts/stock_lstm_model.h5')
+        # Replace the served artifact atomically: web workers reload it when it changes
+        self.model.save('artifacts/stock_lstm_model.tmp.h5')
+        os.replace('artifacts/stock_lstm_model.tmp.h5', 'artifacts/stock_lstm_model.h5')
         with open('artifacts/model_metrics.json', 'w') as f:
             json.dump({'mse': mse, 'history': history.history}, f)
         
@@ -53,14 +99,10 @@ class ModelTrainer:
         
         return mse
     
-    def initiate_model_training(self):
-        train_data = np.load('artifacts/processed_train.npy', allow_pickle=True).item()
-        test_data = np.load('artifacts/processed_test.npy', allow_pickle=True).item()
-        
-        X_train, y_train = train_data['X'], train_data['y']
-        X_test, y_test = test_data['X'], test_data['y']
+    def initiate_model_training(self, name='stock'):
+        manifest, splits = load_dataset(dataset_dir(name))
         
-        mse = self.train(X_train, y_train, X_test, y_test)
+        mse = self.train(splits['train'], splits['test'], seq_length=manifest['seq_length'])
         print(f"Model trained with MSE: {mse}")
         
         return mse
@@ -0,0 +1,88 @@
+"""
+Window Dataset
+Streaming tf.data input for the LSTM: scaled feature rows stay in
+memory-mapped .npy files and each batch of (seq_length, features) windows is
+cut from them only when the model asks for it
+
+Only the window index (ticker, start row) is held in memory, so multi-ticker
+datasets larger than RAM train with memory bounded by the batch size, the
+prefetch depth and the OS page cache. The target of a window is the first
+column (scaled Close) of the row after it, as in
+DataTransformation.create_sequences.
+"""
+import numpy as np
+import tensorflow as tf
+
+from src.components.data_transformation import DataTransformation
+
+SHUFFLE_BUFFER = 1_000_000  # window indices (ticker, start) kept in the shuffle buffer
+
+
+def as_sources(sources):
+    """A single feature array, or a list of them, as a list"""
+    if isinstance(sources, np.ndarray) and sources.ndim == 2:
+        return [sources]
+    return list(sources)
+
+
+def window_index(sources, seq_length=60):
+    """(ticker ids, start rows) of every window in sources"""
+    counts = [max(len(features) - seq_length, 0) for features in sources]
+    ticker_ids = np.repeat(np.arange(len(sources), dtype=np.int32), counts)
+    starts = np.concatenate([np.arange(count, dtype=np.int64) for count in counts]) if counts else np.empty(0, np.int64)
+    return ticker_ids, starts
+
+
+def window_dataset(sources, seq_length=60, batch_size=32, shuffle=False, seed=None):
+    """
+    tf.data pipeline of (X_batch, y_batch) windows read lazily from feature arrays
+
+    Args:
+        sources: One feature array per ticker (memory-mapped by
+            DataTransformation.transform, or any 2D array), all with the
+            same feature count
+        seq_length: Rows per window
+        batch_size: Windows per batch
+        shuffle: Reshuffle windows (across tickers) every epoch
+        seed: Seed for the shuffle order
+
+    Returns:
+        tf.data.Dataset of (float32 [batch, seq_length, features], float32 [batch])
+    """
+    sources = as_sources(sources)
+    feature_count = sources[0].shape[1]
+    transformation = DataTransformation()
+    windows = [transformation.create_sequences(features, seq_length) for features in sources]
+
+    def load_batch(ticker_ids, starts):
+        X = np.empty((len(starts), seq_length, feature_count), dtype=np.float32)
+        y = np.empty(len(starts), dtype=np.float32)
+        for ticker_id in np.unique(ticker_ids):
+            rows = ticker_ids == ticker_id
+            ticker_X, ticker_y = windows[ticker_id]
+            # Fancy indexing the strided view copies just these windows out of the file
+            X[rows] = ticker_X[starts[rows]]
+            y[rows] = ticker_y[starts[rows]]
+        return X, y
+
+    def to_tensors(ticker_ids, starts):
+        X, y = tf.numpy_function(load_batch, [ticker_ids, starts], [tf.float32, tf.float32])
+        X.set_shape([None, seq_length, feature_count])
+        y.set_shape([None])
+        return X, y
+
+    ticker_ids, starts = window_index(sources, seq_length)
+    dataset = tf.data.Dataset.from_tensor_slices((ticker_ids, starts))
+    if shuffle:
+        dataset = dataset.shuffle(min(len(starts), SHUFFLE_BUFFER) or 1, seed=seed, reshuffle_each_iteration=True)
+    return (dataset
+            .batch(batch_size)
+            .map(to_tensors, num_parallel_calls=tf.data.AUTOTUNE)
+            .prefetch(tf.data.AUTOTUNE))
+
+
+def window_targets(sources, seq_length=60):
+    """Targets of every window in sources, in window_dataset's unshuffled order"""
+    transformation = DataTransformation()
+    targets = [transformation.create_sequences(features, seq_length)[1] for features in as_sources(sources)]
+    return np.concatenate(targets) if targets else np.empty(0, dtype=np.float32)
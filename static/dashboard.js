@@ -4,6 +4,9 @@ const dashboardState = {
 	days: 7,
 	latestData: null,
 	autoRefresh: null,
+	quoteStream: null,
+	quoteStreamRetryAt: 0,
+	suggestTimer: null,
 	charts: {
 		main: null,
 		technical: null,
@@ -45,6 +48,10 @@ function bindUI() {
 				handleSearch();
 			}
 		});
+		tickerInput.addEventListener('input', () => {
+			clearTimeout(dashboardState.suggestTimer);
+			dashboardState.suggestTimer = setTimeout(() => fetchSuggestions(tickerInput.value), 150);
+		});
 	}
 
 	const refreshBtn = document.getElementById('refreshBtn');
@@ -77,6 +84,32 @@ function bindUI() {
 }
 
 // ===== SEARCH =====
+async function fetchSuggestions(query) {
+	const datalist = document.getElementById('tickerSuggestions');
+	const trimmed = query.trim();
+	if (!datalist || !trimmed) {
+		return;
+	}
+
+	try {
+		const apiUrl = buildApiUrl(`/api/symbols/search?q=${encodeURIComponent(trimmed)}`);
+		const response = await fetch(apiUrl);
+		const data = await response.json();
+		if (!data.success) {
+			return;
+		}
+		datalist.innerHTML = '';
+		data.results.forEach(result => {
+			const option = document.createElement('option');
+			option.value = result.symbol;
+			option.label = `${result.name} (${result.exchange})`;
+			datalist.appendChild(option);
+		});
+	} catch (error) {
+		console.error('Symbol search error:', error);
+	}
+}
+
 function handleSearch() {
 	const tickerInput = document.getElementById('tickerInput');
 	const rawValue = tickerInput ? tickerInput.value.trim().toUpperCase() : '';
@@ -89,15 +122,20 @@ function handleSearch() {
 }
 
 // ===== FETCH CORE DATA =====
+// One request loads every panel: /api/dashboard streams newline-delimited
+// JSON, one line per panel as soon as it is ready, so news and sentiment can
+// render before the predictions are done.
 async function fetchStockData(ticker, days, options = {}) {
 	const { skipLoading = false, onComplete } = options;
 	const encodedTicker = encodeURIComponent(ticker);
-	const apiUrl = buildApiUrl(`/api/stock_data/${encodedTicker}?days=${days}&_=${Date.now()}`);
+	const apiUrl = buildApiUrl(`/api/dashboard/${encodedTicker}?days=${days}&stream=1&_=${Date.now()}`);
 
 	if (!skipLoading) {
 		showLoading();
 	}
 	hideError();
+	dashboardState.sentimentData = null;
+	dashboardState.indicators = null;
 
 	try {
 		const response = await fetch(apiUrl, { cache: 'no-cache' });
@@ -115,12 +153,7 @@ async function fetchStockData(ticker, days, options = {}) {
 			throw new Error(errorMessage);
 		}
 
-		const data = await response.json();
-		if (!data.success) {
-			throw new Error(data.error || 'Failed to fetch stock data');
-		}
-
-		updateDashboard(data);
+		await readNdjson(response, applyDashboardPanel);
 	} catch (error) {
 		console.error('Stock data fetch error:', error);
 		hideLoading();
@@ -139,6 +172,65 @@ async function fetchStockData(ticker, days, options = {}) {
 	}
 }
 
+function applyDashboardPanel({ panel, data }) {
+	const success = Boolean(data && data.success);
+	switch (panel) {
+		case 'stock_data':
+			if (!success) {
+				throw new Error((data && data.error) || 'Failed to fetch stock data');
+			}
+			updateDashboard(data);
+			break;
+		case 'news':
+			if (success && Array.isArray(data.news) && data.news.length > 0) {
+				displayNews(data.news);
+			} else {
+				displayNoNews();
+			}
+			break;
+		case 'sentiment':
+			if (success && data.sentiment) {
+				displaySentiment(data.sentiment);
+			}
+			break;
+		case 'technical':
+			if (success && data.indicators) {
+				displayTechnicalIndicators(data.indicators);
+			}
+			break;
+		default:
+			break;
+	}
+}
+
+async function readNdjson(response, onItem) {
+	const reader = response.body.getReader();
+	const decoder = new TextDecoder();
+	let buffer = '';
+
+	while (true) {
+		const { value, done } = await reader.read();
+		if (done) {
+			break;
+		}
+		buffer += decoder.decode(value, { stream: true });
+		let newline = buffer.indexOf('\n');
+		while (newline >= 0) {
+			const line = buffer.slice(0, newline).trim();
+			buffer = buffer.slice(newline + 1);
+			if (line) {
+				onItem(JSON.parse(line));
+			}
+			newline = buffer.indexOf('\n');
+		}
+	}
+
+	buffer += decoder.decode();
+	if (buffer.trim()) {
+		onItem(JSON.parse(buffer));
+	}
+}
+
 // ===== DASHBOARD UPDATE =====
 function updateDashboard(data) {
 	dashboardState.latestData = data;
@@ -154,14 +246,16 @@ function updateDashboard(data) {
 	updateHeadlineMetrics(data);
 	updateTradingSignal(data);
 
+	if (data.live_stream) {
+		startQuoteStream(data.ticker);
+	} else {
+		stopQuoteStream();
+	}
+
 	renderMainChart(data);
 	renderTechnicalChart(data.technical_chart);
 	renderVolumeChart(data.technical_chart);
 
-	fetchNews(data.ticker);
-	fetchSentiment(data.ticker);
-	fetchTechnicalIndicators(data.ticker);
-
 	hideLoading();
 
 	const dashboardContent = document.getElementById('dashboardContent');
@@ -686,10 +780,126 @@ function renderVolumeChart(technicalData) {
 function startAutoRefresh() {
 	stopAutoRefresh();
 	dashboardState.autoRefresh = setInterval(() => {
-		fetchStockData(dashboardState.ticker, dashboardState.days, { skipLoading: true });
+		fetchStockDelta(dashboardState.ticker, dashboardState.days);
 	}, 60000);
 }
 
+async function fetchStockDelta(ticker, days) {
+	const current = dashboardState.latestData;
+	if (!current || !current.cursor || current.ticker !== ticker || current.days_predicted !== days) {
+		fetchStockData(ticker, days, { skipLoading: true });
+		return;
+	}
+
+	const params = new URLSearchParams({
+		days: String(days),
+		since: current.cursor.last_bar,
+		model_version: current.cursor.model_version
+	});
+	const apiUrl = buildApiUrl(`/api/stock_data/${encodeURIComponent(ticker)}/delta?${params.toString()}`);
+
+	try {
+		const response = await fetch(apiUrl, { cache: 'no-cache' });
+		if (!response.ok) {
+			throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+		}
+
+		const delta = await response.json();
+		if (!delta.success) {
+			throw new Error(delta.error || 'Failed to fetch stock update');
+		}
+
+		if (delta.full_refresh) {
+			fetchStockData(ticker, days, { skipLoading: true });
+			return;
+		}
+
+		applyStockDelta(delta);
+	} catch (error) {
+		console.error('Stock delta fetch error:', error);
+	}
+}
+
+function mergePointSeries(existing, additions, limit) {
+	const merged = Array.isArray(existing) ? existing.filter(point => !additions.some(added => added.x === point.x)) : [];
+	merged.push(...additions);
+	merged.sort((a, b) => (a.x < b.x ? -1 : a.x > b.x ? 1 : 0));
+	return merged.slice(-limit);
+}
+
+function applyStockDelta(delta) {
+	const data = dashboardState.latestData;
+	if (!data || delta.ticker !== data.ticker) {
+		return;
+	}
+
+	const bars = delta.bars || {};
+	if (Array.isArray(bars.dates) && bars.dates.length) {
+		const technical = data.technical_chart || (data.technical_chart = {});
+		technical.candles = mergePointSeries(technical.candles, bars.candles || [], 60);
+		technical.volumes = mergePointSeries(technical.volumes, bars.volumes || [], 60);
+
+		const averages = technical.moving_averages || (technical.moving_averages = {});
+		const newAverages = bars.moving_averages || {};
+		averages.sma20 = mergePointSeries(averages.sma20, newAverages.sma20 || [], 60);
+		averages.sma50 = mergePointSeries(averages.sma50, newAverages.sma50 || [], 60);
+
+		const history = (data.chart_data.dates || []).map((date, index) => ({ x: date, y: data.chart_data.prices[index] }));
+		const mergedHistory = mergePointSeries(history, bars.dates.map((date, index) => ({ x: date, y: bars.prices[index] })), 30);
+		data.chart_data.dates = mergedHistory.map(point => point.x);
+		data.chart_data.prices = mergedHistory.map(point => point.y);
+	}
+
+	if (delta.quote) {
+		data.current_price = delta.quote.current_price;
+		data.day_change = delta.quote.day_change;
+		data.day_change_percent = delta.quote.day_change_percent;
+		if (delta.quote.volume !== undefined) {
+			data.volume = delta.quote.volume;
+		}
+	}
+
+	if (delta.predictions) {
+		data.days_predicted = delta.predictions.days_predicted;
+		data.predicted_price = delta.predictions.predicted_price;
+		data.predictions = delta.predictions.predictions;
+		data.chart_data.future_dates = delta.predictions.future_dates;
+		data.chart_data.future_prices = delta.predictions.future_prices;
+		data.chart_data.predicted_date = delta.predictions.predicted_date;
+		data.chart_data.predicted_price = delta.predictions.predicted_price;
+	}
+
+	// Profit/loss is relative to the live price, so it moves with every quote
+	const currentPrice = Number(data.current_price) || 0;
+	const predictedPrice = Number(data.predicted_price) || 0;
+	data.profit_loss = predictedPrice - currentPrice;
+	data.profit_loss_percent = currentPrice ? (data.profit_loss / currentPrice) * 100 : 0;
+	data.is_profit = data.profit_loss > 0;
+
+	if (delta.cursor) {
+		data.cursor = delta.cursor;
+	}
+	if (delta.timestamp) {
+		data.timestamp = delta.timestamp;
+	}
+
+	dashboardState.predictionSummary = {
+		currentPrice,
+		predictedPrice,
+		profitLoss: data.profit_loss,
+		profitLossPercent: data.profit_loss_percent
+	};
+
+	updateHeadlineMetrics(data);
+	updateTradingSignal(data);
+
+	if ((Array.isArray(bars.dates) && bars.dates.length) || delta.predictions) {
+		renderMainChart(data);
+		renderTechnicalChart(data.technical_chart);
+		renderVolumeChart(data.technical_chart);
+	}
+}
+
 function stopAutoRefresh() {
 	if (dashboardState.autoRefresh) {
 		clearInterval(dashboardState.autoRefresh);
@@ -697,6 +907,62 @@ function stopAutoRefresh() {
 	}
 }
 
+// ===== LIVE QUOTE STREAM =====
+const QUOTE_STREAM_RETRY_MS = 60000;
+
+function startQuoteStream(ticker) {
+	if (typeof EventSource === 'undefined') {
+		return;
+	}
+
+	const existing = dashboardState.quoteStream;
+	if (existing && existing.ticker === ticker) {
+		return;
+	}
+	stopQuoteStream();
+
+	// The server turned a stream away (all stream slots busy): keep polling for a while
+	if (Date.now() < dashboardState.quoteStreamRetryAt) {
+		return;
+	}
+
+	const source = new EventSource(buildApiUrl(`/api/stream/quotes?tickers=${encodeURIComponent(ticker)}`));
+	source.addEventListener('quote', event => {
+		let quote;
+		try {
+			quote = JSON.parse(event.data);
+		} catch (_) {
+			return;
+		}
+
+		applyStockDelta({
+			ticker: quote.ticker,
+			quote: {
+				current_price: Number(quote.current),
+				day_change: Number(quote.change),
+				day_change_percent: Number(quote.change_percent)
+			}
+		});
+	});
+
+	source.addEventListener('error', () => {
+		// A refused stream (e.g. 503) is closed for good; transient drops reconnect by themselves
+		if (source.readyState === EventSource.CLOSED) {
+			dashboardState.quoteStreamRetryAt = Date.now() + QUOTE_STREAM_RETRY_MS;
+			stopQuoteStream();
+		}
+	});
+
+	dashboardState.quoteStream = { ticker, source };
+}
+
+function stopQuoteStream() {
+	if (dashboardState.quoteStream) {
+		dashboardState.quoteStream.source.close();
+		dashboardState.quoteStream = null;
+	}
+}
+
 // ===== NEWS =====
 async function fetchNews(ticker, onComplete) {
 	const container = document.getElementById('newsContainer');
@@ -779,23 +1045,6 @@ function displayNoNews() {
 }
 
 // ===== SENTIMENT =====
-async function fetchSentiment(ticker) {
-	dashboardState.sentimentData = null;
-	applyTradingSignal();
-	try {
-		const encodedTicker = encodeURIComponent(ticker);
-		const apiUrl = buildApiUrl(`/api/sentiment/${encodedTicker}?_=${Date.now()}`);
-		const response = await fetch(apiUrl, { cache: 'no-cache' });
-		const data = await response.json();
-
-		if (data.success && data.sentiment) {
-			displaySentiment(data.sentiment);
-		}
-	} catch (error) {
-		console.error('Sentiment fetch error:', error);
-	}
-}
-
 function displaySentiment(sentiment) {
 	dashboardState.sentimentData = sentiment;
 
@@ -855,21 +1104,6 @@ function displaySentiment(sentiment) {
 }
 
 // ===== TECHNICAL INDICATORS =====
-async function fetchTechnicalIndicators(ticker) {
-	try {
-		const encodedTicker = encodeURIComponent(ticker);
-		const apiUrl = buildApiUrl(`/api/technical/${encodedTicker}`);
-		const response = await fetch(apiUrl, { cache: 'no-cache' });
-		const data = await response.json();
-
-		if (data.success && data.indicators) {
-			displayTechnicalIndicators(data.indicators);
-		}
-	} catch (error) {
-		console.error('Technical indicators fetch error:', error);
-	}
-}
-
 function displayTechnicalIndicators(indicators) {
 	dashboardState.indicators = indicators;
 
@@ -5,19 +5,280 @@ Provides reliable stock data access from cloud hosting
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
+import copy
+import functools
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from cache_backend import get_cache
+from circuit_breaker import CircuitOpenError, get_breaker
+from fundamentals import FundamentalsService
+from log_config import get_logger, sample
+from metrics import metrics
+from news_store import fetch_window, get_news_store
+from sentiment import NEUTRAL_SENTIMENT, score_articles, summarize_sentiment
+from singleflight import SingleFlight
+from symbols import remember_not_found
+
+logger = get_logger(__name__)
+
 # Load environment variables
 load_dotenv()
 
 TWELVE_DATA_API_KEY = os.getenv('TWELVE_DATA_API_KEY', 'fbbf800ba2694b4a8faf45c487de8342')
-BASE_URL = 'https://api.twelvedata.com'
+BASE_URL = os.getenv('TWELVE_DATA_BASE_URL', 'https://api.twelvedata.com')
 
 # Finnhub API Configuration
 FINNHUB_API_KEY = os.getenv('FINNHUB_API_KEY', 'd3ueuhhr01qil4apoka0d3ueuhhr01qil4apokag')
-FINNHUB_BASE_URL = 'https://finnhub.io/api/v1'
+FINNHUB_BASE_URL = os.getenv('FINNHUB_BASE_URL', 'https://finnhub.io/api/v1')
+
+# Per-call upstream timeout; the circuit breakers (circuit_breaker.py) stop a
+# struggling endpoint from costing this much on every request
+UPSTREAM_TIMEOUT = float(os.getenv('UPSTREAM_TIMEOUT', 10))  # seconds
+
+# Country whose listings make up the local symbol universe (symbols.py)
+SYMBOL_UNIVERSE_COUNTRY = os.getenv('SYMBOL_UNIVERSE_COUNTRY', 'United States')
+
+# Set when an upstream call on this thread failed (raised, 429/5xx or circuit
+# open), so the stale-while-revalidate layer can tell a fallback value from
+# real data
+_upstream_state = threading.local()
+
+
+def _http_get(url, params, timeout=None):
+    """
+    requests.get through the endpoint's circuit breaker, recording upstream
+    latency and outcome per provider and endpoint (see metrics.py)
+
+    Raises:
+        CircuitOpenError: The endpoint's breaker is open (a RequestException)
+    """
+    if url.startswith(FINNHUB_BASE_URL):
+        provider, endpoint = 'finnhub', url[len(FINNHUB_BASE_URL):]
+    else:
+        provider, endpoint = 'twelve_data', url[len(BASE_URL):]
+
+    breaker = get_breaker(provider, endpoint)
+    if not breaker.allow():
+        _upstream_state.failed = True
+        metrics.inc('upstream_requests_total', provider=provider, endpoint=endpoint, outcome='circuit_open')
+        raise CircuitOpenError(f'Circuit open for {provider} {endpoint}')
+
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        response = requests.get(url, params=params, timeout=timeout or UPSTREAM_TIMEOUT)
+        outcome = str(response.status_code)
+        return response
+    finally:
+        duration = time.perf_counter() - start
+        failed = outcome == 'error' or outcome == '429' or outcome.startswith('5')
+        if failed:
+            _upstream_state.failed = True
+        breaker.record(failed, duration)
+        metrics.observe('upstream_request_duration_seconds', duration, provider=provider, endpoint=endpoint)
+        metrics.inc('upstream_requests_total', provider=provider, endpoint=endpoint, outcome=outcome)
+
+
+# Stale-while-revalidate: the last good result of each call is kept in the
+# shared cache well past its freshness window. A stale hit is answered
+# immediately while one background refresh (deduplicated across workers)
+# probes the upstream; if the upstream is failing or its circuit is open,
+# callers keep getting the last known good data instead of a fallback.
+SWR_REFRESH_LOCK_TTL = 60  # seconds
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='swr-refresh')
+
+
+def _is_usable(value):
+    if value is None:
+        return False
+    if isinstance(value, pd.DataFrame):
+        return not value.empty
+    return True
+
+
+def _call_upstream(func, args, kwargs):
+    """Run func, returning (value, failed) where failed means an upstream call failed"""
+    outer_failed = getattr(_upstream_state, 'failed', False)
+    _upstream_state.failed = False
+    try:
+        value = func(*args, **kwargs)
+        failed = _upstream_state.failed
+    finally:
+        _upstream_state.failed = outer_failed or _upstream_state.failed
+    return value, failed
+
 
+def _copy_value(value):
+    return value.copy() if isinstance(value, pd.DataFrame) else copy.deepcopy(value)
+
+
+# Concurrent fetches of the same cache key share one upstream call; callers
+# that waited get their own copy of the result
+_upstream_flight = SingleFlight('stock_api', copy=lambda result: (_copy_value(result[0]), result[1]))
+
+
+def _fetch_coalesced(key, func, args, kwargs):
+    """
+    _call_upstream through the singleflight for key
+
+    Returns:
+        (value, ok) where ok means no upstream call failed and value is usable
+    """
+    value, failed = _upstream_flight.do(key, lambda: _call_upstream(func, args, kwargs))
+    if failed:
+        # Callers that shared another thread's call still see its failure
+        _upstream_state.failed = True
+    return value, not failed and _is_usable(value)
+
+
+def _store(cache, key, value, stale_ttl):
+    try:
+        cache.set_value(key, value, stale_ttl)
+        cache.set_value(f'{key}:at', time.time(), stale_ttl)
+    except Exception as e:
+        logger.warning("Cache write error for %s: %s", key, e)
+
+
+def _refresh(cache, key, func, args, kwargs, stale_ttl):
+    try:
+        value, ok = _fetch_coalesced(key, func, args, kwargs)
+        if ok:
+            _store(cache, key, value, stale_ttl)
+    except Exception as e:
+        logger.warning("Background refresh of %s failed: %s", key, e)
+    finally:
+        try:
+            cache.delete(f'{key}:refreshing')
+        except Exception:
+            pass
+
+
+def stale_while_revalidate(namespace, fresh_ttl, stale_ttl):
+    """
+    Serve a function's result from the shared cache, refreshing it in the background once stale
+
+    Args:
+        namespace: Cache key prefix (arguments are appended)
+        fresh_ttl: Seconds a result is served without a refresh
+        stale_ttl: Seconds a result is kept as the last known good value
+
+    The undecorated function stays available as `.uncached`, and
+    `.refresh(*args)` fetches and stores synchronously, returning (value, ok).
+    """
+    def decorator(func):
+        def make_key(args, kwargs):
+            return ':'.join(['swr', namespace, *map(str, args), *(f'{k}={v}' for k, v in sorted(kwargs.items()))])
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            cache = get_cache()
+            try:
+                entry = cache.get_values([key, f'{key}:at'])
+            except Exception as e:
+                logger.warning("Cache read error for %s: %s", key, e)
+                entry = {}
+
+            if key in entry:
+                if time.time() - float(entry.get(f'{key}:at') or 0) < fresh_ttl:
+                    metrics.inc('cache_requests_total', namespace=f'swr_{namespace}', result='fresh')
+                    return entry[key]
+                metrics.inc('cache_requests_total', namespace=f'swr_{namespace}', result='stale')
+                try:
+                    if cache.add(f'{key}:refreshing', b'1', SWR_REFRESH_LOCK_TTL):
+                        _refresh_executor.submit(_refresh, cache, key, func, args, kwargs, stale_ttl)
+                except Exception as e:
+                    logger.warning("Could not schedule refresh of %s: %s", key, e)
+                return entry[key]
+
+            metrics.inc('cache_requests_total', namespace=f'swr_{namespace}', result='miss')
+            value, ok = _fetch_coalesced(key, func, args, kwargs)
+            if ok:
+                _store(cache, key, value, stale_ttl)
+            return value
+
+        def refresh(*args, **kwargs):
+            key = make_key(args, kwargs)
+            value, ok = _fetch_coalesced(key, func, args, kwargs)
+            if ok:
+                _store(get_cache(), key, value, stale_ttl)
+            return value, ok
+
+        wrapper.uncached = func
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
+
+def _is_symbol_not_found(data):
+    """Whether a Twelve Data error payload says the symbol doesn't exist"""
+    return data.get('code') in (400, 404) and 'symbol' in str(data.get('message', '')).lower()
+
+
+def fetch_symbol_universe():
+    """
+    Every symbol Twelve Data lists for the configured country (reference data)
+    
+    Returns:
+        list: (symbol, name, exchange) tuples
+    """
+    url = f'{BASE_URL}/stocks'
+    params = {
+        'country': SYMBOL_UNIVERSE_COUNTRY,
+        'apikey': TWELVE_DATA_API_KEY
+    }
+    
+    response = _http_get(url, params, timeout=60)
+    response.raise_for_status()
+    data = response.json()
+    if data.get('status') == 'error':
+        raise ValueError(data.get('message', 'Unknown error'))
+    return [(item['symbol'], item.get('name', ''), item.get('exchange', '')) for item in data.get('data', [])]
+
+
+def _values_to_frame(values):
+    """
+    Convert Twelve Data time_series values into a yfinance-style DataFrame
+    
+    Args:
+        values (list): 'values' list from a time_series response
+    
+    Returns:
+        pd.DataFrame: Data indexed by datetime with [Open, High, Low, Close, Volume, Dividends, Stock Splits]
+    """
+    df = pd.DataFrame(values)
+    
+    # Convert datetime
+    df['datetime'] = pd.to_datetime(df['datetime'])
+    df.set_index('datetime', inplace=True)
+    df = df.sort_index()
+    
+    # Convert columns to float
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Rename columns to match yfinance format
+    df.rename(columns={
+        'open': 'Open',
+        'high': 'High',
+        'low': 'Low',
+        'close': 'Close',
+        'volume': 'Volume'
+    }, inplace=True)
+    
+    # Add Dividends and Stock Splits columns (set to 0 for compatibility)
+    df['Dividends'] = 0.0
+    df['Stock Splits'] = 0.0
+    
+    return df
+
+
+@stale_while_revalidate('history', fresh_ttl=60, stale_ttl=24 * 3600)
 def get_stock_history(ticker, days=60, interval='1day'):
     """
     Fetch historical stock data from Twelve Data API
@@ -32,7 +293,7 @@ def get_stock_history(ticker, days=60, interval='1day'):
         Returns empty DataFrame if request fails
     """
     try:
-        print(f" Fetching {ticker} data from Twelve Data API...")
+        logger.debug("Fetching %s data from Twelve Data API", ticker)
         
         url = f'{BASE_URL}/time_series'
         params = {
@@ -43,59 +304,108 @@ def get_stock_history(ticker, days=60, interval='1day'):
             'format': 'JSON'
         }
         
-        response = requests.get(url, params=params, timeout=30)
+        response = _http_get(url, params)
         response.raise_for_status()
         data = response.json()
         
         # Check for errors
         if 'status' in data and data['status'] == 'error':
-            print(f" API Error: {data.get('message', 'Unknown error')}")
+            logger.warning("Twelve Data error for %s: %s", ticker, data.get('message', 'Unknown error'))
+            if _is_symbol_not_found(data):
+                remember_not_found(ticker)
             return pd.DataFrame()
         
         if 'values' not in data:
-            print(f" No data returned for {ticker}")
+            logger.warning("No data returned for %s", ticker)
             return pd.DataFrame()
         
         # Convert to DataFrame
-        df = pd.DataFrame(data['values'])
-        
-        # Convert datetime
-        df['datetime'] = pd.to_datetime(df['datetime'])
-        df.set_index('datetime', inplace=True)
-        df = df.sort_index()
-        
-        # Convert columns to float
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Rename columns to match yfinance format
-        df.rename(columns={
-            'open': 'Open',
-            'high': 'High',
-            'low': 'Low',
-            'close': 'Close',
-            'volume': 'Volume'
-        }, inplace=True)
-        
-        # Add Dividends and Stock Splits columns (set to 0 for compatibility)
-        df['Dividends'] = 0.0
-        df['Stock Splits'] = 0.0
-        
-        print(f"Successfully fetched {len(df)} data points for {ticker}")
-        print(f"Date range: {df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}")
-        print(f"Latest price: ${df['Close'].iloc[-1]:.2f}")
+        df = _values_to_frame(data['values'])
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetched %d data points for %s (%s to %s, latest close %.2f)",
+                         len(df), ticker, df.index[0].date(), df.index[-1].date(), df['Close'].iloc[-1])
         
         return df
         
     except requests.exceptions.RequestException as e:
-        print(f"Network error fetching {ticker}: {e}")
+        logger.warning("Network error fetching %s: %s", ticker, e)
         return pd.DataFrame()
     except Exception as e:
-        print(f"Error processing {ticker} data: {e}")
+        logger.exception("Error processing %s data", ticker)
         return pd.DataFrame()
 
 
+# Twelve Data accepts comma-separated symbols on time_series; keep batches
+# small enough that one slow symbol doesn't hold up a whole watchlist
+BATCH_SYMBOLS_PER_REQUEST = 8
+
+
+def get_batch_stock_history(tickers, days=60, interval='1day'):
+    """
+    Fetch historical data for several tickers with one request per batch
+    
+    Args:
+        tickers (list): Stock symbols
+        days (int): Number of days of historical data (default: 60)
+        interval (str): Time interval (see get_stock_history)
+    
+    Returns:
+        dict: ticker -> pd.DataFrame (empty DataFrame for symbols that failed)
+    """
+    results = {}
+    for start in range(0, len(tickers), BATCH_SYMBOLS_PER_REQUEST):
+        results.update(_fetch_history_batch(tickers[start:start + BATCH_SYMBOLS_PER_REQUEST], days, interval))
+    return results
+
+
+def _fetch_history_batch(tickers, days, interval):
+    """Fetch one batch of symbols from time_series"""
+    if len(tickers) == 1:
+        return {tickers[0]: get_stock_history(tickers[0], days=days, interval=interval)}
+    
+    try:
+        logger.debug("Fetching batch %s from Twelve Data API", tickers)
+        
+        url = f'{BASE_URL}/time_series'
+        params = {
+            'symbol': ','.join(tickers),
+            'interval': interval,
+            'outputsize': min(days, 5000),
+            'apikey': TWELVE_DATA_API_KEY,
+            'format': 'JSON'
+        }
+        
+        response = _http_get(url, params)
+        response.raise_for_status()
+        data = response.json()
+        
+        if 'status' in data and data['status'] == 'error':
+            logger.warning("Twelve Data error for batch %s: %s", tickers, data.get('message', 'Unknown error'))
+            return {ticker: pd.DataFrame() for ticker in tickers}
+        
+        results = {}
+        for ticker in tickers:
+            entry = data.get(ticker) or {}
+            if entry.get('status') == 'error' or not entry.get('values'):
+                logger.warning("No data returned for %s", ticker)
+                if _is_symbol_not_found(entry):
+                    remember_not_found(ticker)
+                results[ticker] = pd.DataFrame()
+                continue
+            results[ticker] = _values_to_frame(entry['values'])
+        
+        logger.debug("Fetched batch of %d symbols", len(tickers))
+        return results
+        
+    except requests.exceptions.RequestException as e:
+        logger.warning("Network error fetching batch %s: %s", tickers, e)
+    except Exception as e:
+        logger.exception("Error processing batch %s", tickers)
+    return {ticker: pd.DataFrame() for ticker in tickers}
+
+
+@stale_while_revalidate('intraday', fresh_ttl=60, stale_ttl=3600)
 def get_intraday_data(ticker, interval='5min', outputsize=78):
     """
     Fetch intraday stock data - tries multiple intervals to get the best available data
@@ -113,7 +423,7 @@ def get_intraday_data(ticker, interval='5min', outputsize=78):
     
     for try_interval in intervals_to_try:
         try:
-            print(f"Fetching intraday data for {ticker} with {try_interval} interval...")
+            logger.debug("Fetching intraday data for %s with %s interval", ticker, try_interval)
             
             url = f'{BASE_URL}/time_series'
             params = {
@@ -124,12 +434,12 @@ def get_intraday_data(ticker, interval='5min', outputsize=78):
                 'format': 'JSON'
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = _http_get(url, params)
             response.raise_for_status()
             data = response.json()
             
             if 'values' not in data or not data['values']:
-                print(f"No data for {try_interval}, trying next interval...")
+                logger.debug("No %s intraday data for %s, trying next interval", try_interval, ticker)
                 continue
             
             # Convert to DataFrame
@@ -157,18 +467,22 @@ def get_intraday_data(ticker, interval='5min', outputsize=78):
             df_today = df[df.index.date == today]
             
             if not df_today.empty:
-                print(f"Fetched {len(df_today)} intraday data points for today ({try_interval})")
+                logger.debug("Fetched %d intraday data points for today (%s)", len(df_today), try_interval)
                 return df_today
             else:
-                print(f"Fetched {len(df)} recent intraday data points ({try_interval})")
+                logger.debug("Fetched %d recent intraday data points (%s)", len(df), try_interval)
                 return df
             
+        except CircuitOpenError as e:
+            # Every interval hits the same endpoint; don't try the rest
+            logger.info("Skipping intraday data for %s: %s", ticker, e)
+            break
         except Exception as e:
-            print(f"Error with {try_interval}: {e}")
+            logger.warning("Intraday %s fetch failed for %s: %s", try_interval, ticker, e)
             continue
     
     # If all intervals fail, return empty DataFrame
-    print(f"No intraday data available for {ticker}")
+    logger.info("No intraday data available for %s", ticker)
     return pd.DataFrame()
 
 
@@ -189,7 +503,7 @@ def get_real_time_price(ticker):
             'apikey': TWELVE_DATA_API_KEY
         }
         
-        response = requests.get(url, params=params, timeout=30)
+        response = _http_get(url, params)
         response.raise_for_status()
         data = response.json()
         
@@ -203,7 +517,7 @@ def get_real_time_price(ticker):
         }
         
     except Exception as e:
-        print(f" Error fetching real-time price: {e}")
+        logger.warning("Error fetching real-time price for %s: %s", ticker, e)
         return None
 
 
@@ -217,65 +531,13 @@ def get_stock_fundamentals(ticker):
     Returns:
         dict: Fundamental data including market cap, P/E ratio, company name
     """
-    try:
-        print(f" Fetching fundamentals for {ticker}...")
-        
-        # Get statistics endpoint for fundamentals
-        url = f'{BASE_URL}/statistics'
-        params = {
-            'symbol': ticker,
-            'apikey': TWELVE_DATA_API_KEY
-        }
-        
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        stats = response.json()
-        
-        # Get company profile/logo endpoint for company name
-        profile_url = f'{BASE_URL}/profile'
-        profile_params = {
-            'symbol': ticker,
-            'apikey': TWELVE_DATA_API_KEY
-        }
-        
-        profile_response = requests.get(profile_url, params=profile_params, timeout=30)
-        profile_data = {}
-        if profile_response.status_code == 200:
-            profile_data = profile_response.json()
-        
-        # Extract data
-        company_name = profile_data.get('name', ticker)
-        market_cap = stats.get('statistics', {}).get('valuations_metrics', {}).get('market_capitalization', None)
-        pe_ratio = stats.get('statistics', {}).get('valuations_metrics', {}).get('trailing_pe', None)
-        
-        # Also try from quote endpoint as fallback
-        if not market_cap or not pe_ratio:
-            quote_url = f'{BASE_URL}/quote'
-            quote_params = {
-                'symbol': ticker,
-                'apikey': TWELVE_DATA_API_KEY
-            }
-            quote_response = requests.get(quote_url, params=quote_params, timeout=30)
-            if quote_response.status_code == 200:
-                quote_data = quote_response.json()
-                if not company_name or company_name == ticker:
-                    company_name = quote_data.get('name', ticker)
-        
-        print(f"Fundamentals: {company_name}, Market Cap: {market_cap}, P/E: {pe_ratio}")
-        
-        return {
-            'company_name': company_name,
-            'market_cap': market_cap,
-            'pe_ratio': pe_ratio
-        }
-        
-    except Exception as e:
-        print(f"Error fetching fundamentals: {e}")
-        return {
-            'company_name': ticker,
-            'market_cap': None,
-            'pe_ratio': None
-        }
+    record = fundamentals_service.get(ticker)
+    return {
+        'company_name': record['name'],
+        # The record holds Finnhub's market cap in millions; this has always returned units
+        'market_cap': record['market_cap'] * 1e6 if record['market_cap'] else None,
+        'pe_ratio': record.get('trailing_pe')
+    }
 
 
 # Test function
@@ -299,61 +561,68 @@ if __name__ == "__main__":
 
 # ===== FINNHUB API FUNCTIONS =====
 
-def get_company_news(ticker, days=7):
+def _fetch_company_news(ticker, start_date, end_date):
+    """Raw Finnhub company news between two dates (raises on upstream errors)"""
+    url = f'{FINNHUB_BASE_URL}/company-news'
+    params = {
+        'symbol': ticker,
+        'from': start_date.strftime('%Y-%m-%d'),
+        'to': end_date.strftime('%Y-%m-%d'),
+        'token': FINNHUB_API_KEY
+    }
+    
+    response = _http_get(url, params)
+    response.raise_for_status()
+    return response.json() or []
+
+
+def get_company_news(ticker, days=7, limit=10):
     """
-    Fetch company news from Finnhub API
+    Company news from the local news store (news_store.py), synced
+    incrementally from Finnhub
     
     Args:
         ticker (str): Stock symbol
-        days (int): Number of days of news to fetch (default: 7)
+        days (int): Number of days of news to return (default: 7)
+        limit (int): Maximum number of articles, newest first (None for all)
     
     Returns:
         list: List of news articles with title, summary, url, source, image, and timestamp
     """
     try:
-        print(f"Fetching news for {ticker} from Finnhub...")
-        
-        # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        url = f'{FINNHUB_BASE_URL}/company-news'
-        params = {
-            'symbol': ticker,
-            'from': start_date.strftime('%Y-%m-%d'),
-            'to': end_date.strftime('%Y-%m-%d'),
-            'token': FINNHUB_API_KEY
-        }
-        
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        news_data = response.json()
-        
-        if not news_data:
-            print(f"No news found for {ticker}")
-            return []
-        
-        # Format news articles
-        news_articles = []
-        for article in news_data[:10]:  # Limit to 10 most recent
-            news_articles.append({
-                'headline': article.get('headline', 'No headline'),
-                'summary': article.get('summary', 'No summary available'),
-                'source': article.get('source', 'Unknown'),
-                'url': article.get('url', '#'),
-                'image': article.get('image', ''),
-                'datetime': datetime.fromtimestamp(article.get('datetime', 0)).strftime('%Y-%m-%d %H:%M'),
-                'timestamp': article.get('datetime', 0)
-            })
-        
-        print(f"Fetched {len(news_articles)} news articles for {ticker}")
+        store = get_news_store()
+        days = fetch_window(days)
+        added = store.sync(ticker, _fetch_company_news, days)
+        if added:
+            logger.debug("Stored %d new news articles for %s", added, ticker)
+        
+        news_articles = store.articles(ticker, days=days, limit=limit)
+        if not news_articles:
+            logger.info("No news found for %s", ticker)
         return news_articles
         
     except Exception as e:
-        print(f"Error fetching news from Finnhub: {e}")
+        logger.warning("Error reading news for %s: %s", ticker, e)
         return []
 
 
+# Concurrent news syncs for batch requests; Finnhub allows 30 calls a second
+NEWS_BATCH_THREADS = 8
+
+
+def get_batch_company_news(tickers, days=7, limit=None):
+    """
+    Company news for several tickers, syncing the news store concurrently
+    
+    Returns:
+        dict: ticker -> list of articles (see get_company_news)
+    """
+    with ThreadPoolExecutor(max_workers=min(NEWS_BATCH_THREADS, len(tickers) or 1)) as executor:
+        articles = executor.map(lambda ticker: get_company_news(ticker, days=days, limit=limit), tickers)
+        return dict(zip(tickers, articles))
+
+
+@stale_while_revalidate('sentiment', fresh_ttl=300, stale_ttl=24 * 3600)
 def get_sentiment_analysis(ticker):
     """
     Fetch sentiment analysis from Finnhub API
@@ -365,7 +634,7 @@ def get_sentiment_analysis(ticker):
         dict: Sentiment data including overall sentiment, score, and breakdown
     """
     try:
-        print(f"Fetching sentiment analysis for {ticker} from Finnhub...")
+        logger.debug("Fetching sentiment analysis for %s from Finnhub", ticker)
         
         # Get news sentiment
         url = f'{FINNHUB_BASE_URL}/news-sentiment'
@@ -374,11 +643,11 @@ def get_sentiment_analysis(ticker):
             'token': FINNHUB_API_KEY
         }
         
-        response = requests.get(url, params=params, timeout=30)
+        response = _http_get(url, params)
         
         # If news-sentiment not available, analyze company news
         if response.status_code != 200 or not response.json():
-            print("Using alternative sentiment calculation from news...")
+            logger.info("Finnhub sentiment unavailable, scoring news headlines instead", extra=sample(100))
             return calculate_sentiment_from_news(ticker)
         
         sentiment_data = response.json()
@@ -413,11 +682,11 @@ def get_sentiment_analysis(ticker):
             'buzz_score': buzz.get('buzz', 0)
         }
         
-        print(f"Sentiment: {sentiment_label} (Score: {overall_score:.2f})")
+        logger.debug("Sentiment for %s: %s (score %.2f)", ticker, sentiment_label, overall_score)
         return result
         
     except Exception as e:
-        print(f"Error fetching sentiment from Finnhub: {e}")
+        logger.warning("Error fetching sentiment for %s from Finnhub: %s", ticker, e)
         return calculate_sentiment_from_news(ticker)
 
 
@@ -432,86 +701,19 @@ def calculate_sentiment_from_news(ticker):
         dict: Calculated sentiment data
     """
     try:
-        news = get_company_news(ticker, days=7)
+        news = get_company_news(ticker, days=7, limit=None)
         
         if not news:
-            return {
-                'sentiment': 'NEUTRAL',
-                'sentiment_class': 'neutral',
-                'score': 0,
-                'bullish_percent': 50,
-                'bearish_percent': 50,
-                'buzz_articles': 0,
-                'buzz_score': 0
-            }
-        
-        # Simple sentiment analysis based on keywords
-        positive_keywords = ['surge', 'gain', 'profit', 'growth', 'high', 'beat', 'success', 'bullish', 'rise', 'up', 'strong', 'outperform']
-        negative_keywords = ['fall', 'loss', 'decline', 'low', 'miss', 'weak', 'bearish', 'down', 'drop', 'underperform']
-        
-        positive_count = 0
-        negative_count = 0
-        
-        for article in news:
-            headline_lower = article['headline'].lower()
-            summary_lower = article['summary'].lower()
-            text = headline_lower + ' ' + summary_lower
-            
-            for keyword in positive_keywords:
-                if keyword in text:
-                    positive_count += 1
-            
-            for keyword in negative_keywords:
-                if keyword in text:
-                    negative_count += 1
-        
-        total = positive_count + negative_count
-        if total == 0:
-            bullish_percent = 50
-            bearish_percent = 50
-        else:
-            bullish_percent = (positive_count / total) * 100
-            bearish_percent = (negative_count / total) * 100
+            return dict(NEUTRAL_SENTIMENT)
         
-        score = (bullish_percent - bearish_percent) / 100
-        
-        # Determine sentiment label
-        if score > 0.2:
-            sentiment_label = 'STRONG BUY'
-            sentiment_class = 'positive'
-        elif score > 0:
-            sentiment_label = 'BUY'
-            sentiment_class = 'positive'
-        elif score > -0.2:
-            sentiment_label = 'HOLD'
-            sentiment_class = 'neutral'
-        else:
-            sentiment_label = 'SELL'
-            sentiment_class = 'negative'
-        
-        return {
-            'sentiment': sentiment_label,
-            'sentiment_class': sentiment_class,
-            'score': round(score, 2),
-            'bullish_percent': round(bullish_percent, 2),
-            'bearish_percent': round(bearish_percent, 2),
-            'buzz_articles': len(news),
-            'buzz_score': min(len(news) / 10, 1.0)
-        }
+        return summarize_sentiment(*score_articles(news), len(news))
         
     except Exception as e:
-        print(f"Error calculating sentiment: {e}")
-        return {
-            'sentiment': 'NEUTRAL',
-            'sentiment_class': 'neutral',
-            'score': 0,
-            'bullish_percent': 50,
-            'bearish_percent': 50,
-            'buzz_articles': 0,
-            'buzz_score': 0
-        }
+        logger.warning("Error calculating sentiment for %s: %s", ticker, e)
+        return dict(NEUTRAL_SENTIMENT)
 
 
+@stale_while_revalidate('quote', fresh_ttl=15, stale_ttl=3600)
 def get_quote_data(ticker):
     """
     Get real-time quote data from Finnhub
@@ -523,7 +725,7 @@ def get_quote_data(ticker):
         dict: Real-time quote with current price, change, percent change, high, low, open, previous close
     """
     try:
-        print(f"Fetching real-time quote for {ticker} from Finnhub...")
+        logger.debug("Fetching real-time quote for %s from Finnhub", ticker)
         
         url = f'{FINNHUB_BASE_URL}/quote'
         params = {
@@ -531,7 +733,7 @@ def get_quote_data(ticker):
             'token': FINNHUB_API_KEY
         }
         
-        response = requests.get(url, params=params, timeout=30)
+        response = _http_get(url, params)
         response.raise_for_status()
         quote = response.json()
         
@@ -551,17 +753,103 @@ def get_quote_data(ticker):
             'timestamp': quote.get('t', int(datetime.now().timestamp()))
         }
         
-        print(f"Quote: ${current:.2f} ({change:+.2f}, {change_percent:+.2f}%)")
+        logger.debug("Quote for %s: %.2f (%+.2f, %+.2f%%)", ticker, current, change, change_percent)
         return result
         
     except Exception as e:
-        print(f"Error fetching quote from Finnhub: {e}")
+        logger.warning("Error fetching quote for %s from Finnhub: %s", ticker, e)
         return None
 
 
+def _fetch_company_profile(ticker):
+    """Finnhub company profile as fundamentals record fields (raises on upstream errors)"""
+    url = f'{FINNHUB_BASE_URL}/stock/profile2'
+    params = {
+        'symbol': ticker,
+        'token': FINNHUB_API_KEY
+    }
+    
+    response = _http_get(url, params)
+    response.raise_for_status()
+    profile = response.json() or {}
+    if not profile:
+        # Finnhub answers unknown symbols with {}: a failure, retried later and never stored
+        raise ValueError(f"empty company profile for {ticker}")
+    
+    return {
+        'name': profile.get('name') or None,
+        'market_cap': profile.get('marketCapitalization'),  # millions of the listing currency
+        'industry': profile.get('finnhubIndustry'),
+        'logo': profile.get('logo'),
+        'country': profile.get('country'),
+        'currency': profile.get('currency'),
+        'exchange': profile.get('exchange')
+    }
+
+
+def _first_number(values):
+    return next((float(val) for val in values if isinstance(val, (int, float)) and not pd.isna(val)), None)
+
+
+def _fetch_company_metrics(ticker):
+    """Finnhub fundamental metrics (P/E ratios, EPS) as fundamentals record fields (raises on upstream errors)"""
+    url = f'{FINNHUB_BASE_URL}/stock/metric'
+    params = {
+        'symbol': ticker,
+        'metric': 'all',
+        'token': FINNHUB_API_KEY
+    }
+
+    response = _http_get(url, params)
+    response.raise_for_status()
+    payload = response.json() or {}
+    metrics = payload.get('metric', {}) or {}
+    if not metrics:
+        raise ValueError(f"no fundamental metrics for {ticker}")
+
+    pe_ratio = _first_number([
+        metrics.get('peBasicExclExtraTTM'),
+        metrics.get('peBasicInclExtraTTM'),
+        metrics.get('peNormalizedAnnual'),
+        metrics.get('trailingPE'),
+        metrics.get('peTTM')
+    ])
+
+    eps = _first_number([
+        metrics.get('epsBasicExclExtraTTM'),
+        metrics.get('epsBasicInclExtraTTM'),
+        metrics.get('epsNormalizedAnnual'),
+        metrics.get('epsDilutedTTM')
+    ])
+
+    # Trailing twelve months P/E on diluted EPS, as Twelve Data's trailing_pe
+    # that get_stock_fundamentals served before
+    trailing_pe = _first_number([
+        metrics.get('peTTM'),
+        metrics.get('peExclExtraTTM'),
+        metrics.get('peInclExtraTTM')
+    ])
+
+    if pe_ratio is None:
+        logger.info("P/E ratio unavailable in Finnhub metrics for %s", ticker, extra=sample(50))
+
+    return {
+        'pe_ratio': pe_ratio,
+        'trailing_pe': trailing_pe,
+        'eps': eps
+    }
+
+
+# Profile and metrics are fetched together, once a day per ticker (fundamentals.py)
+fundamentals_service = FundamentalsService({
+    'profile': _fetch_company_profile,
+    'metrics': _fetch_company_metrics,
+})
+
+
 def get_company_profile(ticker):
     """
-    Get company profile from Finnhub
+    Get company profile (from the daily fundamentals record)
     
     Args:
         ticker (str): Stock symbol
@@ -569,99 +857,23 @@ def get_company_profile(ticker):
     Returns:
         dict: Company profile with name, market cap, industry, etc.
     """
-    try:
-        print(f"Fetching company profile for {ticker} from Finnhub...")
-        
-        url = f'{FINNHUB_BASE_URL}/stock/profile2'
-        params = {
-            'symbol': ticker,
-            'token': FINNHUB_API_KEY
-        }
-        
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        profile = response.json()
-        
-        result = {
-            'name': profile.get('name', ticker),
-            'ticker': profile.get('ticker', ticker),
-            'market_cap': profile.get('marketCapitalization', 0),
-            'industry': profile.get('finnhubIndustry', 'N/A'),
-            'logo': profile.get('logo', ''),
-            'country': profile.get('country', 'US'),
-            'currency': profile.get('currency', 'USD'),
-            'exchange': profile.get('exchange', 'NASDAQ')
-        }
-        
-        print(f"Company: {result['name']} ({result['industry']})")
-        return result
-        
-    except Exception as e:
-        print(f"Error fetching company profile from Finnhub: {e}")
-        return {
-            'name': ticker,
-            'ticker': ticker,
-            'market_cap': 0,
-            'industry': 'N/A',
-            'logo': '',
-            'country': 'US',
-            'currency': 'USD',
-            'exchange': 'NASDAQ'
-        }
+    record = fundamentals_service.get(ticker)
+    return {
+        'name': record['name'],
+        'ticker': ticker,
+        'market_cap': record['market_cap'],
+        'industry': record['industry'],
+        'logo': record['logo'],
+        'country': record['country'],
+        'currency': record['currency'],
+        'exchange': record['exchange']
+    }
 
 
 def get_company_metrics(ticker):
-    """Fetch fundamental metrics (including P/E ratio) from Finnhub."""
-    try:
-        print(f"Fetching fundamental metrics for {ticker} from Finnhub...")
-
-        url = f'{FINNHUB_BASE_URL}/stock/metric'
-        params = {
-            'symbol': ticker,
-            'metric': 'all',
-            'token': FINNHUB_API_KEY
-        }
-
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        payload = response.json() or {}
-        metrics = payload.get('metric', {}) or {}
-
-        pe_candidates = [
-            metrics.get('peBasicExclExtraTTM'),
-            metrics.get('peBasicInclExtraTTM'),
-            metrics.get('peNormalizedAnnual'),
-            metrics.get('trailingPE'),
-            metrics.get('peTTM')
-        ]
-
-        pe_ratio = next(
-            (float(val) for val in pe_candidates if isinstance(val, (int, float)) and not pd.isna(val)),
-            None
-        )
-
-        eps_candidates = [
-            metrics.get('epsBasicExclExtraTTM'),
-            metrics.get('epsBasicInclExtraTTM'),
-            metrics.get('epsNormalizedAnnual'),
-            metrics.get('epsDilutedTTM')
-        ]
-
-        eps = next(
-            (float(val) for val in eps_candidates if isinstance(val, (int, float)) and not pd.isna(val)),
-            None
-        )
-
-        print("Metrics retrieved" if pe_ratio is not None else "⚠️ P/E ratio unavailable from metrics response")
-
-        return {
-            'pe_ratio': pe_ratio,
-            'eps': eps
-        }
-
-    except Exception as exc:
-        print(f"Error fetching metrics from Finnhub: {exc}")
-        return {
-            'pe_ratio': None,
-            'eps': None
-        }
+    """Fundamental metrics (including P/E ratio) from the daily fundamentals record."""
+    record = fundamentals_service.get(ticker)
+    return {
+        'pe_ratio': record['pe_ratio'],
+        'eps': record['eps']
+    }
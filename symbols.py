@@ -0,0 +1,214 @@
+"""
+Symbol Universe
+Local list of tradable symbols with a prefix index for autocomplete, used to
+turn away typos and unknown tickers before they cost an upstream round trip
+
+- The universe is the refreshed list at SYMBOLS_PATH (written by
+  `python symbols.py --refresh` or the MLOps scheduler from Twelve Data's
+  /stocks reference data), or the seed fixture data/symbols.csv until one
+  exists.
+- The index is two sorted arrays (symbols, and lower-cased names) searched
+  with bisect, so a prefix lookup costs microseconds.
+- SYMBOL_VALIDATION decides what is rejected before any upstream call:
+      strict - symbols not in the universe
+      auto   - like strict once a refreshed (complete) universe is loaded;
+               with only the seed fixture, just malformed symbols
+      off    - nothing (not even symbols the upstream reported missing)
+- Symbols the upstream reported as not found are remembered in the shared
+  cache for NOT_FOUND_TTL and rejected until then.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from cache_backend import get_cache
+from log_config import get_logger
+from metrics import metrics
+
+logger = get_logger(__name__)
+
+SYMBOLS_PATH = os.getenv('SYMBOLS_PATH', os.path.join(tempfile.gettempdir(), 'vionex_symbols.json'))
+SYMBOLS_SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'symbols.csv')
+SYMBOL_VALIDATION = os.getenv('SYMBOL_VALIDATION', 'auto').lower()
+NOT_FOUND_TTL = 3600  # seconds
+RELOAD_CHECK_INTERVAL = 60  # seconds between checks for a refreshed universe
+MAX_RESULTS = 10
+
+SYMBOL_PATTERN = re.compile(r'^[A-Z0-9][A-Z0-9.\-]{0,14}$')
+
+
+class SymbolIndex:
+    """Sorted-array prefix index over (symbol, name, exchange) records"""
+
+    def __init__(self, records, complete=False):
+        by_symbol = {}
+        for symbol, name, exchange in records:
+            by_symbol.setdefault(symbol.upper(), (symbol.upper(), name, exchange))
+        self.records = sorted(by_symbol.values())
+        self.symbols = [record[0] for record in self.records]
+        names = sorted((record[1].lower(), i) for i, record in enumerate(self.records) if record[1])
+        self.names = [name for name, _ in names]
+        self.name_rows = [i for _, i in names]
+        self.complete = complete
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, symbol):
+        i = bisect_left(self.symbols, symbol)
+        return i < len(self.symbols) and self.symbols[i] == symbol
+
+    def search(self, query, limit=MAX_RESULTS):
+        """
+        Symbols starting with query, then companies whose name starts with it
+
+        Returns:
+            list: [{'symbol', 'name', 'exchange'}], an exact symbol match first
+        """
+        query = query.strip()
+        if not query:
+            return []
+        rows = []
+        symbol_prefix = query.upper()
+        i = bisect_left(self.symbols, symbol_prefix)
+        while i < len(self.symbols) and len(rows) < limit and self.symbols[i].startswith(symbol_prefix):
+            rows.append(i)
+            i += 1
+
+        name_prefix = query.lower()
+        i = bisect_left(self.names, name_prefix)
+        while i < len(self.names) and len(rows) < limit and self.names[i].startswith(name_prefix):
+            if self.name_rows[i] not in rows:
+                rows.append(self.name_rows[i])
+            i += 1
+
+        return [dict(zip(('symbol', 'name', 'exchange'), self.records[row])) for row in rows]
+
+
+def load_index(path=SYMBOLS_PATH, seed_path=SYMBOLS_SEED_PATH):
+    """The refreshed universe at path if there is one, else the seed fixture"""
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+        return SymbolIndex(stored['symbols'], complete=True)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Could not read symbol universe %s: %s", path, e)
+
+    with open(seed_path, newline='') as f:
+        return SymbolIndex(((row['symbol'], row['name'], row['exchange']) for row in csv.DictReader(f)))
+
+
+_index = None
+_index_mtime = None
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_symbol_index():
+    """Process-wide index, reloaded when SYMBOLS_PATH is refreshed"""
+    global _index, _index_mtime, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < RELOAD_CHECK_INTERVAL:
+        return _index
+    with _index_lock:
+        _checked_at = now
+        try:
+            mtime = os.path.getmtime(SYMBOLS_PATH)
+        except OSError:
+            mtime = None
+        if _index is None or mtime != _index_mtime:
+            _index = load_index()
+            _index_mtime = mtime
+            logger.info("Loaded %d symbols (%s)", len(_index), 'refreshed universe' if _index.complete else 'seed fixture')
+    return _index
+
+
+def _not_found_key(symbol):
+    return f'symbol_not_found:{symbol}'
+
+
+def remember_not_found(symbol):
+    """Record that the upstream has no data for symbol (rejected for NOT_FOUND_TTL)"""
+    if SYMBOL_VALIDATION == 'off':
+        return
+    try:
+        get_cache().set(_not_found_key(symbol), b'1', NOT_FOUND_TTL)
+    except Exception as e:
+        logger.warning("Could not cache unknown symbol %s: %s", symbol, e)
+
+
+def check_symbol(symbol):
+    """
+    Whether a ticker may be sent upstream
+
+    Returns:
+        None if it may, otherwise the reason it is rejected
+    """
+    if SYMBOL_VALIDATION == 'off':
+        return None
+    if not SYMBOL_PATTERN.match(symbol):
+        reason = 'malformed'
+    else:
+        index = get_symbol_index()
+        strict = SYMBOL_VALIDATION == 'strict' or index.complete
+        if strict and symbol not in index:
+            reason = 'unknown'
+        else:
+            try:
+                if get_cache().get(_not_found_key(symbol)) is None:
+                    return None
+            except Exception:
+                return None
+            reason = 'not_found'
+    metrics.inc('symbol_rejections_total', reason=reason)
+    return reason
+
+
+def refresh_universe(fetch, path=SYMBOLS_PATH):
+    """
+    Replace the stored universe with fetch()'s records
+
+    Args:
+        fetch: Callable() -> list of (symbol, name, exchange)
+
+    Returns:
+        int: Number of symbols stored
+    """
+    records = [list(record) for record in fetch()]
+    if not records:
+        raise ValueError('Upstream returned an empty symbol list')
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'updated_at': time.time(), 'symbols': records}, f)
+    os.replace(tmp_path, path)
+    logger.info("Stored %d symbols in %s", len(records), path)
+    return len(records)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Search or refresh the local symbol universe')
+    parser.add_argument('query', nargs='?', help='Prefix to search for')
+    parser.add_argument('--refresh', action='store_true', help='Download the universe from Twelve Data')
+    args = parser.parse_args()
+
+    if args.refresh:
+        from stock_api import fetch_symbol_universe
+        print(f"Stored {refresh_universe(fetch_symbol_universe)} symbols in {SYMBOLS_PATH}")
+    if args.query:
+        start = time.perf_counter()
+        results = get_symbol_index().search(args.query)
+        elapsed = (time.perf_counter() - start) * 1000
+        for result in results:
+            print(f"{result['symbol']:8s} {result['name']} ({result['exchange']})")
+        print(f"{len(results)} results in {elapsed:.3f} ms")
@@ -0,0 +1,201 @@
+"""
+Cache Backend Test Script
+Verifies cache_backend.py: the value encoding round trip, add/incr/TTL
+expiry on every backend (Redis only when REDIS_URL is reachable), the RESP
+reply parser, and that non-repeatable Redis commands are not re-sent after a
+failed read
+
+Run with pytest, or directly: python test_cache_backend.py
+"""
+
+import io
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache_backend import (
+    MemoryCacheBackend, SQLiteCacheBackend, RedisCacheBackend, REDIS_URL,
+    encode_value, decode_value
+)
+
+TTL = 0.3  # seconds, for expiry checks
+
+
+@lru_cache(maxsize=1)
+def redis_available():
+    backend = RedisCacheBackend(REDIS_URL, timeout=0.5)
+    try:
+        socket.create_connection((backend.host, backend.port), timeout=0.5).close()
+        return True
+    except OSError:
+        print(f" (redis checks skipped: nothing listening at {REDIS_URL})")
+        return False
+
+
+def backends():
+    """Every backend that can run here, each on an empty namespace"""
+    available = {
+        'memory': MemoryCacheBackend(),
+        'sqlite': SQLiteCacheBackend(os.path.join(tempfile.mkdtemp(), 'cache.sqlite3')),
+    }
+    if redis_available():
+        available['redis'] = RedisCacheBackend(REDIS_URL)
+    return available
+
+
+def prefix():
+    return f'test:{os.getpid()}:{time.time_ns()}:'
+
+
+def test_encoding_round_trip():
+    """Every payload tag (N/B/J/A/D) decodes back to the value encoded"""
+    assert decode_value(encode_value(None)) is None
+    assert decode_value(encode_value(b'\x00raw')) == b'\x00raw'
+    data = {'price': 1.5, 'tickers': ['AAPL', 'MSFT'], 'ok': True, 'none': None}
+    assert decode_value(encode_value(data)) == data
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    decoded = decode_value(encode_value(array))
+    assert decoded.dtype == array.dtype and np.array_equal(decoded, array)
+    frame = pd.DataFrame(
+        {'Close': [1.0, 2.5, np.nan], 'Volume': np.array([10, 20, 30], dtype=np.int64), 'Note': ['a', None, 'c']},
+        index=pd.DatetimeIndex(['2024-01-02', '2024-01-03', '2024-01-04'], name='Date')
+    )
+    pd.testing.assert_frame_equal(decode_value(encode_value(frame)), frame, check_dtype=False)
+    assert decode_value(encode_value(frame))['Volume'].dtype == np.int64
+
+
+def test_get_set_delete():
+    for name, cache in backends().items():
+        key = prefix() + 'value'
+        assert cache.get(key) is None, name
+        cache.set_value(key, {'a': 1}, 60)
+        assert cache.get_value(key) == {'a': 1}, name
+        assert cache.get_values([key, key + ':missing']) == {key: {'a': 1}}, name
+        cache.delete(key)
+        assert cache.get(key) is None, name
+
+
+def test_add():
+    """add only sets missing (or expired) keys"""
+    for name, cache in backends().items():
+        key = prefix() + 'lock'
+        assert cache.add(key, b'1', TTL) is True, name
+        assert cache.add(key, b'2', TTL) is False, name
+        assert cache.get(key) == b'1', name
+        time.sleep(TTL + 0.1)
+        assert cache.add(key, b'3', TTL) is True, name
+        assert cache.get(key) == b'3', name
+
+
+def test_ttl_expiry():
+    for name, cache in backends().items():
+        key = prefix() + 'expiring'
+        cache.set(key, b'x', TTL)
+        cache.set(key + ':kept', b'y', None)
+        assert cache.get(key) == b'x', name
+        time.sleep(TTL + 0.1)
+        assert cache.get(key) is None, name
+        assert cache.get(key + ':kept') == b'y', name
+
+
+def test_incr():
+    for name, cache in backends().items():
+        key = prefix() + 'counter'
+        assert cache.get_counter(key) == 0, name
+        assert [cache.incr(key) for _ in range(3)] == [1, 2, 3], name
+        assert cache.get_counter(key) == 3, name
+
+
+def test_resp_parser():
+    """RESP2 replies: simple, error, integer, bulk, null bulk, arrays"""
+    backend = RedisCacheBackend('redis://127.0.0.1:1/0')
+    read = lambda raw: backend._read(io.BytesIO(raw))
+    assert read(b'+OK\r\n') == b'OK'
+    assert read(b':42\r\n') == 42
+    assert read(b'$5\r\nhe\r\nl\r\n') == b'he\r\nl'
+    assert read(b'$0\r\n\r\n') == b''
+    assert read(b'$-1\r\n') is None
+    assert read(b'*3\r\n$1\r\na\r\n$-1\r\n:7\r\n') == [b'a', None, 7]
+    assert read(b'*-1\r\n') is None
+    for raw, error in ((b'-ERR wrong type\r\n', RuntimeError), (b'', ConnectionError), (b'?\r\n', RuntimeError)):
+        try:
+            read(raw)
+        except error:
+            continue
+        raise AssertionError(f'{raw!r} should raise {error.__name__}')
+
+
+class SilentRedis(socketserver.ThreadingTCPServer):
+    """Accepts commands and never answers, so every reply read times out"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.commands = []
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(handler):
+                while True:
+                    line = handler.rfile.readline()
+                    if not line:
+                        return
+                    args = []
+                    for _ in range(int(line[1:-2])):
+                        length = int(handler.rfile.readline()[1:-2])
+                        args.append(handler.rfile.read(length + 2)[:-2])
+                    self.commands.append(args[0].upper())
+
+        super().__init__(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+def test_no_resend_after_read_failure():
+    """A timed-out INCR or SET NX may have been applied: raise instead of re-sending"""
+    server = SilentRedis()
+    try:
+        backend = RedisCacheBackend(f'redis://127.0.0.1:{server.server_address[1]}/0', timeout=0.2)
+        for call, command in ((lambda: backend.incr('counter'), b'INCR'),
+                              (lambda: backend.add('lock', b'1', 5), b'SET'),
+                              (lambda: backend.get('key'), b'GET')):
+            server.commands.clear()
+            try:
+                call()
+            except OSError:
+                pass
+            else:
+                raise AssertionError(f'{command!r} should time out')
+            time.sleep(0.05)
+            expected = 2 if command == b'GET' else 1  # GET is safe to re-send
+            assert server.commands == [command] * expected, (command, server.commands)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_all_tests():
+    tests = [test_encoding_round_trip, test_get_set_delete, test_add, test_ttl_expiry, test_incr,
+             test_resp_parser, test_no_resend_after_read_failure]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f" {test.__name__} PASSED")
+        except AssertionError as e:
+            failed += 1
+            print(f" {test.__name__} FAILED: {e}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,111 @@
+"""
+News Store Test Script
+Verifies that concurrent syncs of a ticker in news_store.py fetch from the
+upstream once, including the ticker's first sync, and that an abandoned
+sync claim expires
+
+Run with pytest, or directly: python test_news_store.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import news_store
+from news_store import NewsStore
+
+
+class SlowFetch:
+    """Stand-in for the Finnhub fetch: counts calls and takes a while to answer"""
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, start_date, end_date):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return [{'id': 1, 'datetime': int(time.time()) - 60, 'headline': f'{ticker} news', 'url': 'https://example.com/1'}]
+
+
+def concurrent_syncs(store_paths, ticker, fetch):
+    """Sync ticker from one thread per store path at once; returns what each thread then reads"""
+    barrier = threading.Barrier(len(store_paths))
+    seen = [None] * len(store_paths)
+
+    def worker(i, path):
+        store = NewsStore(path)  # one store per thread, like separate worker processes
+        barrier.wait()
+        store.sync(ticker, fetch, days=7)
+        seen[i] = len(store.articles(ticker))
+
+    threads = [threading.Thread(target=worker, args=(i, path)) for i, path in enumerate(store_paths)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return seen
+
+
+def test_first_sync_is_exclusive():
+    """Concurrent first syncs fetch once; the others wait for it and read its articles"""
+    path = os.path.join(tempfile.mkdtemp(), 'news.sqlite3')
+    fetch = SlowFetch()
+    seen = concurrent_syncs([path] * 8, 'AAPL', fetch)
+    assert fetch.calls == 1, fetch.calls
+    assert seen == [1] * 8, seen
+
+
+def test_due_sync_is_exclusive():
+    """Concurrent syncs of a ticker that is due again fetch once"""
+    path = os.path.join(tempfile.mkdtemp(), 'news.sqlite3')
+    store = NewsStore(path, sync_interval=0)
+    store.sync('AAPL', SlowFetch(delay=0), days=7)
+    fetch = SlowFetch()
+    barrier = threading.Barrier(8)
+
+    def worker():
+        worker_store = NewsStore(path, sync_interval=0)
+        barrier.wait()
+        worker_store.sync('AAPL', fetch, days=7)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fetch.calls == 1, fetch.calls
+
+
+def test_abandoned_claim_expires():
+    """A claim whose worker died is taken over once SYNC_LEASE has passed"""
+    path = os.path.join(tempfile.mkdtemp(), 'news.sqlite3')
+    store = NewsStore(path)
+    now = time.time()
+    # Claimed by a worker that never finished
+    assert store._claim('AAPL', now, int(now - 86400)) is not None
+    assert store._claim('AAPL', now + 1, int(now - 86400)) == news_store.FIRST_SYNC_PENDING
+    assert store._claim('AAPL', now + news_store.SYNC_LEASE + 1, int(now - 86400)) not in (None, news_store.FIRST_SYNC_PENDING)
+
+
+def run_all_tests():
+    tests = [test_first_sync_is_exclusive, test_due_sync_is_exclusive, test_abandoned_claim_expires]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f" {test.__name__} PASSED")
+        except AssertionError as e:
+            failed += 1
+            print(f" {test.__name__} FAILED: {e}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,52 @@
+"""
+Sentiment Scoring Test Script
+Verifies keyword matching in sentiment.py: inflected forms count, words are
+matched whole
+
+Run with pytest, or directly: python test_sentiment.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sentiment import score_text
+
+
+def test_inflected_forms():
+    """Inflected forms count as their keyword"""
+    for text in ['Shares rising', 'Shares surging', 'Stock rose', 'Stock risen', 'Highest close', 'Stronger demand', 'Earnings beaten']:
+        assert score_text(text) == (1, 0), text
+    for text in ['Shares dropped', 'Shares dropping', 'Revenue fell', 'Stock fallen', 'Lowest close', 'Estimates missed', 'Losses widen']:
+        assert score_text(text) == (0, 1), text
+
+
+def test_base_and_regular_forms():
+    """Base words and regular inflections still count"""
+    assert score_text('Gains and a surge, up and higher') == (4, 0)
+    assert score_text('Declines, misses, down and lower') == (0, 4)
+    assert score_text('Apple outperformed, Tesla underperforms') == (1, 1)
+
+
+def test_whole_words_only():
+    """Keywords inside other words do not count"""
+    assert score_text('An update on the highlight of the upper lowland dropout') == (0, 0)
+    assert score_text('Surgeon rosewood fellow') == (0, 0)
+
+
+def run_all_tests():
+    tests = [test_inflected_forms, test_base_and_regular_forms, test_whole_words_only]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f" {test.__name__} PASSED")
+        except AssertionError as e:
+            failed += 1
+            print(f" {test.__name__} FAILED: {e}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)